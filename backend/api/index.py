@@ -1 +1,21 @@
-from app.main import app
+import os
+
+# Serverless entry point (Vercel). Admin routers are imported on first use, so
+# public cold starts skip the auth, storage and upload code. No polling job
+# workers run either: an instance is frozen between requests and could not
+# keep its leases alive. Uploads still run their ingest job after the response
+# (run_job_now), and run_worker.py retries failed jobs where it is deployed.
+# For the same reason playback events are written through per batch instead
+# of waiting in an in-memory buffer a frozen instance might never flush.
+# Covers render in a thread: there is no /dev/shm for a process pool. The
+# edge sets X-Forwarded-For itself, so the login limiter can trust it.
+# Indexes are not created on every cold start: run ensure_indexes.py on deploy.
+# These defaults can be overridden in the environment.
+os.environ.setdefault("LAZY_ADMIN_ROUTES", "1")
+os.environ.setdefault("JOB_WORKERS", "0")
+os.environ.setdefault("ANALYTICS_BUFFER", "0")
+os.environ.setdefault("IMAGE_WORKERS", "0")
+os.environ.setdefault("TRUST_FORWARDED_FOR", "1")
+os.environ.setdefault("ENSURE_INDEXES", "0")
+
+from app.main import app  # noqa: E402
@@ -8,11 +8,104 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
 
+    # password hashing runs in a thread pool (False = inline, the old behaviour)
+    PASSWORD_HASH_OFFLOAD: bool = True
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUED: int = 16
+    # login attempts allowed per window
+    LOGIN_WINDOW_SECONDS: float = 60.0
+    LOGIN_MAX_PER_IP: int = 20
+    LOGIN_MAX_PER_EMAIL: int = 5
+    # client IP from X-Forwarded-For, else the socket peer. Only enable behind a
+    # proxy that sets the header (the Vercel edge does; api/index.py turns it on),
+    # otherwise clients pick their own IP and dodge the per-IP limit
+    TRUST_FORWARDED_FOR: bool = False
+
+    # observability: app log level (JSON lines) and optional bearer token for /metrics
+    LOG_LEVEL: str = "INFO"
+    METRICS_TOKEN: str | None = None
+
+
+    # cold starts: import admin routers on first use, connect to Mongo during startup
+    LAZY_ADMIN_ROUTES: bool = False
+    MONGO_PREWARM: bool = False
+    # create the indexes at startup; off on serverless, where ensure_indexes.py runs on deploy
+    ENSURE_INDEXES: bool = True
 
     BUNNY_STORAGE_ZONE: str
     BUNNY_STORAGE_PASSWORD: str
     BUNNY_STORAGE_HOST: str = "storage.bunnycdn.com"
     BUNNY_CDN_BASE: str
+    BUNNY_STORAGE_SCHEME: str = "https"
+
+    # shared storage client
+    BUNNY_POOL_MAX_CONNECTIONS: int = 20
+    BUNNY_POOL_MAX_KEEPALIVE: int = 10
+    BUNNY_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    BUNNY_HTTP2: bool = False
+    BUNNY_UPLOAD_RETRIES: int = 2
+    BUNNY_RETRY_BACKOFF_SECONDS: float = 0.5
+
+    # resumable uploads
+    UPLOAD_CHUNK_MAX_BYTES: int = 4 * 1024 * 1024
+    UPLOAD_SESSION_MAX_BYTES: int = 500 * 1024 * 1024
+    UPLOAD_SESSION_TTL_HOURS: int = 24
+
+    # background jobs (0 workers = jobs only run inline after the request / in run_worker.py)
+    JOB_WORKERS: int = 2
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_LEASE_SECONDS: int = 300
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BACKOFF_SECONDS: float = 5.0
+    BACKFILL_CONCURRENCY: int = 4
+    # cover rendering processes (0 = render in a thread)
+    IMAGE_WORKERS: int = 2
+    # HLS packaging of uploaded MP3s (segment length in seconds, uploads in flight)
+    HLS_SEGMENT_SECONDS: float = 6.0
+    HLS_UPLOAD_CONCURRENCY: int = 8
+
+    # bulk admin operations and catalog import
+    BULK_MAX_IDS: int = 10_000
+    IMPORT_MAX_BYTES: int = 100 * 1024 * 1024
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    # playback analytics: events are folded into counters in memory and flushed
+    # with bulk_write (ANALYTICS_BUFFER=False writes each batch through instead)
+    ANALYTICS_BUFFER: bool = True
+    ANALYTICS_FLUSH_SECONDS: float = 10.0
+    ANALYTICS_FLUSH_EVENTS: int = 5000  # flush early once this many are pending
+    ANALYTICS_MAX_PENDING_EVENTS: int = 100_000  # beyond this POST /events answers 503
+    ANALYTICS_MAX_BATCH: int = 500
+    # popular/trending rankings are rebuilt once they are older than this
+    ANALYTICS_RANKINGS_TTL_SECONDS: float = 300.0
+    ANALYTICS_RANKING_SIZE: int = 100
+    ANALYTICS_TRENDING_DAYS: int = 7
+
+    # catalog change push (GET /changes, /changes/ws); with CHANGE_STREAMS a Mongo
+    # change stream is followed when the deployment supports one
+    CHANGE_STREAMS: bool = True
+    CHANGES_QUEUE_SIZE: int = 256  # per client; one that falls further behind gets a resync
+    CHANGES_REPLAY_SIZE: int = 1000  # recent events kept for reconnects (Last-Event-ID)
+    CHANGES_HEARTBEAT_SECONDS: float = 15.0
+
+    EPISODES_PAGE_SIZE: int = 50
+    EPISODES_MAX_PAGE_SIZE: int = 200
+    SEARCH_MAX_OFFSET: int = 1000
+
+    EPISODE_CACHE_TTL_SECONDS: float = 30.0
+    EPISODE_CACHE_MAX_ENTRIES: int = 1024
+
+    # RSS feed channel
+    PODCAST_TITLE: str = "Podcast"
+    PODCAST_DESCRIPTION: str = ""
+    PODCAST_LINK: str = ""
+    PODCAST_LANGUAGE: str = "en"
+    PODCAST_AUTHOR: str = ""
+    PODCAST_CATEGORY: str = "Society & Culture"
+    PODCAST_IMAGE_URL: str = ""
+    PODCAST_EXPLICIT: bool = False
+    FEED_MAX_ITEMS: int = 300
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,32 @@
+import importlib.util
+import json
+from datetime import datetime
+from typing import Any
+
+from fastapi import Response
+
+# orjson when installed (several times faster, emits bytes directly); the
+# stdlib fallback produces the same JSON for the plain documents we encode.
+if importlib.util.find_spec("orjson") is not None:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+else:
+    def _default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode()
+
+class FastJSONResponse(Response):
+    """
+    JSON response for data that is already in its output shape (no pydantic pass).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
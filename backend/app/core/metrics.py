@@ -0,0 +1,126 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import monitoring
+
+# Process-wide Prometheus series, exposed at /metrics.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+# Process-wide total by method only: the route template is set by the router,
+# after the middleware has already counted the request as in flight.
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served by this process, by method (not per route)",
+    ["method"],
+)
+
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command latency",
+    ["collection", "command"],
+    buckets=LATENCY_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error",
+    ["collection", "command"],
+)
+
+STORAGE_UPLOAD_BYTES = Counter(
+    "storage_upload_bytes_total",
+    "Bytes uploaded to Bunny storage",
+)
+STORAGE_UPLOAD_DURATION = Histogram(
+    "storage_upload_duration_seconds",
+    "Bunny storage upload latency, including retries",
+    ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+STORAGE_UPLOAD_FAILURES = Counter(
+    "storage_upload_failures_total",
+    "Bunny storage uploads that failed after all retries",
+)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time spent hashing or verifying a password (excluding queueing)",
+    ["op"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+PLAYBACK_EVENTS = Counter(
+    "playback_events_total",
+    "Playback events received, by outcome (accepted, rejected, shed)",
+    ["outcome"],
+)
+PLAYBACK_EVENTS_PENDING = Gauge(
+    "playback_events_pending",
+    "Playback events buffered in this process and not yet flushed",
+)
+PLAYBACK_FLUSH_DURATION = Histogram(
+    "playback_flush_duration_seconds",
+    "Time to write one flush of playback counters",
+    buckets=LATENCY_BUCKETS,
+)
+PLAYBACK_FLUSH_FAILURES = Counter(
+    "playback_flush_failures_total",
+    "Playback counter flushes that failed and were put back in the buffer",
+)
+
+CHANGE_SUBSCRIBERS = Gauge(
+    "catalog_change_subscribers",
+    "Clients connected to /changes (SSE or WebSocket)",
+)
+
+def timed_hash(op: str, func, *args):
+    """
+    Run a password hash function and record its duration.
+    Runs in the hash pool thread, so only the CPU time is measured.
+    """
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        PASSWORD_HASH_DURATION.labels(op).observe(time.perf_counter() - started)
+
+# commands whose first field names the collection they act on
+_COLLECTION_COMMANDS = {
+    "find", "insert", "update", "delete", "aggregate", "count", "distinct",
+    "findAndModify", "createIndexes", "listIndexes", "getMore",
+}
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    pymongo command monitoring -> per collection/command latency.
+    Registered on the Motor client in app.db.mongo.
+    """
+
+    def __init__(self):
+        # request_id -> collection, between started and succeeded/failed
+        self._pending: dict[int, str] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        collection = "-"
+        if event.command_name in _COLLECTION_COMMANDS:
+            target = event.command.get(event.command_name)
+            if event.command_name == "getMore":
+                target = event.command.get("collection")
+            if isinstance(target, str):
+                collection = target
+        self._pending[event.request_id] = collection
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._pending.pop(event.request_id, "-")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._pending.pop(event.request_id, "-")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
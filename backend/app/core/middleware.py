@@ -0,0 +1,53 @@
+import re
+import time
+import uuid
+
+from app.core.logging import request_id_var
+from app.core.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware: assigns a request id (or keeps a sane incoming
+    X-Request-ID), echoes it on the response, exposes it to logging, and records
+    latency per route template plus in-flight counts (per method, process-wide).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                incoming = value.decode("latin-1")
+                break
+        request_id = incoming if incoming and _VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode())]
+            await send(message)
+
+        HTTP_IN_FLIGHT.labels(method).inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            # the router leaves the matched route in the scope; label by its template, not the raw path
+            route = scope.get("route")
+            label = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.labels(method, label, str(status_code)).observe(time.perf_counter() - started)
+            HTTP_IN_FLIGHT.labels(method).dec()
+            request_id_var.reset(token)
@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from jose import jwt, JWTError
 from passlib.context import CryptContext
@@ -7,6 +9,7 @@ from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from app.core.config import settings
+from app.core.metrics import timed_hash
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 bearer = HTTPBearer(auto_error=False)
@@ -17,6 +20,45 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
+# pbkdf2 runs in hashlib's C code with the GIL released, so a small thread
+# pool takes it off the event loop. The semaphore bounds how many hashes may
+# be queued; past that, callers get 503 instead of piling up behind the pool.
+_hash_pool: ThreadPoolExecutor | None = None
+_hash_slots: asyncio.Semaphore | None = None
+
+def _get_hash_pool() -> ThreadPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="pwhash")
+    return _hash_pool
+
+def _get_hash_slots() -> asyncio.Semaphore:
+    global _hash_slots
+    if _hash_slots is None:
+        _hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_MAX_QUEUED)
+    return _hash_slots
+
+async def _run_hash(op: str, func: Callable[..., Any], *args: Any) -> Any:
+    if not settings.PASSWORD_HASH_OFFLOAD:
+        return timed_hash(op, func, *args)
+    slots = _get_hash_slots()
+    if slots.locked():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many concurrent logins, retry shortly")
+    async with slots:
+        return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), timed_hash, op, func, *args)
+
+async def hash_password_async(password: str) -> str:
+    return await _run_hash("hash", hash_password, password)
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await _run_hash("verify", verify_password, password, password_hash)
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
 def create_access_token(subject: str, expires_minutes: Optional[int] = None) -> str:
     now = datetime.now(timezone.utc)
     exp_minutes = expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -0,0 +1,37 @@
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+class SlidingWindowLimiter:
+    """
+    At most `limit` hits per key in any `window` seconds, tracked in memory.
+    Keeps at most `max_keys` keys; the least recently used ones are dropped.
+    """
+
+    def __init__(self, limit: int, window: float, max_keys: int = 10_000):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self._hits: OrderedDict[str, deque] = OrderedDict()
+
+    def hit(self, key: str) -> Optional[float]:
+        """
+        Record a hit. Returns None if allowed, else seconds until the next hit would be.
+        """
+        now = time.monotonic()
+        hits = self._hits.get(key)
+        if hits is None:
+            hits = self._hits[key] = deque()
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        self._hits.move_to_end(key)
+
+        while hits and hits[0] <= now - self.window:
+            hits.popleft()
+        if len(hits) >= self.limit:
+            return hits[0] + self.window - now
+        hits.append(now)
+        return None
+
+    def reset(self, key: str) -> None:
+        self._hits.pop(key, None)
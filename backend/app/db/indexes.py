@@ -0,0 +1,68 @@
+import logging
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+from app.db.mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+# collection -> indexes the app relies on (created at startup with
+# ENSURE_INDEXES, or by ensure_indexes.py; idempotent)
+INDEXES: dict[str, list[IndexModel]] = {
+    "episodes": [
+        # public listing: {published: true} sorted newest first
+        IndexModel(
+            [("published", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="published_created_at",
+        ),
+        # admin listing: everything sorted newest first
+        IndexModel(
+            [("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="created_at",
+        ),
+        # category browsing and facet counts
+        IndexModel(
+            [("published", ASCENDING), ("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="published_category_created_at",
+        ),
+        # search: one text index per collection; title matches rank highest
+        IndexModel(
+            [("title", TEXT), ("description", TEXT), ("category", TEXT)],
+            name="episode_text",
+            weights={"title": 10, "category": 5, "description": 1},
+            default_language="english",
+        ),
+    ],
+    "upload_sessions": [
+        # abandoned sessions expire on their own
+        IndexModel([("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0),
+    ],
+    "jobs": [
+        # claim: queued jobs that are due, running jobs whose lease ran out
+        IndexModel([("status", ASCENDING), ("run_after", ASCENDING)], name="status_run_after"),
+        IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="status_locked_until"),
+        IndexModel([("episode_id", ASCENDING)], name="episode_id"),
+    ],
+    "episode_stats": [
+        # popular ranking
+        IndexModel([("plays", DESCENDING), ("_id", ASCENDING)], name="plays"),
+    ],
+    "episode_stats_daily": [
+        # one counter document per episode and UTC day (flush upserts on it)
+        IndexModel([("episode_id", ASCENDING), ("day", ASCENDING)], name="episode_id_day", unique=True),
+        # trending ranking: the last few days
+        IndexModel([("day", ASCENDING)], name="day"),
+    ],
+    "admins": [
+        IndexModel([("email", ASCENDING)], name="email", unique=True),
+    ],
+}
+
+async def ensure_indexes() -> None:
+    db = get_db()
+    for collection, models in INDEXES.items():
+        try:
+            await db[collection].create_indexes(models)
+        except Exception as exc:
+            # Never block startup on index creation; queries still work, just slower.
+            logger.warning("index bootstrap failed for %s: %s", collection, exc)
@@ -1,13 +1,21 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.core.metrics import MongoCommandMetrics
 
 client: AsyncIOMotorClient | None = None
 
 def get_client() -> AsyncIOMotorClient:
     global client
     if client is None:
-        client = AsyncIOMotorClient(settings.MONGODB_URI)
+        client = AsyncIOMotorClient(settings.MONGODB_URI, event_listeners=[MongoCommandMetrics()])
     return client
 
 def get_db():
     return get_client()[settings.MONGODB_DB]
+
+async def prewarm() -> None:
+    """
+    Resolve the cluster and open a pooled connection now, instead of on
+    whichever request happens to arrive first.
+    """
+    await get_client().admin.command("ping")
@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+# newest first; _id breaks ties between equal timestamps
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+def encode_cursor(doc: dict) -> str:
+    """
+    Opaque keyset token for the (created_at, _id) position of `doc`.
+    """
+    raw = json.dumps({"t": doc["created_at"].isoformat(), "id": str(doc["_id"])})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str) -> tuple[datetime, ObjectId]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["t"]), ObjectId(data["id"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_filter(query: dict[str, Any], cursor: Optional[str]) -> dict[str, Any]:
+    """
+    Extend `query` so it only matches documents after `cursor`
+    in (created_at desc, _id desc) order.
+    """
+    if not cursor:
+        return query
+    created_at, last_id = decode_cursor(cursor)
+    after = {
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": last_id}},
+        ]
+    }
+    return {"$and": [query, after]} if query else after
+
+def encode_offset(offset: int) -> str:
+    """
+    Opaque token for offset-paged results (relevance order has no stable key).
+    """
+    return base64.urlsafe_b64encode(json.dumps({"o": offset}).encode()).decode().rstrip("=")
+
+def decode_offset(token: Optional[str]) -> int:
+    if not token:
+        return 0
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded.encode()))["o"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset
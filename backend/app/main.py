@@ -1,14 +1,81 @@
+import importlib
+import logging
+import sys
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from app.routers.health import router as health_router
-from app.routers.auth import router as auth_router
+from app.routers.search import router as search_router
 from app.routers.episodes import router as episodes_router
+from app.routers.feed import router as feed_router
+from app.routers.metrics import router as metrics_router
+from app.routers.analytics import router as analytics_router
+from app.routers.changes import router as changes_router
+from app.routers.lazy import LazyRoutes
+from app.db.indexes import ensure_indexes
+from app.db.mongo import prewarm
+from app.services.analytics import start_analytics, stop_analytics
+from app.services.changes import start_change_feed, stop_change_feed
+from app.core.config import settings
+from app.core.logging import configure_logging
+from app.core.middleware import RequestContextMiddleware
 
 from fastapi.middleware.cors import CORSMiddleware
 
 
+configure_logging(settings.LOG_LEVEL)
+logger = logging.getLogger("app.main")
+
+# Routers that pull in auth, storage, uploads and jobs. With LAZY_ADMIN_ROUTES
+# they are imported on the first request under ADMIN_PREFIXES instead of at startup.
+ADMIN_ROUTERS = [
+    "app.routers.auth",
+    "app.routers.admin_episodes",
+    "app.routers.admin_bulk",
+    "app.routers.uploads",
+    "app.routers.jobs",
+]
+ADMIN_PREFIXES = ["/admin", "/auth"]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.MONGO_PREWARM:
+        try:
+            await prewarm()
+        except Exception as exc:
+            logger.warning("mongo prewarm failed: %s", exc)
+    if settings.ENSURE_INDEXES:
+        await ensure_indexes()
+    if not settings.LAZY_ADMIN_ROUTES:
+        from app.services.bunny import start_storage_client
+        await start_storage_client()
+    workers = None
+    if settings.JOB_WORKERS:
+        # importing the job modules registers their handlers
+        from app.services import backfill, ingest  # noqa: F401
+        from app.services.jobs import JobWorkerPool
+        workers = JobWorkerPool(settings.JOB_WORKERS)
+        workers.start()
+    start_analytics()
+    start_change_feed()
+    try:
+        yield
+    finally:
+        await stop_change_feed()
+        # before the client pools go: the last playback counters still need Mongo
+        await stop_analytics()
+        if workers is not None:
+            await workers.stop()
+        # only shut down the pools of modules this process actually loaded
+        if bunny := sys.modules.get("app.services.bunny"):
+            await bunny.close_storage_client()
+        if security := sys.modules.get("app.core.security"):
+            security.shutdown_hash_pool()
+        if images := sys.modules.get("app.services.images"):
+            images.shutdown_image_pool()
 
-app = FastAPI(title="Podcast API", version="0.1.0")
+
+app = FastAPI(title="Podcast API", version="0.1.0", lifespan=lifespan)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -18,8 +85,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Request-ID"],
 )
+# outermost, so its timings and request id cover CORS and error responses too
+app.add_middleware(RequestContextMiddleware)
 
 app.include_router(health_router)
-app.include_router(auth_router)
+app.include_router(search_router)
 app.include_router(episodes_router)
+app.include_router(feed_router)
+app.include_router(metrics_router)
+app.include_router(analytics_router)
+app.include_router(changes_router)
+
+if settings.LAZY_ADMIN_ROUTES:
+    # first in line so it also catches /openapi.json, which needs every route
+    app.router.routes.insert(0, LazyRoutes(app, ADMIN_ROUTERS, [*ADMIN_PREFIXES, app.openapi_url]))
+else:
+    for module in ADMIN_ROUTERS:
+        app.include_router(importlib.import_module(module).router)
@@ -0,0 +1,25 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.models.episode import EpisodeSummaryOut
+
+class PlaybackEvent(BaseModel):
+    type: Literal["play", "progress", "complete"]
+    episode_id: str
+    # progress only: seconds listened since the previous progress event
+    seconds: float = Field(0, ge=0, le=3600)
+
+class PlaybackEventsIn(BaseModel):
+    events: List[PlaybackEvent] = Field(min_length=1, max_length=settings.ANALYTICS_MAX_BATCH)
+
+class PlaybackEventsOut(BaseModel):
+    accepted: int
+    # events for ids that are not valid episode ids
+    rejected: int
+
+class RankedEpisodeOut(EpisodeSummaryOut):
+    plays: int = 0
+    completes: int = 0
+    listened_seconds: float = 0
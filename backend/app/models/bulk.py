@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.models.episode import EpisodeCreateJSON, EpisodeUpdateIn
+
+class EpisodeFilter(BaseModel):
+    category: Optional[str] = None
+    published: Optional[bool] = None
+    status: Optional[str] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+class EpisodeSelection(BaseModel):
+    # exactly one of the two
+    ids: Optional[List[str]] = None
+    filter: Optional[EpisodeFilter] = None
+
+class BulkPublishIn(EpisodeSelection):
+    published: bool
+
+class BulkUpdateIn(EpisodeSelection):
+    set: EpisodeUpdateIn
+
+class BulkResultOut(BaseModel):
+    matched: int = 0
+    modified: int = 0
+    deleted: int = 0
+
+
+class EpisodeImportRow(EpisodeCreateJSON):
+    # original release date for back-catalog rows; defaults to the import time
+    created_at: Optional[datetime] = None
+
+class ImportRowError(BaseModel):
+    line: int
+    errors: List[Dict[str, Any]]
+
+class ImportResultOut(BaseModel):
+    rows: int
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    # only the first IMPORT_MAX_REPORTED_ERRORS failures are listed
+    errors_truncated: bool = False
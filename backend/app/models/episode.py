@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 class EpisodeIn(BaseModel):
@@ -27,6 +27,11 @@ class EpisodeUpdateIn(BaseModel):
     thumbnail_url: Optional[str] = None
     published: Optional[bool] = None
 
+class Chapter(BaseModel):
+    start_seconds: float
+    end_seconds: float
+    title: Optional[str] = None
+
 class EpisodeOut(BaseModel):
     id: str = Field(alias="_id")
     title: str
@@ -35,9 +40,38 @@ class EpisodeOut(BaseModel):
     audio_url: str
     thumbnail_url: str
     published: bool
+    # processing -> ready | failed; documents created before ingest jobs have no status
+    status: str = "ready"
+    job_id: Optional[str] = None
+    # read from the MP3 at ingest; missing until extracted
+    duration_seconds: Optional[float] = None
+    size_bytes: Optional[int] = None
+    bitrate_kbps: Optional[int] = None
+    id3: Dict[str, str] = {}
+    chapters: List[Chapter] = []
+    # cover rendition key ("96", "300", "1000" WebP, "jpeg" fallback) -> url
+    cover_renditions: Dict[str, str] = {}
+    # HLS playlist of the same audio cut into segments; missing until packaged
+    hls_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
+class EpisodeSummaryOut(BaseModel):
+    """
+    List item for `?fields=summary`: what a list or grid shows, without the
+    description, tags and chapters.
+    """
+    id: str = Field(alias="_id")
+    title: str
+    category: str
+    audio_url: str
+    thumbnail_url: str
+    published: bool
+    status: str = "ready"
+    duration_seconds: Optional[float] = None
+    cover_renditions: Dict[str, str] = {}
+    created_at: datetime
+
 
 class EpisodeCreateJSON(BaseModel):
     title: str
@@ -45,4 +79,14 @@ class EpisodeCreateJSON(BaseModel):
     category: str = "General"
     published: bool = True
     audio_url: str
-    thumbnail_url: str
\ No newline at end of file
+    thumbnail_url: str
+
+
+class CategoryCount(BaseModel):
+    category: str
+    count: int
+
+class EpisodeSearchOut(BaseModel):
+    items: List[EpisodeOut]
+    facets: List[CategoryCount]
+    next: Optional[str] = None
@@ -0,0 +1,21 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+class JobProgress(BaseModel):
+    step: Optional[str] = None
+    done: int = 0
+    total: int = 0
+
+class JobOut(BaseModel):
+    id: str = Field(alias="_id")
+    type: str
+    status: str
+    episode_id: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    progress: JobProgress
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
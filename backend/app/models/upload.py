@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+class UploadOut(BaseModel):
+    url: str
+
+
+class UploadSessionIn(BaseModel):
+    filename: str = "audio.mp3"
+    total_size: Optional[int] = Field(None, gt=0)
+    episode_id: Optional[str] = None
+
+class UploadChunkOut(BaseModel):
+    index: int
+    size: int
+    offset: int
+
+class UploadSessionOut(BaseModel):
+    id: str
+    filename: str
+    status: str
+    chunk_max_bytes: int
+    total_size: Optional[int] = None
+    episode_id: Optional[str] = None
+    chunks: List[UploadChunkOut]
+    received_bytes: int
+    # first missing chunk index and the byte offset it starts at
+    next_index: int
+    next_offset: int
+    url: Optional[str] = None
+    expires_at: datetime
+
+class UploadFinalizeIn(BaseModel):
+    episode_id: Optional[str] = None
@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from pymongo import DeleteMany, UpdateMany
+
+from app.core.config import settings
+from app.core.security import require_admin_token
+from app.db.mongo import get_db
+from app.models.bulk import BulkPublishIn, BulkResultOut, BulkUpdateIn, EpisodeSelection, ImportResultOut
+from app.routers.admin_episodes import with_unset
+from app.routers.episodes import oid
+from app.services.backfill import DERIVED_FIELDS, stale_derived, start_backfills
+from app.services.catalog import catalog_changed
+from app.services.catalog_import import IMPORT_FORMATS, import_episodes
+from app.services.jobs import run_job_now
+from app.services.limits import declared_length, limit_stream
+
+router = APIRouter(prefix="/admin/episodes", tags=["episodes"])
+
+def selection_query(selection: EpisodeSelection) -> dict:
+    """
+    Mongo filter for an id list or a structured filter (never a raw query).
+    """
+    if (selection.ids is None) == (selection.filter is None):
+        raise HTTPException(status_code=400, detail="Pass either ids or filter")
+    if selection.ids is not None:
+        if not selection.ids:
+            raise HTTPException(status_code=400, detail="ids is empty")
+        if len(selection.ids) > settings.BULK_MAX_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {settings.BULK_MAX_IDS} ids per call")
+        return {"_id": {"$in": [oid(x) for x in selection.ids]}}
+
+    f = selection.filter
+    query: dict = {}
+    if f.category is not None:
+        query["category"] = f.category
+    if f.published is not None:
+        query["published"] = f.published
+    if f.status is not None:
+        # documents from before ingest jobs have no status and count as ready
+        query["status"] = {"$in": [f.status, None]} if f.status == "ready" else f.status
+    created = {}
+    if f.created_after is not None:
+        created["$gt"] = f.created_after
+    if f.created_before is not None:
+        created["$lt"] = f.created_before
+    if created:
+        query["created_at"] = created
+    if not query:
+        raise HTTPException(status_code=400, detail="filter needs at least one condition")
+    return query
+
+def _update_ops(query: dict, update: dict, unset: Optional[dict] = None) -> list:
+    if "published" not in update:
+        return [UpdateMany(query, with_unset(update, unset))]
+    # a processing episode only goes public once its ingest job finishes
+    pending = {k: v for k, v in update.items() if k != "published"}
+    pending["publish_on_ready"] = update["published"]
+    return [
+        UpdateMany({"$and": [query, {"status": "processing"}]}, with_unset(pending, unset)),
+        UpdateMany({"$and": [query, {"status": {"$ne": "processing"}}]}, with_unset(update, unset)),
+    ]
+
+async def _bulk_update(query: dict, update: dict, unset: Optional[dict] = None) -> dict:
+    update["updated_at"] = datetime.now(timezone.utc)
+    res = await get_db()["episodes"].bulk_write(_update_ops(query, update, unset), ordered=True)
+    if res.modified_count:
+        await catalog_changed()
+    return {"matched": res.matched_count, "modified": res.modified_count}
+
+@router.post("/bulk/publish", response_model=BulkResultOut)
+async def bulk_publish(payload: BulkPublishIn, admin_id: str = Depends(require_admin_token)):
+    return await _bulk_update(selection_query(payload), {"published": payload.published})
+
+@router.post("/bulk/update", response_model=BulkResultOut)
+async def bulk_update(
+    payload: BulkUpdateIn,
+    background_tasks: BackgroundTasks,
+    admin_id: str = Depends(require_admin_token),
+):
+    update = {k: v for k, v in payload.set.model_dump().items() if v is not None}
+    if not update:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    # a new source url makes what was derived from the old one stale
+    unset, job_types = stale_derived(k for k in DERIVED_FIELDS if k in update)
+    result = await _bulk_update(selection_query(payload), update, unset)
+    if result["modified"]:
+        for job_id in await start_backfills(job_types):
+            background_tasks.add_task(run_job_now, job_id)
+    return result
+
+@router.post("/bulk/delete", response_model=BulkResultOut)
+async def bulk_delete(payload: EpisodeSelection, admin_id: str = Depends(require_admin_token)):
+    res = await get_db()["episodes"].bulk_write([DeleteMany(selection_query(payload))])
+    if res.deleted_count:
+        await catalog_changed()
+    return {"deleted": res.deleted_count}
+
+@router.post("/import", response_model=ImportResultOut)
+async def import_catalog(
+    request: Request,
+    format: Optional[str] = Query(None, description="ndjson or csv; defaults from Content-Type"),
+    admin_id: str = Depends(require_admin_token),
+):
+    """
+    Stream an NDJSON or CSV file of episodes (EpisodeCreateJSON fields plus an
+    optional created_at). Valid rows are inserted in batches; invalid rows are
+    reported by line number and skipped. If the body breaks off (413, or 400 for
+    bad UTF-8), rows before the break stay imported and the error detail holds
+    the report so far. Imported episodes don't go through the ingest job; run
+    the audio-meta backfill afterwards to fill in durations.
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(IMPORT_FORMATS)}")
+    declared_length(request, settings.IMPORT_MAX_BYTES, "Import file")
+    chunks = limit_stream(request.stream(), settings.IMPORT_MAX_BYTES, "Import file")
+    return await import_episodes(chunks, fmt, admin_id)
@@ -0,0 +1,246 @@
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+
+import httpx
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends, Query, Request
+from fastapi import UploadFile, File, Form
+from bson import ObjectId
+
+from app.db.mongo import get_db
+from app.models.episode import EpisodeUpdateIn, EpisodeOut, EpisodeCreateJSON
+from app.models.upload import UploadOut
+from app.core.security import require_admin_token
+from app.core.fastjson import FastJSONResponse
+from app.routers.episodes import LIST_RESPONSES, NEXT_CURSOR_HEADER, _list_page, list_fields, oid
+from app.services.backfill import DERIVED_FIELDS, stale_derived, start_backfills
+from app.services.bunny import upload_audio, upload_image
+from app.services.catalog import catalog_changed
+from app.services.ingest import INGEST_JOB
+from app.services.jobs import enqueue, run_job_now
+from app.services.staging import delete_staged, stage_stream
+from app.services.limits import declared_length, fmt_mb, limit_stream, too_large
+
+
+router = APIRouter(tags=["episodes"])
+
+# -----------------------
+# Admin endpoints (Next.js Admin)
+# -----------------------
+
+@router.get("/admin/episodes", response_model=None, responses=LIST_RESPONSES)
+async def admin_list_all_episodes(
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, alias="next"),
+    fields: Optional[str] = Query(None, description='"summary" or a comma-separated list of episode fields'),
+    admin_id: str = Depends(require_admin_token),
+):
+    items, next_cursor = await _list_page({}, limit, cursor, list_fields(fields))
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+    return FastJSONResponse(items, headers=headers)
+
+MAX_AUDIO_BYTES = 4 * 1024 * 1024        # 4 MB
+MAX_COVER_BYTES = 1 * 1024 * 1024        # 1 MB
+
+AUDIO_TYPES = ("audio/mpeg", "audio/mp3", "audio/x-mpeg", "audio/*")
+COVER_TYPES = ("image/jpeg", "image/png", "image/webp")
+
+UPLOAD_CHUNK_BYTES = 256 * 1024
+
+async def _iter_upload(file: UploadFile) -> AsyncIterator[bytes]:
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        yield chunk
+
+def _stream_upload(file: UploadFile, limit_bytes: int, label: str) -> AsyncIterator[bytes]:
+    """
+    Stream an upload in chunks while enforcing its size limit.
+    Note: if the platform rejects large bodies (Vercel), you may never reach this code.
+    """
+    # Prefer content-length if provided by client (not always present)
+    if file.size is not None and file.size > limit_bytes:  # UploadFile may not have .size in some setups
+        raise too_large(label, limit_bytes, file.size)
+    return limit_stream(_iter_upload(file), limit_bytes, label)
+
+@router.post("/admin/episodes", response_model=EpisodeOut, status_code=status.HTTP_202_ACCEPTED)
+async def admin_create_episode(
+    background_tasks: BackgroundTasks,
+
+    title: str = Form(...),
+    description: str = Form(""),
+    category: str = Form("General"),
+    published: bool = Form(True),
+
+    audio: UploadFile | None = File(None),
+    cover: UploadFile | None = File(None),
+
+    # Optional fallbacks
+    audio_url: str | None = Form(None),
+    thumbnail_url: str | None = Form(None),
+
+    admin_id: str = Depends(require_admin_token),
+):
+    db = get_db()
+
+    resolved_audio_url = (audio_url or "").strip()
+    resolved_thumbnail_url = (thumbnail_url or "").strip()
+
+    # Require either file or URL for both
+    if audio is None and not resolved_audio_url:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide audio file or audio_url. If uploading a file, keep it under {fmt_mb(MAX_AUDIO_BYTES)} on Vercel."
+        )
+    if cover is None and not resolved_thumbnail_url:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide cover file or thumbnail_url. If uploading a file, keep it under {fmt_mb(MAX_COVER_BYTES)} on Vercel."
+        )
+
+    if audio is not None and audio.content_type not in AUDIO_TYPES:
+        raise HTTPException(status_code=400, detail=f"Audio must be mp3/mpeg. Got {audio.content_type}")
+    if cover is not None and cover.content_type not in COVER_TYPES:
+        raise HTTPException(status_code=400, detail=f"Cover must be jpg/png/webp. Got {cover.content_type}")
+
+    # Stage files in Mongo; the ingest job pushes them to Bunny.
+    payload: dict = {"audio": None, "cover": None}
+    staged = []
+    try:
+        if audio is not None:
+            file_id, size = await stage_stream(_stream_upload(audio, MAX_AUDIO_BYTES, "Audio file"), audio.filename or "audio.mp3", "audio/mpeg")
+            staged.append(file_id)
+            payload["audio"] = {"file_id": file_id, "filename": audio.filename or "audio.mp3", "size": size}
+        if cover is not None:
+            content_type = cover.content_type or "application/octet-stream"
+            file_id, size = await stage_stream(_stream_upload(cover, MAX_COVER_BYTES, "Cover image"), cover.filename or "cover.jpg", content_type)
+            staged.append(file_id)
+            payload["cover"] = {"file_id": file_id, "filename": cover.filename or "cover.jpg", "content_type": content_type, "size": size}
+    except HTTPException:
+        for file_id in staged:
+            await delete_staged(file_id)
+        raise
+
+    now = datetime.now(timezone.utc)
+    job_id = ObjectId()
+
+    doc = {
+        "title": title.strip(),
+        "description": description.strip(),
+        "category": category.strip() or "General",
+        # hidden from the public list until the ingest job marks it ready
+        "published": False,
+        "publish_on_ready": bool(published),
+        "status": "processing",
+        "job_id": str(job_id),
+        "audio_url": resolved_audio_url,
+        "thumbnail_url": resolved_thumbnail_url,
+        "created_at": now,
+        "updated_at": now,
+        "created_by": admin_id,
+    }
+
+    res = await db["episodes"].insert_one(doc)
+    await enqueue(INGEST_JOB, payload, episode_id=str(res.inserted_id), job_id=job_id)
+    background_tasks.add_task(run_job_now, job_id)
+
+    doc["_id"] = str(res.inserted_id)
+    return doc
+
+
+    
+# -----------------------
+# Raw streaming uploads: the request body is piped straight into the storage PUT
+# -----------------------
+
+async def _stream_raw(request: Request, upload, limit_bytes: int, label: str, *args) -> str:
+    length = declared_length(request, limit_bytes, label)
+    chunks = limit_stream(request.stream(), limit_bytes, label)
+    try:
+        return await upload(chunks, *args, content_length=length)
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Storage timeout on {label.lower()} upload")
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"{label} upload failed: {exc}")
+
+@router.put("/admin/uploads/audio", response_model=UploadOut, status_code=status.HTTP_201_CREATED)
+async def admin_stream_audio(
+    request: Request,
+    filename: str = Query("audio.mp3"),
+    admin_id: str = Depends(require_admin_token),
+):
+    content_type = request.headers.get("content-type", "")
+    if content_type not in AUDIO_TYPES:
+        raise HTTPException(status_code=400, detail=f"Audio must be mp3/mpeg. Got {content_type}")
+    url = await _stream_raw(request, upload_audio, MAX_AUDIO_BYTES, "Audio file", filename)
+    return UploadOut(url=url)
+
+@router.put("/admin/uploads/cover", response_model=UploadOut, status_code=status.HTTP_201_CREATED)
+async def admin_stream_cover(
+    request: Request,
+    filename: str = Query("cover.jpg"),
+    admin_id: str = Depends(require_admin_token),
+):
+    content_type = request.headers.get("content-type", "")
+    if content_type not in COVER_TYPES:
+        raise HTTPException(status_code=400, detail=f"Cover must be jpg/png/webp. Got {content_type}")
+    url = await _stream_raw(request, upload_image, MAX_COVER_BYTES, "Cover image", filename, content_type)
+    return UploadOut(url=url)
+
+def with_unset(update: dict, unset: dict) -> dict:
+    return {"$set": update, "$unset": unset} if unset else {"$set": update}
+
+@router.patch("/admin/episodes/{episode_id}", response_model=EpisodeOut)
+async def admin_update_episode(
+    episode_id: str,
+    payload: EpisodeUpdateIn,
+    background_tasks: BackgroundTasks,
+    admin_id: str = Depends(require_admin_token),
+):
+    db = get_db() 
+    update = {k: v for k, v in payload.model_dump().items() if v is not None}
+    if not update:
+        raise HTTPException(status_code=400, detail="No fields to update")
+
+    update["updated_at"] = datetime.now(timezone.utc)
+    _id = oid(episode_id)
+
+    # a new source url makes what was derived from the old one stale
+    current = await db["episodes"].find_one({"_id": _id}, dict.fromkeys(DERIVED_FIELDS, 1))
+    if current is None:
+        raise HTTPException(status_code=404, detail="Episode not found")
+    unset, job_types = stale_derived(k for k in DERIVED_FIELDS if k in update and update[k] != current.get(k))
+
+    res = None
+    if "published" in update:
+        # a processing episode only goes public once its ingest job finishes
+        pending = {k: v for k, v in update.items() if k != "published"}
+        pending["publish_on_ready"] = update["published"]
+        res = await db["episodes"].find_one_and_update(
+            {"_id": _id, "status": "processing"},
+            with_unset(pending, unset),
+            return_document=True,
+        )
+    if not res:
+        res = await db["episodes"].find_one_and_update(
+            {"_id": _id},
+            with_unset(update, unset),
+            return_document=True,
+        )
+    if not res:
+        raise HTTPException(status_code=404, detail="Episode not found")
+    for job_id in await start_backfills(job_types):
+        background_tasks.add_task(run_job_now, job_id)
+    await catalog_changed(res["_id"], published=res["published"])
+
+    res["_id"] = str(res["_id"])
+    return res
+
+@router.delete("/admin/episodes/{episode_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def admin_delete_episode(episode_id: str, admin_id: str = Depends(require_admin_token)):
+    db = get_db()
+    _id = oid(episode_id)
+    res = await db["episodes"].delete_one({"_id": _id})
+    if res.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Episode not found")
+    await catalog_changed(_id, deleted=True)
+    return None
@@ -0,0 +1,61 @@
+import math
+from typing import List, Literal
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+
+from app.core.config import settings
+from app.core.fastjson import dumps
+from app.core.metrics import PLAYBACK_EVENTS
+from app.db.mongo import get_db
+from app.models.analytics import PlaybackEventsIn, PlaybackEventsOut, RankedEpisodeOut
+from app.routers.episodes import SUMMARY_FIELDS, list_projection
+from app.services.analytics import COUNTERS, get_ranking, record_events, to_increments
+from app.services.cache import cached_json_response
+
+router = APIRouter(tags=["analytics"])
+
+@router.post("/events", response_model=PlaybackEventsOut, status_code=status.HTTP_202_ACCEPTED)
+async def post_playback_events(body: PlaybackEventsIn):
+    """
+    Batched play / progress / complete events from the apps.
+    Answers 503 with Retry-After while the event buffer is full.
+    """
+    increments, rejected = to_increments(body.events)
+    if not await record_events(increments):
+        PLAYBACK_EVENTS.labels("shed").inc(len(body.events))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many pending events, retry later",
+            headers={"Retry-After": str(math.ceil(settings.ANALYTICS_FLUSH_SECONDS))},
+        )
+    PLAYBACK_EVENTS.labels("accepted").inc(len(body.events) - rejected)
+    PLAYBACK_EVENTS.labels("rejected").inc(rejected)
+    return {"accepted": len(body.events) - rejected, "rejected": rejected}
+
+@router.get("/rankings/{name}", response_model=List[RankedEpisodeOut])
+async def get_episode_ranking(
+    name: Literal["popular", "trending"],
+    request: Request,
+    limit: int = Query(20, ge=1, le=100),
+):
+    """
+    Published episodes from a precomputed ranking, best first, with their counters.
+    """
+
+    async def produce():
+        items = await get_ranking(name)
+        pipeline = [
+            {"$match": {"_id": {"$in": [item["episode_id"] for item in items]}, "published": True}},
+            {"$project": list_projection(SUMMARY_FIELDS)},
+        ]
+        rows = {row["_id"]: row async for row in get_db()["episodes"].aggregate(pipeline)}
+        ranked = []
+        for item in items:
+            row = rows.get(str(item["episode_id"]))
+            if row is not None:
+                ranked.append({**row, **{counter: item[counter] for counter in COUNTERS}})
+                if len(ranked) == limit:
+                    break
+        return dumps(ranked), {}
+
+    return await cached_json_response(request, ("ranking", name, limit), produce)
@@ -1,19 +1,50 @@
-from fastapi import APIRouter, HTTPException, status
+import math
+
+from fastapi import APIRouter, HTTPException, Request, status
+from app.core.config import settings
 from app.db.mongo import get_db
 from app.models.admin import AdminLoginIn, TokenOut
-from app.core.security import verify_password, create_access_token
+from app.core.security import verify_password_async, create_access_token
+from app.core.throttle import SlidingWindowLimiter
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# all attempts per client IP; per email, attempts since its last successful login
+ip_limiter = SlidingWindowLimiter(settings.LOGIN_MAX_PER_IP, settings.LOGIN_WINDOW_SECONDS)
+email_limiter = SlidingWindowLimiter(settings.LOGIN_MAX_PER_EMAIL, settings.LOGIN_WINDOW_SECONDS)
+
+def client_ip(request: Request) -> str:
+    if settings.TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+def _throttled(retry_after: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts",
+        headers={"Retry-After": str(math.ceil(retry_after))},
+    )
+
 @router.post("/login", response_model=TokenOut)
-async def admin_login(payload: AdminLoginIn) -> TokenOut:
+async def admin_login(payload: AdminLoginIn, request: Request) -> TokenOut:
+    email = payload.email.lower()
+    retry_after = ip_limiter.hit(client_ip(request))
+    if retry_after is not None:
+        raise _throttled(retry_after)
+    retry_after = email_limiter.hit(email)
+    if retry_after is not None:
+        raise _throttled(retry_after)
+
     db = get_db()
-    admin = await db["admins"].find_one({"email": payload.email.lower()})
+    admin = await db["admins"].find_one({"email": email})
     if not admin:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
-    if not verify_password(payload.password, admin["password_hash"]):
+    if not await verify_password_async(payload.password, admin["password_hash"]):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
+    email_limiter.reset(email)
     token = create_access_token(str(admin["_id"]))
     return TokenOut(access_token=token)
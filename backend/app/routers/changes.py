@@ -0,0 +1,66 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Header, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.fastjson import dumps
+from app.services.changes import broadcaster
+
+router = APIRouter(tags=["changes"])
+
+def _sse(event_id: str, event: dict) -> bytes:
+    return b"id: " + event_id.encode() + b"\nevent: episode\ndata: " + dumps(event) + b"\n\n"
+
+@router.get("/changes", response_class=StreamingResponse)
+async def catalog_changes_sse(request: Request, last_event_id: Optional[str] = Header(None)):
+    """
+    Server-Sent Events stream of catalog changes (see app.services.changes).
+    EventSource reconnects with Last-Event-ID and receives what it missed.
+    """
+    queue = broadcaster.subscribe(last_event_id)
+
+    async def stream():
+        try:
+            # the retry hint doubles as the first bytes, so proxies flush headers now
+            yield f"retry: {int(settings.CHANGES_HEARTBEAT_SECONDS * 1000)}\n\n".encode()
+            while True:
+                try:
+                    event_id, event = await asyncio.wait_for(queue.get(), settings.CHANGES_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # keeps idle connections from being cut by proxies
+                    yield b": ping\n\n"
+                    continue
+                yield _sse(event_id, event)
+        finally:
+            broadcaster.unsubscribe(queue)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(stream(), media_type="text/event-stream", headers=headers)
+
+@router.websocket("/changes/ws")
+async def catalog_changes_ws(websocket: WebSocket, last_event_id: Optional[str] = None):
+    """
+    The same events as /changes, one JSON text message each:
+    {"event_id": ..., "op": ..., "id": ...}. Reconnect with ?last_event_id= to catch up.
+    """
+    await websocket.accept()
+    queue = broadcaster.subscribe(last_event_id)
+
+    async def pump():
+        while True:
+            event_id, event = await queue.get()
+            await websocket.send_text(dumps({"event_id": event_id, **event}).decode())
+
+    sender = asyncio.create_task(pump())
+    try:
+        # clients don't send anything; this returns once they disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        broadcaster.unsubscribe(queue)
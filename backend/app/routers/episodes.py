@@ -1,15 +1,18 @@
-from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional, Union
 
-import httpx
-from fastapi import APIRouter, HTTPException, status, Depends
-from fastapi import UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Query, Request
 from bson import ObjectId
 
+from app.core.config import settings
 from app.db.mongo import get_db
-from app.models.episode import EpisodeUpdateIn, EpisodeOut, EpisodeCreateJSON
-from app.core.security import require_admin_token
-from app.services.bunny import upload_audio, upload_image
+from app.db.pagination import KEYSET_SORT, encode_cursor, keyset_filter
+from app.core.fastjson import dumps
+from app.models.episode import EpisodeOut, EpisodeSummaryOut
+from app.services.cache import cached_json_response
+
+# Public, read-only episode routes. Admin routes live in admin_episodes.py so
+# that this module (and cold starts serving only public traffic) never
+# imports the upload, storage and auth stacks.
 
 
 router = APIRouter(tags=["episodes"])
@@ -24,179 +27,124 @@ def oid(id_: str) -> ObjectId:
 # Public endpoints (Mobile)
 # -----------------------
 
-@router.get("/episodes", response_model=List[EpisodeOut])
-async def list_published_episodes():
-    db = get_db()
-    cursor = db["episodes"].find({"published": True}).sort("created_at", -1)
-    items = await cursor.to_list(length=200)
-    for x in items:
-        x["_id"] = str(x["_id"])
-    return items
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
-@router.get("/episodes/{episode_id}", response_model=EpisodeOut)
-async def get_published_episode(episode_id: str):
-    db = get_db()
-    doc = await db["episodes"].find_one({"_id": oid(episode_id), "published": True})
-    if not doc:
-        raise HTTPException(status_code=404, detail="Episode not found")
-    doc["_id"] = str(doc["_id"])
-    return doc
+# internal fields never sent to clients
+EPISODE_PROJECTION = {"rss_item": 0, "rss_item_at": 0}
+
+def page_size(limit: Optional[int]) -> int:
+    return min(limit or settings.EPISODES_PAGE_SIZE, settings.EPISODES_MAX_PAGE_SIZE)
 
 # -----------------------
-# Admin endpoints (Next.js Admin)
+# List fast path: the aggregation returns rows already shaped like the response
+# model (string ids, defaults filled in, nothing extra), so they are encoded
+# straight to JSON without building pydantic objects.
 # -----------------------
 
-@router.get("/admin/episodes", response_model=List[EpisodeOut])
-async def admin_list_all_episodes(admin_id: str = Depends(require_admin_token)):
-    db = get_db()
-    cursor = db["episodes"].find({}).sort("created_at", -1)
-    items = await cursor.to_list(length=500)
-    for x in items:
-        x["_id"] = str(x["_id"])
-    return items
-
-MAX_AUDIO_BYTES = 4 * 1024 * 1024        # 4 MB
-MAX_COVER_BYTES = 1 * 1024 * 1024        # 1 MB
-
-def _fmt_mb(n: int) -> str:
-    return f"{n / (1024 * 1024):.1f}MB"
-
-async def _read_with_limit(file: UploadFile, limit_bytes: int, label: str) -> bytes:
+SUMMARY = "summary"
+EPISODE_FIELDS = tuple(f.alias or name for name, f in EpisodeOut.model_fields.items())
+SUMMARY_FIELDS = tuple(f.alias or name for name, f in EpisodeSummaryOut.model_fields.items())
+# the list is ordered (and paged) by these, so they are always returned
+_REQUIRED_FIELDS = ("_id", "created_at")
+
+# The list handlers return encoded rows, so nothing is validated against a
+# response_model; this only documents them. `?fields=` picks the shape:
+# EpisodeOut (default), EpisodeSummaryOut ("summary"), or a subset of
+# EpisodeOut's fields (with _id and created_at).
+LIST_RESPONSES = {
+    200: {
+        "model": List[Union[EpisodeOut, EpisodeSummaryOut]],
+        "description": "Newest first. Items are EpisodeOut by default, EpisodeSummaryOut with "
+                       "fields=summary, or only the listed EpisodeOut fields (plus _id and created_at) "
+                       f"with a field list. {NEXT_CURSOR_HEADER} carries the next page's cursor.",
+    },
+}
+
+def list_fields(fields: Optional[str]) -> tuple[str, ...]:
     """
-    Read upload into memory but enforce size limit.
-    Note: if the platform rejects large bodies (Vercel), you may never reach this code.
+    Resolve `?fields=`: absent -> every EpisodeOut field, "summary" -> EpisodeSummaryOut,
+    otherwise a comma-separated subset of EpisodeOut fields.
+    """
+    if not fields:
+        return EPISODE_FIELDS
+    if fields.strip() == SUMMARY:
+        return SUMMARY_FIELDS
+    wanted = {"_id" if f == "id" else f for f in (x.strip() for x in fields.split(",")) if f}
+    unknown = wanted - set(EPISODE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    # model order, so equal selections share a cache entry
+    return tuple(f for f in EPISODE_FIELDS if f in wanted or f in _REQUIRED_FIELDS)
+
+def _field_expr(name: str):
+    if name == "_id":
+        return {"$toString": "$_id"}
+    field = EpisodeOut.model_fields[name]
+    if field.is_required():
+        return f"${name}"
+    # what pydantic would fill in for a missing field
+    return {"$ifNull": [f"${name}", {"$literal": field.get_default(call_default_factory=True)}]}
+
+_projections: dict[tuple[str, ...], dict] = {}
+
+def list_projection(fields: tuple[str, ...]) -> dict:
+    projection = _projections.get(fields)
+    if projection is None:
+        projection = _projections[fields] = {name: _field_expr(name) for name in fields}
+    return projection
+
+async def _list_page(
+    query: dict,
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: tuple[str, ...] = EPISODE_FIELDS,
+) -> tuple[list[dict], Optional[str]]:
+    """
+    One keyset page of episodes, newest first, plus the token for the following page (if any).
+    Rows are ready to encode: only `fields`, `_id` as a string.
     """
-    # Prefer content-length if provided by client (not always present)
-    if file.size is not None and file.size > limit_bytes:  # UploadFile may not have .size in some setups
-        raise HTTPException(
-            status_code=413,
-            detail=f"{label} is too large. Max allowed is {_fmt_mb(limit_bytes)}.",
-        )
-
-    data = await file.read()
-    if len(data) > limit_bytes:
-        raise HTTPException(
-            status_code=413,
-            detail=f"{label} is too large ({_fmt_mb(len(data))}). Max allowed is {_fmt_mb(limit_bytes)}.",
-        )
-    return data
-
-@router.post("/admin/episodes", response_model=EpisodeOut, status_code=status.HTTP_201_CREATED)
-async def admin_create_episode(
-    title: str = Form(...),
-    description: str = Form(""),
-    category: str = Form("General"),
-    published: bool = Form(True),
-
-    audio: UploadFile | None = File(None),
-    cover: UploadFile | None = File(None),
-
-    # Optional fallbacks
-    audio_url: str | None = Form(None),
-    thumbnail_url: str | None = Form(None),
-
-    admin_id: str = Depends(require_admin_token),
-):
     db = get_db()
-
-    resolved_audio_url = (audio_url or "").strip()
-    resolved_thumbnail_url = (thumbnail_url or "").strip()
-
-    # Require either file or URL for both
-    if audio is None and not resolved_audio_url:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Provide audio file or audio_url. If uploading a file, keep it under {_fmt_mb(MAX_AUDIO_BYTES)} on Vercel."
-        )
-    if cover is None and not resolved_thumbnail_url:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Provide cover file or thumbnail_url. If uploading a file, keep it under {_fmt_mb(MAX_COVER_BYTES)} on Vercel."
-        )
-
-    # Upload audio file -> Bunny
-    if audio is not None:
-        if audio.content_type not in ("audio/mpeg", "audio/mp3", "audio/x-mpeg", "audio/*"):
-            raise HTTPException(status_code=400, detail=f"Audio must be mp3/mpeg. Got {audio.content_type}")
-
-        try:
-            audio_bytes = await _read_with_limit(audio, MAX_AUDIO_BYTES, "Audio file")
-            resolved_audio_url = await upload_audio(audio_bytes, audio.filename or "audio.mp3")
-        except httpx.TimeoutException:
-            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Storage timeout on audio upload")
-        except HTTPException:
-            raise
-        except Exception as exc:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Audio upload failed: {exc}")
-
-    # Upload cover -> Bunny
-    if cover is not None:
-        if cover.content_type not in ("image/jpeg", "image/png", "image/webp"):
-            raise HTTPException(status_code=400, detail=f"Cover must be jpg/png/webp. Got {cover.content_type}")
-
-        try:
-            cover_bytes = await _read_with_limit(cover, MAX_COVER_BYTES, "Cover image")
-            resolved_thumbnail_url = await upload_image(
-                cover_bytes,
-                cover.filename or "cover.jpg",
-                cover.content_type or "application/octet-stream",
-            )
-        except httpx.TimeoutException:
-            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Storage timeout on cover upload")
-        except HTTPException:
-            raise
-        except Exception as exc:
-            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Cover upload failed: {exc}")
-
-    now = datetime.now(timezone.utc)
-
-    doc = {
-        "title": title.strip(),
-        "description": description.strip(),
-        "category": category.strip() or "General",
-        "published": bool(published),
-        "audio_url": resolved_audio_url,
-        "thumbnail_url": resolved_thumbnail_url,
-        "created_at": now,
-        "updated_at": now,
-        "created_by": admin_id,
-    }
-
-    res = await db["episodes"].insert_one(doc)
-    saved = await db["episodes"].find_one({"_id": res.inserted_id})
-    saved["_id"] = str(saved["_id"])
-    return saved
-
-
-    
-@router.patch("/admin/episodes/{episode_id}", response_model=EpisodeOut)
-async def admin_update_episode(
-    episode_id: str,
-    payload: EpisodeUpdateIn,
-    admin_id: str = Depends(require_admin_token),
+    size = page_size(limit)
+    pipeline = [
+        {"$match": keyset_filter(query, cursor)},
+        {"$sort": dict(KEYSET_SORT)},
+        # fetch one extra row to know whether another page exists
+        {"$limit": size + 1},
+        {"$project": list_projection(fields)},
+    ]
+    items = await db["episodes"].aggregate(pipeline).to_list(length=size + 1)
+    next_cursor = None
+    if len(items) > size:
+        items = items[:size]
+        next_cursor = encode_cursor(items[-1])
+    return items, next_cursor
+
+@router.get("/episodes", response_model=None, responses=LIST_RESPONSES)
+async def list_published_episodes(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, alias="next"),
+    fields: Optional[str] = Query(None, description='"summary" or a comma-separated list of episode fields'),
 ):
-    db = get_db() 
-    update = {k: v for k, v in payload.model_dump().items() if v is not None}
-    if not update:
-        raise HTTPException(status_code=400, detail="No fields to update")
-
-    update["updated_at"] = datetime.now(timezone.utc)
-
-    res = await db["episodes"].find_one_and_update(
-        {"_id": oid(episode_id)},
-        {"$set": update},
-        return_document=True,
-    )
-    if not res:
-        raise HTTPException(status_code=404, detail="Episode not found")
-
-    res["_id"] = str(res["_id"])
-    return res
-
-@router.delete("/admin/episodes/{episode_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def admin_delete_episode(episode_id: str, admin_id: str = Depends(require_admin_token)):
-    db = get_db()
-    res = await db["episodes"].delete_one({"_id": oid(episode_id)})
-    if res.deleted_count == 0:
-        raise HTTPException(status_code=404, detail="Episode not found")
-    return None
+    selected = list_fields(fields)
+
+    async def produce():
+        items, next_cursor = await _list_page({"published": True}, limit, cursor, selected)
+        headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else {}
+        return dumps(items), headers
+
+    return await cached_json_response(request, ("list", page_size(limit), cursor, selected), produce)
+
+@router.get("/episodes/{episode_id}", response_model=EpisodeOut)
+async def get_published_episode(episode_id: str, request: Request):
+    _id = oid(episode_id)
+
+    async def produce():
+        db = get_db()
+        doc = await db["episodes"].find_one({"_id": _id, "published": True}, EPISODE_PROJECTION)
+        if not doc:
+            raise HTTPException(status_code=404, detail="Episode not found")
+        doc["_id"] = str(doc["_id"])
+        return EpisodeOut.model_validate(doc).model_dump_json(by_alias=True).encode(), {}
+
+    return await cached_json_response(request, ("episode", episode_id), produce)
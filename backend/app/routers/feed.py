@@ -0,0 +1,73 @@
+from email.utils import format_datetime, parsedate_to_datetime
+from datetime import timezone
+
+from fastapi import APIRouter, Request, Response
+
+from app.services.cache import etag_matches
+from app.services.feed import load_feed, regenerate_feed
+
+router = APIRouter(tags=["feed"])
+
+def _gzip_etag(etag: str) -> str:
+    # the gzip body is a different representation, so it gets its own validator
+    return etag[:-1] + '-gz"'
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip (q > 0, directly or via "*").
+    """
+    wildcard = None
+    for item in accept_encoding.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.lower()
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard = q > 0
+    return bool(wildcard)
+
+def _not_modified(request: Request, etags: tuple[str, ...], last_modified) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match wins over If-Modified-Since when both are sent;
+        # either encoding's validator means the client has this version
+        return any(etag_matches(if_none_match, etag) for etag in etags)
+    since = request.headers.get("if-modified-since")
+    if not since:
+        return False
+    try:
+        return last_modified <= parsedate_to_datetime(since)
+    except (TypeError, ValueError):
+        return False
+
+@router.get("/feed.xml")
+async def podcast_feed(request: Request):
+    feed = await load_feed()
+    if feed is None:
+        feed = await regenerate_feed()
+
+    last_modified = feed["last_modified"]
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": _gzip_etag(feed["etag"]) if gzip else feed["etag"],
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": "public, max-age=300",
+        "Vary": "Accept-Encoding",
+    }
+    if _not_modified(request, (feed["etag"], _gzip_etag(feed["etag"])), last_modified):
+        return Response(status_code=304, headers=headers)
+
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=feed["gzip"], media_type="application/rss+xml", headers=headers)
+    return Response(content=feed["xml"], media_type="application/rss+xml", headers=headers)
@@ -0,0 +1,59 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Query, status
+
+from app.core.security import require_admin_token
+from app.db.mongo import get_db
+from app.models.job import JobOut
+from app.routers.episodes import oid
+from app.services.backfill import AUDIO_META_JOB, COVER_RENDITIONS_JOB, HLS_JOB, start_backfill
+from app.services.jobs import run_job_now
+
+router = APIRouter(prefix="/admin/jobs", tags=["jobs"])
+
+@router.get("", response_model=List[JobOut])
+async def list_jobs(
+    job_status: Optional[str] = Query(None, alias="status"),
+    episode_id: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=200),
+    admin_id: str = Depends(require_admin_token),
+):
+    db = get_db()
+    query: dict = {}
+    if job_status:
+        query["status"] = job_status
+    if episode_id:
+        query["episode_id"] = episode_id
+    items = await db["jobs"].find(query, {"payload": 0, "results": 0}).sort("created_at", -1).to_list(length=limit)
+    for x in items:
+        x["_id"] = str(x["_id"])
+    return items
+
+@router.get("/{job_id}", response_model=JobOut)
+async def get_job(job_id: str, admin_id: str = Depends(require_admin_token)):
+    db = get_db()
+    doc = await db["jobs"].find_one({"_id": oid(job_id)}, {"payload": 0, "results": 0})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Job not found")
+    doc["_id"] = str(doc["_id"])
+    return doc
+
+async def _start_backfill(job_type: str, background_tasks: BackgroundTasks) -> dict:
+    job, new = await start_backfill(job_type)
+    if new:
+        background_tasks.add_task(run_job_now, job["_id"])
+    job["_id"] = str(job["_id"])
+    return job
+
+@router.post("/backfill/audio-meta", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+async def start_audio_meta_backfill(background_tasks: BackgroundTasks, admin_id: str = Depends(require_admin_token)):
+    # at most one backfill of a kind at a time
+    return await _start_backfill(AUDIO_META_JOB, background_tasks)
+
+@router.post("/backfill/cover-renditions", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+async def start_cover_renditions_backfill(background_tasks: BackgroundTasks, admin_id: str = Depends(require_admin_token)):
+    return await _start_backfill(COVER_RENDITIONS_JOB, background_tasks)
+
+@router.post("/backfill/hls", response_model=JobOut, status_code=status.HTTP_202_ACCEPTED)
+async def start_hls_backfill(background_tasks: BackgroundTasks, admin_id: str = Depends(require_admin_token)):
+    return await _start_backfill(HLS_JOB, background_tasks)
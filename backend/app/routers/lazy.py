@@ -0,0 +1,47 @@
+import importlib
+import logging
+from typing import Iterable
+
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound
+
+logger = logging.getLogger(__name__)
+
+class LazyRoutes(BaseRoute):
+    """
+    Stand-in for routers that are only imported when a request first needs them.
+
+    It matches any path under `prefixes`; on the first hit it imports `modules`,
+    includes their routers, removes itself and re-dispatches the request, so
+    every later request goes straight to the real routes.
+    """
+
+    def __init__(self, app: FastAPI, modules: Iterable[str], prefixes: Iterable[str]):
+        self.app = app
+        self.modules = list(modules)
+        self.prefixes = tuple(p.rstrip("/") for p in prefixes if p)
+
+    def _covers(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + "/") for p in self.prefixes)
+
+    def matches(self, scope) -> tuple[Match, dict]:
+        if scope["type"] == "http" and self._covers(scope["path"]):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params):
+        raise NoMatchFound(name, path_params)
+
+    def load(self) -> None:
+        # no await in here, so concurrent first requests can't include twice
+        if self not in self.app.router.routes:
+            return
+        self.app.router.routes.remove(self)
+        for name in self.modules:
+            self.app.include_router(importlib.import_module(name).router)
+        self.app.openapi_schema = None
+        logger.info("lazy routers loaded", extra={"modules": self.modules})
+
+    async def handle(self, scope, receive, send) -> None:
+        self.load()
+        await self.app.router(scope, receive, send)
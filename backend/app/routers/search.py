@@ -0,0 +1,94 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request
+
+from app.core.config import settings
+from app.db.mongo import get_db
+from app.db.pagination import KEYSET_SORT, decode_offset, encode_cursor, encode_offset, keyset_filter
+from app.models.episode import EpisodeSearchOut
+from app.routers.episodes import EPISODE_PROJECTION, page_size
+from app.services import cache
+from app.services.cache import TTLCache, cached_json_response
+
+# Declared before the episodes router so /episodes/search is not taken for an episode id.
+router = APIRouter(tags=["episodes"])
+
+# category -> count over published episodes, keyed by catalog version
+facet_cache = TTLCache(4, settings.EPISODE_CACHE_TTL_SECONDS)
+
+async def category_facets() -> list[dict]:
+    key = cache.catalog_version
+    facets = facet_cache.get(key)
+    if facets is None:
+        db = get_db()
+        pipeline = [
+            {"$match": {"published": True}},
+            {"$group": {"_id": "$category", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]
+        rows = await db["episodes"].aggregate(pipeline).to_list(length=None)
+        facets = [{"category": r["_id"], "count": r["count"]} for r in rows if r["_id"]]
+        facet_cache.set(key, facets)
+    return facets
+
+async def _text_page(q: str, category: Optional[str], size: int, token: Optional[str]) -> tuple[list[dict], Optional[str]]:
+    offset = decode_offset(token)
+    if offset > settings.SEARCH_MAX_OFFSET:
+        return [], None
+    query: dict = {"$text": {"$search": q}, "published": True}
+    if category:
+        query["category"] = category
+    projection = {**EPISODE_PROJECTION, "score": {"$meta": "textScore"}}
+    db = get_db()
+    items = await (
+        db["episodes"].find(query, projection)
+        .sort([("score", {"$meta": "textScore"}), ("created_at", -1)])
+        .skip(offset)
+        .limit(size + 1)
+        .to_list(length=size + 1)
+    )
+    next_token = None
+    if len(items) > size:
+        items = items[:size]
+        next_token = encode_offset(offset + size)
+    return items, next_token
+
+async def _category_page(category: Optional[str], size: int, token: Optional[str]) -> tuple[list[dict], Optional[str]]:
+    query: dict = {"published": True}
+    if category:
+        query["category"] = category
+    db = get_db()
+    items = await db["episodes"].find(keyset_filter(query, token), EPISODE_PROJECTION).sort(KEYSET_SORT).limit(size + 1).to_list(length=size + 1)
+    next_token = None
+    if len(items) > size:
+        items = items[:size]
+        next_token = encode_cursor(items[-1])
+    return items, next_token
+
+@router.get("/episodes/search", response_model=EpisodeSearchOut)
+async def search_episodes(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=200),
+    category: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = Query(None, alias="next"),
+):
+    """
+    Relevance-ranked text search over title, description and category,
+    plus per-category counts of the published catalog.
+    Without `q`, lists the category (or everything) newest first.
+    """
+    size = page_size(limit)
+    q = (q or "").strip()
+
+    async def produce():
+        if q:
+            items, next_token = await _text_page(q, category, size, cursor)
+        else:
+            items, next_token = await _category_page(category, size, cursor)
+        for x in items:
+            x["_id"] = str(x["_id"])
+        out = EpisodeSearchOut(items=items, facets=await category_facets(), next=next_token)
+        return out.model_dump_json(by_alias=True).encode(), {}
+
+    return await cached_json_response(request, ("search", q, category, size, cursor), produce)
@@ -0,0 +1,258 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+import httpx
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends, Path, Request
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.core.security import require_admin_token
+from app.db.mongo import get_db
+from app.models.upload import UploadSessionIn, UploadSessionOut, UploadChunkOut, UploadFinalizeIn
+from app.routers.episodes import oid
+from app.services.backfill import AUDIO_META_JOB, stale_derived, start_backfills
+from app.services.bunny import bunny_delete, bunny_download_stream, bunny_upload_stream, upload_audio
+from app.services.catalog import catalog_changed
+from app.services.jobs import run_job_now
+from app.services.limits import declared_length, limit_stream, too_large
+from app.services.mp3 import Mp3StreamParser, tap
+
+# Resumable audio uploads. Each chunk is its own request (so it fits the
+# serverless body limit) and goes straight to storage as a part object;
+# finalize streams the parts, in order, into a single episode MP3.
+#
+# Every PUT writes a new part object and records it in chunks.{index}
+# ({"size", "key"}); a retry never overwrites a part that finalize may be
+# reading, and finalize only reads the keys recorded when it claimed the session.
+router = APIRouter(prefix="/admin/uploads/sessions", tags=["uploads"])
+
+MAX_CHUNKS = 10_000
+
+def _new_part_key(session_id: str, index: int) -> str:
+    return f"uploads/{session_id}/{index:06d}-{uuid.uuid4().hex[:12]}.part"
+
+def _part_keys(session: dict) -> list[str]:
+    """
+    Recorded part keys in chunk order.
+    """
+    chunks = session.get("chunks", {})
+    return [chunks[k]["key"] for k in sorted(chunks, key=int)]
+
+def _session_out(doc: dict) -> UploadSessionOut:
+    sizes = {int(k): v["size"] for k, v in doc.get("chunks", {}).items()}
+    chunks = []
+    offset = 0
+    for index in sorted(sizes):
+        chunks.append(UploadChunkOut(index=index, size=sizes[index], offset=offset))
+        offset += sizes[index]
+
+    next_index = 0
+    next_offset = 0
+    while next_index in sizes:
+        next_offset += sizes[next_index]
+        next_index += 1
+
+    return UploadSessionOut(
+        id=str(doc["_id"]),
+        filename=doc["filename"],
+        status=doc["status"],
+        chunk_max_bytes=settings.UPLOAD_CHUNK_MAX_BYTES,
+        total_size=doc.get("total_size"),
+        episode_id=doc.get("episode_id"),
+        chunks=chunks,
+        received_bytes=offset,
+        next_index=next_index,
+        next_offset=next_offset,
+        url=doc.get("url"),
+        expires_at=doc["expires_at"],
+    )
+
+async def _get_session(session_id: str) -> dict:
+    db = get_db()
+    doc = await db["upload_sessions"].find_one({"_id": oid(session_id)})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return doc
+
+def _incomplete(session: dict) -> str | None:
+    """
+    Why the session's parts don't make a whole file yet, or None.
+    """
+    info = _session_out(session)
+    if not info.chunks or info.next_index != len(info.chunks):
+        return f"Missing chunk {info.next_index}"
+    if session.get("total_size") is not None and info.received_bytes != session["total_size"]:
+        return f"Received {info.received_bytes} bytes, expected {session['total_size']}"
+    return None
+
+async def _require_episode(episode_id: str) -> None:
+    db = get_db()
+    if not await db["episodes"].find_one({"_id": oid(episode_id)}, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="Episode not found")
+
+async def _concat_parts(keys: list[str]) -> AsyncIterator[bytes]:
+    for key in keys:
+        async for chunk in bunny_download_stream(key):
+            yield chunk
+
+async def _delete_parts(keys) -> None:
+    # best effort: leftovers under uploads/ are harmless
+    await asyncio.gather(*(bunny_delete(key) for key in keys), return_exceptions=True)
+
+@router.post("", response_model=UploadSessionOut, status_code=status.HTTP_201_CREATED)
+async def open_upload_session(payload: UploadSessionIn, admin_id: str = Depends(require_admin_token)):
+    if payload.total_size is not None and payload.total_size > settings.UPLOAD_SESSION_MAX_BYTES:
+        raise too_large("Audio file", settings.UPLOAD_SESSION_MAX_BYTES, payload.total_size)
+    if payload.episode_id:
+        await _require_episode(payload.episode_id)
+
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    doc = {
+        "filename": payload.filename.strip() or "audio.mp3",
+        "total_size": payload.total_size,
+        "episode_id": payload.episode_id,
+        "status": "open",
+        "chunks": {},
+        "created_by": admin_id,
+        "created_at": now,
+        "updated_at": now,
+        "expires_at": now + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS),
+    }
+    res = await db["upload_sessions"].insert_one(doc)
+    doc["_id"] = res.inserted_id
+    return _session_out(doc)
+
+@router.get("/{session_id}", response_model=UploadSessionOut)
+async def get_upload_session(session_id: str, admin_id: str = Depends(require_admin_token)):
+    return _session_out(await _get_session(session_id))
+
+@router.put("/{session_id}/chunks/{index}", response_model=UploadSessionOut)
+async def put_upload_chunk(
+    session_id: str,
+    request: Request,
+    index: int = Path(..., ge=0, lt=MAX_CHUNKS),
+    admin_id: str = Depends(require_admin_token),
+):
+    session = await _get_session(session_id)
+    if session["status"] != "open":
+        raise HTTPException(status_code=409, detail=f"Upload session is {session['status']}")
+
+    limit = settings.UPLOAD_CHUNK_MAX_BYTES
+    length = declared_length(request, limit, "Chunk")
+    counted = 0
+
+    async def body() -> AsyncIterator[bytes]:
+        nonlocal counted
+        async for chunk in limit_stream(request.stream(), limit, "Chunk"):
+            counted += len(chunk)
+            yield chunk
+
+    # Re-sending an index writes a new part and replaces the recorded one.
+    key = _new_part_key(session_id, index)
+    try:
+        await bunny_upload_stream(body(), key, content_length=length)
+    except httpx.TimeoutException:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Storage timeout on chunk upload")
+    except HTTPException:
+        raise
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Chunk upload failed: {exc}")
+
+    others = sum(v["size"] for k, v in session["chunks"].items() if k != str(index))
+    if others + counted > settings.UPLOAD_SESSION_MAX_BYTES:
+        await _delete_parts([key])
+        raise too_large("Audio file", settings.UPLOAD_SESSION_MAX_BYTES)
+
+    db = get_db()
+    part = {"size": counted, "key": key}
+    doc = await db["upload_sessions"].find_one_and_update(
+        {"_id": session["_id"], "status": "open"},
+        {"$set": {f"chunks.{index}": part, "updated_at": datetime.now(timezone.utc)}},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if not doc:
+        # finalize claimed the session first and won't read this part
+        await _delete_parts([key])
+        raise HTTPException(status_code=409, detail="Upload session is no longer open")
+    replaced = doc["chunks"].get(str(index))
+    if replaced:
+        await _delete_parts([replaced["key"]])
+    doc["chunks"][str(index)] = part
+    return _session_out(doc)
+
+@router.post("/{session_id}/finalize", response_model=UploadSessionOut)
+async def finalize_upload_session(
+    session_id: str,
+    background_tasks: BackgroundTasks,
+    payload: UploadFinalizeIn | None = None,
+    admin_id: str = Depends(require_admin_token),
+):
+    db = get_db()
+    session = await _get_session(session_id)
+    if session["status"] == "complete":
+        return _session_out(session)
+
+    problem = _incomplete(session)
+    if problem:
+        raise HTTPException(status_code=409, detail=problem)
+
+    episode_id = (payload.episode_id if payload else None) or session.get("episode_id")
+    if episode_id:
+        await _require_episode(episode_id)
+
+    # claim the session so concurrent finalize calls cannot compose twice
+    claimed = await db["upload_sessions"].find_one_and_update(
+        {"_id": session["_id"], "status": "open"},
+        {"$set": {"status": "finalizing", "updated_at": datetime.now(timezone.utc)}},
+    )
+    if not claimed:
+        raise HTTPException(status_code=409, detail="Upload session is already being finalized")
+    # a chunk retried before the claim may have changed the parts
+    problem = _incomplete(claimed)
+    if problem:
+        await db["upload_sessions"].update_one({"_id": session["_id"]}, {"$set": {"status": "open"}})
+        raise HTTPException(status_code=409, detail=problem)
+
+    keys = _part_keys(claimed)
+    parser = Mp3StreamParser()
+    try:
+        url = await upload_audio(tap(_concat_parts(keys), parser), session["filename"], content_length=_session_out(claimed).received_bytes)
+    except Exception as exc:
+        await db["upload_sessions"].update_one({"_id": session["_id"]}, {"$set": {"status": "open"}})
+        if isinstance(exc, httpx.TimeoutException):
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Storage timeout on finalize")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Finalize failed: {exc}")
+
+    now = datetime.now(timezone.utc)
+    if episode_id:
+        fields = {"audio_url": url, **parser.result(), "updated_at": now}
+        # the parser already refreshed the audio metadata; the HLS rendition is rebuilt
+        unset, job_types = stale_derived(["audio_url"])
+        await db["episodes"].update_one(
+            {"_id": oid(episode_id)},
+            {"$set": fields, "$unset": {k: v for k, v in unset.items() if k not in fields}},
+        )
+        for job_id in await start_backfills(t for t in job_types if t != AUDIO_META_JOB):
+            background_tasks.add_task(run_job_now, job_id)
+        await catalog_changed(episode_id)
+
+    doc = await db["upload_sessions"].find_one_and_update(
+        {"_id": session["_id"]},
+        {"$set": {"status": "complete", "url": url, "episode_id": episode_id, "updated_at": now}},
+        return_document=ReturnDocument.AFTER,
+    )
+    await _delete_parts(keys)
+    return _session_out(doc)
+
+@router.delete("/{session_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def abort_upload_session(session_id: str, admin_id: str = Depends(require_admin_token)):
+    db = get_db()
+    session = await _get_session(session_id)
+    if session["status"] == "finalizing":
+        raise HTTPException(status_code=409, detail="Upload session is being finalized")
+    await db["upload_sessions"].delete_one({"_id": session["_id"]})
+    await _delete_parts(_part_keys(session))
+    return None
@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from bson import ObjectId
+from pymongo import ReplaceOne, UpdateOne
+
+from app.core.config import settings
+from app.core.metrics import PLAYBACK_EVENTS_PENDING, PLAYBACK_FLUSH_DURATION, PLAYBACK_FLUSH_FAILURES
+from app.db.mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+# Playback analytics. Events are never written one by one: they are folded
+# into per episode/day counters in memory and flushed as one unordered
+# bulk_write per collection. A failed flush is merged back into the buffer
+# and retried, so counts are at-least-once.
+#
+#   episode_stats        _id: episode id -> plays, completes, listened_seconds, last_played_at
+#   episode_stats_daily  (episode_id, day) -> the same counters for one UTC day
+#   rankings             _id: ranking name -> top episodes with their counters
+
+COUNTERS = ("plays", "completes", "listened_seconds")
+RANKINGS = ("popular", "trending")
+
+# event type -> counter it increments
+_EVENT_COUNTERS = {"play": "plays", "complete": "completes", "progress": "listened_seconds"}
+
+Increment = tuple[ObjectId, str, float]
+
+def _day(dt: datetime) -> datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _utc(dt: datetime) -> datetime:
+    # Mongo hands back naive UTC datetimes
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+class EventBuffer:
+    """
+    Pending counter increments keyed by (episode id, UTC day).
+    `pending` counts the events folded in since the last flush; `add`
+    refuses a batch that would take it past `max_pending`.
+    """
+
+    def __init__(self, max_pending: int):
+        self.max_pending = max_pending
+        self.pending = 0
+        self.counts: dict[tuple[ObjectId, datetime], dict[str, float]] = {}
+        self.last_played: dict[ObjectId, datetime] = {}
+
+    def add(self, increments: list[Increment], now: datetime) -> bool:
+        if self.pending + len(increments) > self.max_pending:
+            return False
+        day = _day(now)
+        for episode_id, counter, amount in increments:
+            counts = self.counts.get((episode_id, day))
+            if counts is None:
+                counts = self.counts[(episode_id, day)] = dict.fromkeys(COUNTERS, 0)
+            counts[counter] += amount
+            if counter == "plays":
+                self.last_played[episode_id] = now
+        self.pending += len(increments)
+        return True
+
+    def take(self) -> "EventBuffer":
+        """
+        Hand over everything pending and start empty.
+        """
+        taken = EventBuffer(self.max_pending)
+        taken.pending, taken.counts, taken.last_played = self.pending, self.counts, self.last_played
+        self.pending, self.counts, self.last_played = 0, {}, {}
+        return taken
+
+    def restore(self, taken: "EventBuffer") -> None:
+        """
+        Merge a batch that failed to flush back in (even past `max_pending`).
+        """
+        for key, counts in taken.counts.items():
+            mine = self.counts.setdefault(key, dict.fromkeys(COUNTERS, 0))
+            for counter, amount in counts.items():
+                mine[counter] += amount
+        for episode_id, at in taken.last_played.items():
+            self.last_played[episode_id] = max(at, self.last_played.get(episode_id, at))
+        self.pending += taken.pending
+
+buffer = EventBuffer(settings.ANALYTICS_MAX_PENDING_EVENTS)
+_flush_lock = asyncio.Lock()
+_flush_wanted = asyncio.Event()
+_rebuild_lock = asyncio.Lock()
+_flusher: Optional[asyncio.Task] = None
+_stopping = False
+
+def to_increments(events: Iterable) -> tuple[list[Increment], int]:
+    """
+    PlaybackEvents -> counter increments, plus how many were rejected for a bad episode id.
+    Progress events with no listened seconds are dropped as no-ops.
+    """
+    increments: list[Increment] = []
+    rejected = 0
+    for event in events:
+        if not ObjectId.is_valid(event.episode_id):
+            rejected += 1
+            continue
+        if event.type == "progress":
+            if event.seconds:
+                increments.append((ObjectId(event.episode_id), "listened_seconds", event.seconds))
+        else:
+            increments.append((ObjectId(event.episode_id), _EVENT_COUNTERS[event.type], 1))
+    return increments, rejected
+
+async def record_events(increments: list[Increment]) -> bool:
+    """
+    Buffer the increments; False when the buffer is full (the caller sheds load).
+    Without ANALYTICS_BUFFER they are written before returning.
+    """
+    if not buffer.add(increments, datetime.now(timezone.utc)):
+        return False
+    PLAYBACK_EVENTS_PENDING.set(buffer.pending)
+    if not settings.ANALYTICS_BUFFER:
+        try:
+            await flush_events()
+        except Exception as exc:
+            # already accepted: the counters stay buffered and go out with the next batch
+            logger.warning("playback analytics write failed: %s", exc)
+    elif buffer.pending >= settings.ANALYTICS_FLUSH_EVENTS:
+        _flush_wanted.set()
+    return True
+
+async def _write(batch: EventBuffer) -> None:
+    db = get_db()
+    # one lookup per flush keeps made-up ids from growing the stats collections
+    ids = list({episode_id for episode_id, _ in batch.counts})
+    known = {doc["_id"] for doc in await db["episodes"].find({"_id": {"$in": ids}}, {"_id": 1}).to_list(None)}
+
+    daily = []
+    totals: dict[ObjectId, dict[str, float]] = {}
+    for (episode_id, day), counts in batch.counts.items():
+        if episode_id not in known:
+            continue
+        inc = {counter: amount for counter, amount in counts.items() if amount}
+        daily.append(UpdateOne({"episode_id": episode_id, "day": day}, {"$inc": inc}, upsert=True))
+        total = totals.setdefault(episode_id, dict.fromkeys(COUNTERS, 0))
+        for counter, amount in inc.items():
+            total[counter] += amount
+
+    stats = []
+    for episode_id, total in totals.items():
+        update: dict = {"$inc": {counter: amount for counter, amount in total.items() if amount}}
+        if episode_id in batch.last_played:
+            update["$max"] = {"last_played_at": batch.last_played[episode_id]}
+        stats.append(UpdateOne({"_id": episode_id}, update, upsert=True))
+
+    if daily:
+        await db["episode_stats_daily"].bulk_write(daily, ordered=False)
+        await db["episode_stats"].bulk_write(stats, ordered=False)
+
+async def flush_events() -> int:
+    """
+    Write the buffered counters; returns how many events they covered.
+    On failure the counters go back into the buffer for the next flush.
+    """
+    async with _flush_lock:
+        batch = buffer.take()
+        if not batch.pending:
+            return 0
+        started = time.perf_counter()
+        try:
+            await _write(batch)
+        except Exception:
+            buffer.restore(batch)
+            PLAYBACK_FLUSH_FAILURES.inc()
+            raise
+        finally:
+            PLAYBACK_FLUSH_DURATION.observe(time.perf_counter() - started)
+            PLAYBACK_EVENTS_PENDING.set(buffer.pending)
+        return batch.pending
+
+async def rebuild_rankings() -> None:
+    """
+    Recompute every ranking from the counters: popular from all-time plays,
+    trending from plays over the last ANALYTICS_TRENDING_DAYS days.
+    """
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    size = settings.ANALYTICS_RANKING_SIZE
+    fields = {counter: 1 for counter in COUNTERS}
+
+    popular = await db["episode_stats"].find({}, fields).sort([("plays", -1), ("_id", 1)]).limit(size).to_list(size)
+    since = _day(now) - timedelta(days=settings.ANALYTICS_TRENDING_DAYS - 1)
+    trending = await db["episode_stats_daily"].aggregate([
+        {"$match": {"day": {"$gte": since}}},
+        {"$group": {"_id": "$episode_id", **{counter: {"$sum": f"${counter}"} for counter in COUNTERS}}},
+        {"$sort": {"plays": -1, "_id": 1}},
+        {"$limit": size},
+    ]).to_list(size)
+
+    def items(rows: list[dict]) -> list[dict]:
+        return [{"episode_id": row["_id"], **{counter: row.get(counter, 0) for counter in COUNTERS}} for row in rows]
+
+    await db["rankings"].bulk_write([
+        ReplaceOne({"_id": "popular"}, {"items": items(popular), "computed_at": now}, upsert=True),
+        ReplaceOne({"_id": "trending"}, {"items": items(trending), "computed_at": now}, upsert=True),
+    ])
+
+def _fresh(doc: Optional[dict]) -> bool:
+    if doc is None:
+        return False
+    age = datetime.now(timezone.utc) - _utc(doc["computed_at"])
+    return age.total_seconds() < settings.ANALYTICS_RANKINGS_TTL_SECONDS
+
+async def get_ranking(name: str) -> list[dict]:
+    """
+    Items of a precomputed ranking, best first. Rebuilt first when missing or
+    older than ANALYTICS_RANKINGS_TTL_SECONDS; readers never aggregate raw counters.
+    """
+    db = get_db()
+    doc = await db["rankings"].find_one({"_id": name})
+    if not _fresh(doc):
+        async with _rebuild_lock:
+            # another request may have rebuilt it while we waited
+            doc = await db["rankings"].find_one({"_id": name})
+            if not _fresh(doc):
+                await rebuild_rankings()
+                doc = await db["rankings"].find_one({"_id": name})
+    return doc["items"] if doc else []
+
+async def _flush_loop() -> None:
+    while not _stopping:
+        try:
+            await asyncio.wait_for(_flush_wanted.wait(), settings.ANALYTICS_FLUSH_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _flush_wanted.clear()
+        if _stopping:
+            return  # stop_analytics does the last flush
+        try:
+            await flush_events()
+            # keeps the rankings fresh, so requests rarely pay for a rebuild
+            await get_ranking(RANKINGS[0])
+        except Exception as exc:
+            logger.warning("playback analytics flush failed: %s", exc)
+
+def start_analytics() -> None:
+    global _flusher, _stopping
+    if settings.ANALYTICS_BUFFER and _flusher is None:
+        _stopping = False
+        _flusher = asyncio.create_task(_flush_loop())
+
+async def stop_analytics() -> None:
+    """
+    Stop the flush loop (letting a flush in progress finish) and write
+    whatever is still buffered.
+    """
+    global _flusher, _stopping
+    if _flusher is not None:
+        _stopping = True
+        _flush_wanted.set()
+        await _flusher
+        _flusher = None
+    try:
+        await flush_events()
+    except Exception as exc:
+        logger.error("playback events lost on shutdown: %s (%d pending)", exc, buffer.pending)
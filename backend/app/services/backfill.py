@@ -0,0 +1,166 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Iterable
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db.mongo import get_db
+from app.services.bunny import fetch_bytes, get_storage_client
+from app.services.cache import bump_catalog_version
+from app.services.catalog import catalog_changed
+from app.services.covers import MAX_SOURCE_BYTES, build_cover_renditions
+from app.services.hls import package_hls_url
+from app.services.jobs import enqueue, job_handler, set_progress
+from app.services.mp3 import Mp3StreamParser
+
+AUDIO_META_JOB = "backfill_audio_meta"
+COVER_RENDITIONS_JOB = "backfill_cover_renditions"
+HLS_JOB = "backfill_hls"
+
+BATCH_SIZE = 50
+
+# Fields derived from a source url, by the backfill that rebuilds them. When
+# the url changes they are $unset, which puts the episode back in that
+# backfill's query.
+AUDIO_META_FIELDS = ("duration_seconds", "size_bytes", "bitrate_kbps", "sample_rate", "id3", "chapters", "audio_meta_error")
+HLS_FIELDS = ("hls_url", "hls_error")
+COVER_FIELDS = ("cover_renditions", "cover_renditions_error")
+DERIVED_FIELDS: dict[str, list[tuple[str, tuple[str, ...]]]] = {
+    "audio_url": [(AUDIO_META_JOB, AUDIO_META_FIELDS), (HLS_JOB, HLS_FIELDS)],
+    "thumbnail_url": [(COVER_RENDITIONS_JOB, COVER_FIELDS)],
+}
+
+def stale_derived(changed: Iterable[str]) -> tuple[dict[str, str], list[str]]:
+    """
+    For the source fields in `changed`: the $unset of what was derived from
+    them, and the backfill job types that rebuild it.
+    """
+    unset: dict[str, str] = {}
+    job_types: list[str] = []
+    for source in changed:
+        for job_type, fields in DERIVED_FIELDS.get(source, []):
+            unset.update(dict.fromkeys(fields, ""))
+            job_types.append(job_type)
+    return unset, job_types
+
+async def start_backfill(job_type: str) -> tuple[dict, bool]:
+    """
+    The queued or running job of `job_type`, or a newly enqueued one.
+    The flag is True when it is new (the caller may run it inline).
+    A running job re-queries between batches, so it also picks up episodes
+    that started matching after it began.
+    """
+    db = get_db()
+    active = await db["jobs"].find_one({"type": job_type, "status": {"$in": ["queued", "running"]}}, {"payload": 0, "results": 0})
+    if active is not None:
+        return active, False
+    return await enqueue(job_type, {}), True
+
+async def start_backfills(job_types: Iterable[str]) -> list:
+    """
+    start_backfill for each type; returns the ids of the jobs it enqueued.
+    """
+    new_ids = []
+    for job_type in job_types:
+        job, new = await start_backfill(job_type)
+        if new:
+            new_ids.append(job["_id"])
+    return new_ids
+
+async def probe_audio_url(url: str) -> dict[str, Any]:
+    """
+    Stream an episode's MP3 from the CDN through the parser. Stops early when a
+    Xing/Info/VBRI header already gives the frame count (tags come first anyway).
+    """
+    parser = Mp3StreamParser()
+    async with get_storage_client().stream("GET", url) as resp:
+        resp.raise_for_status()
+        length = resp.headers.get("content-length")
+        async for chunk in resp.aiter_bytes():
+            parser.feed(chunk)
+            if parser.complete and length is not None:
+                break
+    return parser.result(total_size=int(length) if length is not None else None)
+
+async def _probe_audio(doc: dict) -> dict[str, Any]:
+    try:
+        return await probe_audio_url(doc["audio_url"])
+    except Exception as exc:
+        # recorded so the next run does not retry the same broken url forever
+        return {"duration_seconds": None, "audio_meta_error": f"{type(exc).__name__}: {exc}"}
+
+async def _render_cover(doc: dict) -> dict[str, Any]:
+    try:
+        data = await fetch_bytes(doc["thumbnail_url"], MAX_SOURCE_BYTES)
+        return {"cover_renditions": await build_cover_renditions(data)}
+    except Exception as exc:
+        return {"cover_renditions": {}, "cover_renditions_error": f"{type(exc).__name__}: {exc}"}
+
+async def _package_hls(doc: dict) -> dict[str, Any]:
+    try:
+        return {"hls_url": await package_hls_url(doc["audio_url"])}
+    except Exception as exc:
+        return {"hls_url": None, "hls_error": f"{type(exc).__name__}: {exc}"}
+
+async def _run_backfill(
+    job: dict,
+    step: str,
+    query: dict,
+    projection: dict,
+    process: Callable[[dict], Awaitable[dict[str, Any]]],
+) -> None:
+    """
+    Process every episode matching `query` a batch at a time, with bounded
+    concurrency and one bulk_write per batch. `process` must return fields
+    that make the episode stop matching `query`, even on failure.
+    """
+    db = get_db()
+    total = await db["episodes"].count_documents(query)
+    limit = asyncio.Semaphore(settings.BACKFILL_CONCURRENCY)
+
+    done = 0
+
+    async def one(doc: dict) -> UpdateOne:
+        nonlocal done
+        async with limit:
+            fields = await process(doc)
+        # renews the lease per episode: a batch of full downloads can outlast it
+        done += 1
+        await set_progress(job, step, done, total)
+        return UpdateOne({"_id": doc["_id"]}, {"$set": {**fields, "updated_at": datetime.now(timezone.utc)}})
+
+    await set_progress(job, step, done, total)
+    while True:
+        batch = await db["episodes"].find(query, projection).limit(BATCH_SIZE).to_list(length=BATCH_SIZE)
+        if not batch:
+            break
+        ops = await asyncio.gather(*(one(doc) for doc in batch))
+        await db["episodes"].bulk_write(ops, ordered=False)
+        bump_catalog_version()
+    await catalog_changed()
+
+@job_handler(AUDIO_META_JOB)
+async def backfill_audio_meta(job: dict) -> None:
+    """
+    Fill duration/size/bitrate/ID3/chapters for episodes ingested before
+    metadata extraction existed.
+    """
+    query = {"duration_seconds": {"$exists": False}, "audio_url": {"$nin": ["", None]}}
+    await _run_backfill(job, "probing", query, {"audio_url": 1}, _probe_audio)
+
+@job_handler(COVER_RENDITIONS_JOB)
+async def backfill_cover_renditions(job: dict) -> None:
+    """
+    Generate resized cover renditions for episodes created before they existed.
+    """
+    query = {"cover_renditions": {"$exists": False}, "thumbnail_url": {"$nin": ["", None]}}
+    await _run_backfill(job, "rendering", query, {"thumbnail_url": 1}, _render_cover)
+
+@job_handler(HLS_JOB)
+async def backfill_hls(job: dict) -> None:
+    """
+    Package episodes from before HLS packaging existed.
+    """
+    query = {"hls_url": {"$exists": False}, "audio_url": {"$nin": ["", None]}}
+    await _run_backfill(job, "packaging", query, {"audio_url": 1}, _package_hls)
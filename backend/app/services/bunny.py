@@ -1,7 +1,62 @@
+import asyncio
+import importlib.util
+import logging
 import re
+import time
 import uuid
+from typing import AsyncIterable, AsyncIterator
+
 import httpx
 from app.core.config import settings
+from app.core.metrics import STORAGE_UPLOAD_BYTES, STORAGE_UPLOAD_DURATION, STORAGE_UPLOAD_FAILURES
+
+logger = logging.getLogger(__name__)
+
+client: httpx.AsyncClient | None = None
+
+# Failures that happen before any body byte is sent: always safe to retry.
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# Failures after the body started: only retried when the body can be replayed.
+_TRANSIENT_ERRORS = (httpx.ReadTimeout, httpx.WriteTimeout, httpx.WriteError, httpx.ReadError, httpx.RemoteProtocolError)
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+def _http2_enabled() -> bool:
+    if not settings.BUNNY_HTTP2:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("BUNNY_HTTP2 is set but the h2 package is not installed; using HTTP/1.1")
+        return False
+    return True
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(connect=30.0, read=300.0, write=300.0, pool=30.0),
+        limits=httpx.Limits(
+            max_connections=settings.BUNNY_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.BUNNY_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.BUNNY_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        http2=_http2_enabled(),
+    )
+
+def get_storage_client() -> httpx.AsyncClient:
+    """
+    Shared, pooled client for the storage API.
+    Normally created by the app lifespan; created lazily if the lifespan never ran.
+    """
+    global client
+    if client is None or client.is_closed:
+        client = _new_client()
+    return client
+
+async def start_storage_client() -> None:
+    get_storage_client()
+
+async def close_storage_client() -> None:
+    global client
+    if client is not None:
+        await client.aclose()
+        client = None
 
 def _safe_filename(name: str) -> str:
     # keep letters, numbers, dot, dash, underscore
@@ -9,44 +64,179 @@ def _safe_filename(name: str) -> str:
     name = re.sub(r"[^A-Za-z0-9._-]", "", name)
     return name or str(uuid.uuid4())
 
-async def bunny_upload_bytes(
-    data: bytes,
+def storage_url(remote_path: str) -> str:
+    return f"{settings.BUNNY_STORAGE_SCHEME}://{settings.BUNNY_STORAGE_HOST}/{settings.BUNNY_STORAGE_ZONE}/{remote_path.lstrip('/')}"
+
+def cdn_url(remote_path: str) -> str:
+    return f"{settings.BUNNY_CDN_BASE.rstrip('/')}/{remote_path.lstrip('/')}"
+
+class _CountingStream:
+    def __init__(self, chunks: AsyncIterable[bytes]):
+        self.chunks = chunks
+        self.sent = 0
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.chunks:
+            self.sent += len(chunk)
+            yield chunk
+
+async def _storage_put(
     remote_path: str,
-    content_type: str | None = None,
+    content: bytes | AsyncIterable[bytes],
+    content_type: str | None,
+    content_length: int | None,
 ) -> str:
+    """
+    PUT to Bunny storage through the shared client, retrying with exponential backoff.
+    A streamed body can only be sent once, so it is retried only on connection
+    errors raised before any of it was read.
+    """
     remote_path = remote_path.lstrip("/")
-    url = f"https://{settings.BUNNY_STORAGE_HOST}/{settings.BUNNY_STORAGE_ZONE}/{remote_path}"
-
+    url = storage_url(remote_path)
     headers = {
         "AccessKey": settings.BUNNY_STORAGE_PASSWORD,
         "Content-Type": content_type or "application/octet-stream",
     }
+    if content_length is not None:
+        headers["Content-Length"] = str(content_length)
 
-    # 🔍 DEBUG PRINTS
-    print("UPLOAD URL:", url)
-    print("HOST:", settings.BUNNY_STORAGE_HOST)
-    print("ZONE:", settings.BUNNY_STORAGE_ZONE)
+    replayable = isinstance(content, bytes)
+    body = content if replayable else _CountingStream(content)
+    started = time.perf_counter()
+    try:
+        attempt = 0
+        while True:
+            attempt += 1
+            can_retry = attempt <= settings.BUNNY_UPLOAD_RETRIES and (replayable or body.sent == 0)
+            try:
+                resp = await get_storage_client().put(url, content=body, headers=headers)
+            except _CONNECT_ERRORS as exc:
+                if not can_retry:
+                    raise
+                reason = repr(exc)
+            except _TRANSIENT_ERRORS as exc:
+                if not (can_retry and replayable):
+                    raise
+                reason = repr(exc)
+            else:
+                if resp.status_code in (200, 201):
+                    break
+                if not (can_retry and replayable and resp.status_code in _RETRY_STATUSES):
+                    logger.warning(
+                        "bunny upload failed",
+                        extra={"remote_path": remote_path, "status": resp.status_code, "attempts": attempt},
+                    )
+                    raise RuntimeError(f"Bunny upload failed: {resp.status_code} - {resp.text[:200]}")
+                reason = f"status {resp.status_code}"
 
-    # 🔧 Improved timeout config
-    timeout = httpx.Timeout(connect=30.0, read=300.0, write=300.0, pool=30.0)
+            delay = settings.BUNNY_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            logger.info(
+                "bunny upload retry",
+                extra={"remote_path": remote_path, "attempt": attempt, "reason": reason, "delay_s": delay},
+            )
+            await asyncio.sleep(delay)
+    except Exception:
+        STORAGE_UPLOAD_DURATION.labels("error").observe(time.perf_counter() - started)
+        STORAGE_UPLOAD_FAILURES.inc()
+        raise
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        resp = await client.put(url, content=data, headers=headers)
+    elapsed = time.perf_counter() - started
+    sent = len(content) if replayable else body.sent
+    STORAGE_UPLOAD_BYTES.inc(sent)
+    STORAGE_UPLOAD_DURATION.labels("ok").observe(elapsed)
+    logger.info(
+        "bunny upload",
+        extra={
+            "remote_path": remote_path,
+            "bytes": sent,
+            "status": resp.status_code,
+            "attempts": attempt,
+            "duration_ms": round(elapsed * 1000, 1),
+        },
+    )
+    return cdn_url(remote_path)
 
-    print("BUNNY RESPONSE STATUS:", resp.status_code)
+async def bunny_upload_stream(
+    chunks: AsyncIterable[bytes],
+    remote_path: str,
+    content_type: str | None = None,
+    content_length: int | None = None,
+) -> str:
+    """
+    PUT an async stream of chunks to Bunny storage without buffering it.
+    With `content_length` the body is sent with a Content-Length header,
+    otherwise with chunked transfer encoding.
+    Any exception raised by `chunks` aborts the upload and propagates.
+    """
+    return await _storage_put(remote_path, chunks, content_type, content_length)
+
+async def bunny_upload_bytes(
+    data: bytes,
+    remote_path: str,
+    content_type: str | None = None,
+) -> str:
+    return await _storage_put(remote_path, data, content_type, None)
 
-    if resp.status_code not in (200, 201):
-        raise RuntimeError(f"Bunny upload failed: {resp.status_code} - {resp.text[:200]}")
+async def bunny_download_stream(remote_path: str) -> AsyncIterator[bytes]:
+    """
+    Stream an object back out of Bunny storage.
+    """
+    headers = {"AccessKey": settings.BUNNY_STORAGE_PASSWORD}
+    async with get_storage_client().stream("GET", storage_url(remote_path), headers=headers) as resp:
+        if resp.status_code != 200:
+            await resp.aread()
+            raise RuntimeError(f"Bunny download failed: {resp.status_code} - {resp.text[:200]}")
+        async for chunk in resp.aiter_bytes():
+            yield chunk
 
-    return f"{settings.BUNNY_CDN_BASE.rstrip('/')}/{remote_path}"
+async def bunny_delete(remote_path: str) -> None:
+    headers = {"AccessKey": settings.BUNNY_STORAGE_PASSWORD}
+    resp = await get_storage_client().delete(storage_url(remote_path), headers=headers)
+    # already gone is as good as deleted
+    if resp.status_code not in (200, 204, 404):
+        raise RuntimeError(f"Bunny delete failed: {resp.status_code} - {resp.text[:200]}")
 
+async def fetch_bytes(url: str, limit_bytes: int) -> bytes:
+    """
+    GET a (small) public file, e.g. an existing cover from the CDN, refusing anything over the limit.
+    """
+    data = bytearray()
+    async with get_storage_client().stream("GET", url) as resp:
+        resp.raise_for_status()
+        async for chunk in resp.aiter_bytes():
+            data.extend(chunk)
+            if len(data) > limit_bytes:
+                raise RuntimeError(f"{url} is larger than {limit_bytes} bytes")
+    return bytes(data)
 
-async def upload_audio(file_bytes: bytes, original_name: str) -> str:
+async def upload_audio(
+    content: bytes | AsyncIterable[bytes],
+    original_name: str,
+    content_length: int | None = None,
+) -> str:
     name = _safe_filename(original_name)
     key = f"episodes/{uuid.uuid4()}-{name}"
-    return await bunny_upload_bytes(file_bytes, key, content_type="audio/mpeg")
+    return await _storage_put(key, content, "audio/mpeg", content_length)
 
-async def upload_image(file_bytes: bytes, original_name: str, mime: str) -> str:
+async def upload_image(
+    content: bytes | AsyncIterable[bytes],
+    original_name: str,
+    mime: str,
+    content_length: int | None = None,
+) -> str:
     name = _safe_filename(original_name)
     key = f"covers/{uuid.uuid4()}-{name}"
-    return await bunny_upload_bytes(file_bytes, key, content_type=mime)
+    return await _storage_put(key, content, mime, content_length)
+
+async def upload_cover_renditions(renditions: dict[str, tuple[bytes, str, str]]) -> dict[str, str]:
+    """
+    Upload rendition bytes concurrently under one covers/<uuid>/ prefix.
+    Returns key -> CDN url.
+    """
+    prefix = f"covers/{uuid.uuid4()}"
+    keys = list(renditions)
+    urls = await asyncio.gather(*(
+        bunny_upload_bytes(renditions[key][0], f"{prefix}/{key}.{renditions[key][1]}", content_type=renditions[key][2])
+        for key in keys
+    ))
+    return dict(zip(keys, urls))
@@ -0,0 +1,102 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+class TTLCache:
+    """
+    Bounded in-process cache: entries expire after `ttl` seconds and the
+    least recently used entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    headers: dict[str, str] = field(default_factory=dict)
+
+
+# Serialized public responses. Keys include the catalog version, so a bump
+# makes every older entry unreachable even before it is cleared or expires.
+# Invalidation is per process; the TTL bounds staleness across instances.
+response_cache = TTLCache(settings.EPISODE_CACHE_MAX_ENTRIES, settings.EPISODE_CACHE_TTL_SECONDS)
+catalog_version = 0
+
+def bump_catalog_version() -> int:
+    """
+    Call after any write to the episodes collection.
+    """
+    global catalog_version
+    catalog_version += 1
+    response_cache.clear()
+    return catalog_version
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison
+        if candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+async def cached_json_response(
+    request: Request,
+    key: Hashable,
+    produce: Callable[[], Awaitable[tuple[bytes, dict[str, str]]]],
+) -> Response:
+    """
+    Serve a JSON body from the response cache, producing and storing it on a miss.
+    Answers 304 when the client's If-None-Match matches the body's ETag.
+    """
+    versioned_key = (catalog_version, key)
+    cached = response_cache.get(versioned_key)
+    if cached is None:
+        body, headers = await produce()
+        cached = CachedResponse(body=body, etag=make_etag(body), headers=headers)
+        response_cache.set(versioned_key, cached)
+
+    headers = {**cached.headers, "ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
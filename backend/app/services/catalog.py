@@ -0,0 +1,28 @@
+import logging
+from typing import Any, Optional
+
+from app.services.cache import bump_catalog_version
+from app.services.changes import announce
+from app.services.feed import regenerate_feed
+
+logger = logging.getLogger(__name__)
+
+async def catalog_changed(
+    episode_id: Any = None,
+    *,
+    deleted: bool = False,
+    published: Optional[bool] = None,
+) -> None:
+    """
+    Call after any write that can change what public readers see.
+    Drops cached responses, tells connected clients and rebuilds the stored
+    RSS feed. Pass the episode for a single-episode write; without one,
+    clients are told to refetch the list.
+    """
+    bump_catalog_version()
+    announce(episode_id, deleted=deleted, published=published)
+    try:
+        await regenerate_feed()
+    except Exception as exc:
+        # the write itself succeeded; the feed catches up on the next change
+        logger.warning("feed regeneration failed: %s", exc)
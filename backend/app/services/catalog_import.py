@@ -0,0 +1,173 @@
+import codecs
+import csv
+import json
+from datetime import datetime, timezone
+from typing import Any, AsyncIterable, AsyncIterator
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.db.mongo import get_db
+from app.models.bulk import EpisodeImportRow
+from app.services.catalog import catalog_changed
+
+# Streaming catalog import: the body is decoded and parsed line by line, rows
+# are validated as they arrive and inserted in batches, so memory stays at one
+# batch however large the file is.
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+class RowError(Exception):
+    def __init__(self, errors: list[dict[str, Any]]):
+        self.errors = errors
+
+def _row_error(type_: str, msg: str) -> RowError:
+    return RowError([{"type": type_, "loc": [], "msg": msg}])
+
+async def _lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """
+    (line number, text) for every line of a UTF-8 body; a leading BOM is dropped.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    line_no = 0
+    bad = False
+    async for chunk in chunks:
+        try:
+            pending += decoder.decode(chunk)
+        except UnicodeDecodeError as exc:
+            # the complete lines before the bad bytes still count
+            pending += exc.object[:exc.start].decode("utf-8-sig")
+            bad = True
+        *complete, pending = pending.split("\n")
+        for line in complete:
+            line_no += 1
+            yield line_no, line.rstrip("\r")
+        if bad:
+            break
+    else:
+        try:
+            pending += decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            bad = True
+    if bad:
+        raise HTTPException(status_code=400, detail=f"Import must be UTF-8 (bad bytes after line {line_no})")
+    if pending:
+        yield line_no + 1, pending.rstrip("\r")
+
+async def _ndjson_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, Any]]:
+    async for line_no, line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            yield line_no, _row_error("json_invalid", str(exc))
+            continue
+        if not isinstance(row, dict):
+            yield line_no, _row_error("dict_type", "Each line must be a JSON object")
+            continue
+        yield line_no, row
+
+async def _csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, Any]]:
+    header = None
+    record, start = None, 0
+    async for line_no, line in _lines(chunks):
+        if record is None:
+            record, start = line, line_no
+        else:
+            record += "\n" + line
+        # an odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        text, record = record, None
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) != len(header):
+            yield start, _row_error("csv_columns", f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        # empty cells fall back to the model defaults
+        yield start, {k: v for k, v in zip(header, values) if v != ""}
+    if record is not None:
+        yield start, _row_error("csv_quote", "Unterminated quoted field")
+
+def _episode_doc(row: EpisodeImportRow, now: datetime, admin_id: str) -> dict:
+    return {
+        "title": row.title.strip(),
+        "description": row.description.strip(),
+        "category": row.category.strip() or "General",
+        "published": row.published,
+        "audio_url": row.audio_url.strip(),
+        "thumbnail_url": row.thumbnail_url.strip(),
+        "created_at": row.created_at or now,
+        "updated_at": now,
+        "created_by": admin_id,
+    }
+
+async def import_episodes(chunks: AsyncIterable[bytes], fmt: str, admin_id: str) -> dict:
+    """
+    Validate rows against EpisodeImportRow (EpisodeCreateJSON plus an optional
+    created_at) and insert the valid ones. Returns counts and per-row errors.
+
+    Batches are committed as they go. If the body breaks off (too large, not
+    UTF-8), the rows read so far stay imported and the HTTP error carries the
+    report so far: {"msg": ..., "rows": ..., "inserted": ..., ...}.
+    """
+    rows = _csv_rows(chunks) if fmt == "csv" else _ndjson_rows(chunks)
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    result = {"rows": 0, "inserted": 0, "failed": 0, "errors": [], "errors_truncated": False}
+
+    def fail(line_no: int, errors: list[dict[str, Any]]) -> None:
+        result["failed"] += 1
+        if len(result["errors"]) < settings.IMPORT_MAX_REPORTED_ERRORS:
+            result["errors"].append({"line": line_no, "errors": errors})
+        else:
+            result["errors_truncated"] = True
+
+    batch: list[dict] = []
+    batch_lines: list[int] = []
+
+    async def flush() -> None:
+        if not batch:
+            return
+        try:
+            res = await db["episodes"].insert_many(batch, ordered=False)
+            result["inserted"] += len(res.inserted_ids)
+        except BulkWriteError as exc:
+            result["inserted"] += exc.details.get("nInserted", 0)
+            for err in exc.details.get("writeErrors", []):
+                fail(batch_lines[err["index"]], [{"type": "write_error", "loc": [], "msg": err.get("errmsg", "")}])
+        batch.clear()
+        batch_lines.clear()
+
+    try:
+        async for line_no, row in rows:
+            result["rows"] += 1
+            if isinstance(row, RowError):
+                fail(line_no, row.errors)
+                continue
+            try:
+                episode = EpisodeImportRow.model_validate(row)
+            except ValidationError as exc:
+                fail(line_no, exc.errors(include_url=False, include_input=False, include_context=False))
+                continue
+            batch.append(_episode_doc(episode, now, admin_id))
+            batch_lines.append(line_no)
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                await flush()
+        await flush()
+    except HTTPException as exc:
+        await flush()
+        raise HTTPException(status_code=exc.status_code, detail={"msg": exc.detail, **result}) from exc
+    finally:
+        # whatever got in, caches, the feed and push clients have to see it
+        if result["inserted"]:
+            await catalog_changed()
+    return result
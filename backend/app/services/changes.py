@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import uuid
+from collections import deque
+from typing import Any, Optional
+
+from pymongo.errors import OperationFailure
+
+from app.core.config import settings
+from app.core.metrics import CHANGE_SUBSCRIBERS
+from app.db.mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+# Catalog change push (GET /changes, /changes/ws). Clients get compact events
+# and fetch only the episode that changed instead of re-polling the list:
+#
+#   {"op": "upsert", "id": ...}   fetch GET /episodes/{id} (a 404 means it is not public)
+#   {"op": "remove", "id": ...}   drop it
+#   {"op": "resync"}              too much changed (bulk write, slow client): refetch the list
+#
+# With CHANGE_STREAMS and a replica set, a MongoDB change stream on `episodes`
+# feeds the broadcaster, so writes made by any instance or worker reach every
+# client. Otherwise the write paths announce their own changes through
+# catalog_changed(), which only reaches clients connected to the same process.
+
+RESYNC = {"op": "resync"}
+
+# writes to these fields alone are invisible to clients (feed regeneration)
+_INTERNAL_FIELDS = {"rss_item", "rss_item_at"}
+
+# change streams need a replica set / sharded cluster; these mean "never here"
+_UNSUPPORTED_CODES = {40573, 40324}
+# the resume token fell off the oplog
+_HISTORY_LOST = 286
+
+def to_event(op: str, episode_id: Any, published: Optional[bool] = None) -> Optional[dict]:
+    """
+    A write ("insert", "update", "replace", "delete") as clients see it.
+    `published=None` means unknown: the client asks and gets the episode or a 404.
+    Drafts are not announced when they are created.
+    """
+    if op == "delete" or published is False:
+        return None if op == "insert" else {"op": "remove", "id": str(episode_id)}
+    return {"op": "upsert", "id": str(episode_id)}
+
+class ChangeBroadcaster:
+    """
+    Fans events out to one bounded queue per subscriber. A subscriber that
+    falls `queue_size` events behind has its backlog replaced by one resync,
+    so a slow client never holds memory or delays the others.
+
+    The last `replay` events are kept, so a client reconnecting with the id of
+    the last event it saw (SSE Last-Event-ID) gets what it missed. Ids carry a
+    per-process epoch; an id from another process or a restart means resync.
+    """
+
+    def __init__(self, queue_size: int, replay: int):
+        self.queue_size = queue_size
+        self.epoch = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self.recent: deque[tuple[int, dict]] = deque(maxlen=replay)
+        self._subscribers: set[asyncio.Queue] = set()
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def publish(self, event: dict) -> None:
+        self.seq += 1
+        self.recent.append((self.seq, event))
+        item = (self.event_id(self.seq), event)
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait((item[0], RESYNC))
+
+    def _missed(self, last_event_id: Optional[str]) -> list[tuple[str, dict]]:
+        if not last_event_id:
+            return []
+        epoch, _, seq = last_event_id.partition("-")
+        oldest = self.recent[0][0] if self.recent else self.seq + 1
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self.seq or int(seq) < oldest - 1:
+            return [(self.event_id(self.seq), RESYNC)]
+        missed = [(self.event_id(n), event) for n, event in self.recent if n > int(seq)]
+        if len(missed) >= self.queue_size:
+            return [(self.event_id(self.seq), RESYNC)]
+        return missed
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        for item in self._missed(last_event_id):
+            queue.put_nowait(item)
+        self._subscribers.add(queue)
+        CHANGE_SUBSCRIBERS.set(len(self._subscribers))
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+        CHANGE_SUBSCRIBERS.set(len(self._subscribers))
+
+broadcaster = ChangeBroadcaster(settings.CHANGES_QUEUE_SIZE, settings.CHANGES_REPLAY_SIZE)
+
+# True while a change stream is delivering every write
+_streaming = False
+_watcher: Optional[asyncio.Task] = None
+
+def announce(episode_id: Any = None, *, deleted: bool = False, published: Optional[bool] = None) -> None:
+    """
+    Publish a write made by this process; no episode means "many changed".
+    Skipped while a change stream is running, since it reports the same write.
+    """
+    if _streaming:
+        return
+    if episode_id is None:
+        broadcaster.publish(RESYNC)
+        return
+    event = to_event("delete" if deleted else "update", episode_id, published)
+    if event is not None:
+        broadcaster.publish(event)
+
+# keep the events small: op, id, published and the names of the changed fields
+_STREAM_PIPELINE = [
+    {"$match": {"operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+    {"$project": {
+        "operationType": 1,
+        "documentKey": 1,
+        "published": "$fullDocument.published",
+        "changed": {"$map": {
+            "input": {"$objectToArray": {"$ifNull": ["$updateDescription.updatedFields", {}]}},
+            "in": "$$this.k",
+        }},
+    }},
+]
+
+def _stream_event(change: dict) -> Optional[dict]:
+    op = change["operationType"]
+    if op == "update" and set(change.get("changed") or ()) <= _INTERNAL_FIELDS:
+        return None
+    return to_event(op, change["documentKey"]["_id"], change.get("published"))
+
+def _unsupported(exc: Exception) -> bool:
+    if isinstance(exc, OperationFailure):
+        return exc.code in _UNSUPPORTED_CODES
+    # drivers without change stream support (mongomock in tests and benches)
+    return isinstance(exc, (TypeError, NotImplementedError))
+
+async def _watch() -> None:
+    global _streaming
+    resume_token = None
+    backoff = 1.0
+    while True:
+        try:
+            async with get_db()["episodes"].watch(
+                _STREAM_PIPELINE, full_document="updateLookup", resume_after=resume_token
+            ) as stream:
+                # opens the cursor, so a deployment without change streams fails here
+                change = await stream.try_next()
+                if not _streaming:
+                    logger.info("catalog changes: following the episodes change stream")
+                _streaming, backoff = True, 1.0
+                while True:
+                    resume_token = stream.resume_token
+                    event = _stream_event(change) if change is not None else None
+                    if event is not None:
+                        broadcaster.publish(event)
+                    change = await stream.next()
+        except Exception as exc:
+            _streaming = False
+            if _unsupported(exc):
+                logger.info("catalog changes: no change streams here, announcing local writes only")
+                return
+            # local writes are announced again until the stream is back
+            logger.warning("catalog change stream failed: %s", exc)
+            if isinstance(exc, OperationFailure) and (
+                exc.code == _HISTORY_LOST or exc.has_error_label("NonResumableChangeStreamError")
+            ):
+                resume_token = None
+            if resume_token is None:
+                # whatever happened meanwhile is lost
+                broadcaster.publish(RESYNC)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+def start_change_feed() -> None:
+    global _watcher
+    if settings.CHANGE_STREAMS and _watcher is None:
+        _watcher = asyncio.create_task(_watch())
+
+async def stop_change_feed() -> None:
+    global _watcher, _streaming
+    if _watcher is not None:
+        _watcher.cancel()
+        await asyncio.gather(_watcher, return_exceptions=True)
+        _watcher, _streaming = None, False
@@ -0,0 +1,45 @@
+import logging
+
+from app.services.bunny import fetch_bytes, upload_cover_renditions
+from app.services.images import render_cover_async
+from app.services.jobs import save_result
+from app.services.staging import staged_stream
+
+logger = logging.getLogger(__name__)
+
+# existing covers fetched for renditions may predate the 1 MB upload limit
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+
+async def build_cover_renditions(data: bytes) -> dict[str, str]:
+    """
+    Resize in the process pool, then upload every rendition concurrently.
+    Returns rendition key -> CDN url.
+    """
+    return await upload_cover_renditions(await render_cover_async(data))
+
+async def _cover_source(episode: dict, job: dict) -> bytes | None:
+    cover = job["payload"].get("cover")
+    if cover:
+        return b"".join([chunk async for chunk in staged_stream(cover["file_id"])])
+    if episode.get("thumbnail_url"):
+        return await fetch_bytes(episode["thumbnail_url"], MAX_SOURCE_BYTES)
+    return None
+
+async def cover_renditions_step(episode: dict, job: dict) -> dict:
+    """
+    Ingest post-processing: add `cover_renditions` to the episode.
+    A failure here leaves the episode without renditions (the backfill can
+    add them later) rather than failing the whole ingest.
+    """
+    if job.get("results", {}).get("cover_renditions"):
+        return {"cover_renditions": job["results"]["cover_renditions"]}
+    try:
+        data = await _cover_source(episode, job)
+        if data is None:
+            return {}
+        urls = await build_cover_renditions(data)
+        await save_result(job, "cover_renditions", urls)
+        return {"cover_renditions": urls}
+    except Exception as exc:
+        logger.warning("cover renditions failed", extra={"episode_id": str(episode["_id"]), "error": repr(exc)})
+        return {}
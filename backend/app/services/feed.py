@@ -0,0 +1,122 @@
+import gzip
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Optional
+from xml.sax.saxutils import escape, quoteattr
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.db.mongo import get_db
+from app.services.cache import TTLCache, make_etag
+
+# The podcast RSS feed is stored prebuilt in the `feeds` collection and only
+# rebuilt after admin writes. Each episode keeps its rendered <item> next to
+# the `updated_at` it was rendered for, so a rebuild re-renders only the
+# episodes that changed and otherwise just concatenates stored fragments.
+
+FEED_ID = "podcast"
+
+ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
+
+# one slot: the current feed document, as last read from or written to Mongo
+feed_cache = TTLCache(1, settings.EPISODE_CACHE_TTL_SECONDS)
+
+def _rfc2822(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt, usegmt=True)
+
+def _hhmmss(seconds: float) -> str:
+    s = int(round(seconds))
+    return f"{s // 3600:02d}:{s % 3600 // 60:02d}:{s % 60:02d}"
+
+def render_item(doc: dict) -> str:
+    parts = [
+        "<item>",
+        f"<title>{escape(doc['title'])}</title>",
+        f"<description>{escape(doc.get('description') or '')}</description>",
+        f'<guid isPermaLink="false">{doc["_id"]}</guid>',
+        f"<pubDate>{_rfc2822(doc['created_at'])}</pubDate>",
+        f"<category>{escape(doc.get('category') or 'General')}</category>",
+        f"<enclosure url={quoteattr(doc['audio_url'])} length=\"{doc.get('size_bytes') or 0}\" type=\"audio/mpeg\"/>",
+    ]
+    if doc.get("duration_seconds"):
+        parts.append(f"<itunes:duration>{_hhmmss(doc['duration_seconds'])}</itunes:duration>")
+    if doc.get("thumbnail_url"):
+        parts.append(f"<itunes:image href={quoteattr(doc['thumbnail_url'])}/>")
+    parts.append("<itunes:episodeType>full</itunes:episodeType>")
+    parts.append("</item>")
+    return "".join(parts)
+
+def _channel_head(last_build: datetime) -> str:
+    explicit = "true" if settings.PODCAST_EXPLICIT else "false"
+    head = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<rss version="2.0" xmlns:itunes="{ITUNES_NS}">',
+        "<channel>",
+        f"<title>{escape(settings.PODCAST_TITLE)}</title>",
+        f"<link>{escape(settings.PODCAST_LINK)}</link>",
+        f"<description>{escape(settings.PODCAST_DESCRIPTION)}</description>",
+        f"<language>{escape(settings.PODCAST_LANGUAGE)}</language>",
+        f"<lastBuildDate>{_rfc2822(last_build)}</lastBuildDate>",
+        f"<itunes:author>{escape(settings.PODCAST_AUTHOR)}</itunes:author>",
+        f"<itunes:explicit>{explicit}</itunes:explicit>",
+        f"<itunes:category text={quoteattr(settings.PODCAST_CATEGORY)}/>",
+    ]
+    if settings.PODCAST_IMAGE_URL:
+        head.append(f"<itunes:image href={quoteattr(settings.PODCAST_IMAGE_URL)}/>")
+    return "".join(head)
+
+async def regenerate_feed() -> dict[str, Any]:
+    db = get_db()
+    # same filter as the public listing: processing episodes are unpublished until ready
+    query = {"published": True}
+    projection = {"title": 1, "description": 1, "category": 1, "audio_url": 1, "thumbnail_url": 1,
+                  "created_at": 1, "updated_at": 1, "size_bytes": 1, "duration_seconds": 1,
+                  "rss_item": 1, "rss_item_at": 1}
+    docs = await db["episodes"].find(query, projection).sort([("created_at", -1), ("_id", -1)]).to_list(length=settings.FEED_MAX_ITEMS)
+
+    items = []
+    stale = []
+    for doc in docs:
+        if doc.get("rss_item") is None or doc.get("rss_item_at") != doc["updated_at"]:
+            doc["rss_item"] = render_item(doc)
+            stale.append(UpdateOne(
+                {"_id": doc["_id"], "updated_at": doc["updated_at"]},
+                {"$set": {"rss_item": doc["rss_item"], "rss_item_at": doc["updated_at"]}},
+            ))
+        items.append(doc["rss_item"])
+    if stale:
+        await db["episodes"].bulk_write(stale, ordered=False)
+
+    body = "".join(items)
+    content_key = make_etag((_channel_head(datetime.min) + body).encode())
+    current = await load_feed()
+    if current is not None and current.get("content_key") == content_key:
+        # nothing a directory would see changed: keep ETag / Last-Modified stable
+        return current
+
+    now = datetime.now(timezone.utc)
+    xml = (_channel_head(now) + body + "</channel></rss>").encode()
+    feed = {
+        "_id": FEED_ID,
+        "xml": xml,
+        "gzip": gzip.compress(xml, compresslevel=9),
+        "etag": make_etag(xml),
+        "content_key": content_key,
+        "last_modified": now.replace(microsecond=0),
+        "item_count": len(items),
+    }
+    await db["feeds"].replace_one({"_id": FEED_ID}, feed, upsert=True)
+    feed_cache.set(FEED_ID, feed)
+    return feed
+
+async def load_feed() -> Optional[dict[str, Any]]:
+    feed = feed_cache.get(FEED_ID)
+    if feed is None:
+        db = get_db()
+        feed = await db["feeds"].find_one({"_id": FEED_ID})
+        if feed is not None:
+            feed_cache.set(FEED_ID, feed)
+    return feed
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import math
+import uuid
+from typing import AsyncIterable, Optional
+
+from app.core.config import settings
+from app.services.bunny import bunny_upload_bytes, get_storage_client
+from app.services.jobs import save_result
+from app.services.mp3 import parse_frame_header, syncsafe, vbr_frame_count
+from app.services.staging import staged_stream
+
+logger = logging.getLogger(__name__)
+
+# HLS packaging without transcoding: the MP3 is cut on frame boundaries into
+# ~HLS_SEGMENT_SECONDS packed-audio segments (RFC 8216 §3.4) and listed in a
+# VOD playlist. Segments are uploaded while the source is still streaming in,
+# so memory stays at a few segments whatever the episode length.
+
+PLAYLIST_NAME = "index.m3u8"
+PLAYLIST_TYPE = "application/vnd.apple.mpegurl"
+SEGMENT_TYPE = "audio/mpeg"
+
+# packed audio segments carry their start time in this ID3 PRIV frame (90 kHz clock)
+_TIMESTAMP_OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+
+def _syncsafe_bytes(n: int) -> bytes:
+    return bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+
+def timestamp_tag(start_samples: int, sample_rate: int) -> bytes:
+    pts = (start_samples * 90000 // sample_rate) & ((1 << 33) - 1)
+    body = _TIMESTAMP_OWNER + pts.to_bytes(8, "big")
+    frame = b"PRIV" + _syncsafe_bytes(len(body)) + b"\x00\x00" + body
+    return b"ID3\x04\x00\x00" + _syncsafe_bytes(len(frame)) + frame
+
+class Mp3Segmenter:
+    """
+    Feed MP3 bytes; collect `(segment bytes, duration seconds)` from `feed` and `finish`.
+    The leading ID3 tag, the Xing/Info/VBRI frame and anything that is not a
+    frame of the stream's MPEG version and sample rate are dropped.
+    """
+
+    def __init__(self, target_seconds: float):
+        self.target_seconds = target_seconds
+        self.sample_rate = 0
+        self._version: Optional[int] = None
+        self._buf = bytearray()
+        self._id3_pending: Optional[int] = None  # bytes of leading tag still to skip; None = not checked
+        self._segment = bytearray()
+        self._segment_samples = 0
+        self._start_samples = 0
+
+    def feed(self, chunk: bytes) -> list[tuple[bytes, float]]:
+        self._buf += chunk
+        if self._id3_pending is None:
+            if len(self._buf) < 10:
+                return []
+            self._id3_pending = 0
+            if self._buf[:3] == b"ID3":
+                footer = 10 if self._buf[5] & 0x10 else 0
+                self._id3_pending = 10 + syncsafe(self._buf[6:10]) + footer
+        if self._id3_pending:
+            skip = min(self._id3_pending, len(self._buf))
+            del self._buf[:skip]
+            self._id3_pending -= skip
+            if self._id3_pending:
+                return []
+
+        out = []
+        buf, i, n = self._buf, 0, len(self._buf)
+        while n - i >= 4:
+            header = parse_frame_header(bytes(buf[i:i + 4]))
+            if header is None or (self._version is not None and (header[3], header[2]) != (self._version, self.sample_rate)):
+                nxt = buf.find(b"\xff", i + 1)
+                i = n if nxt < 0 else nxt
+                continue
+            frame_len, spf, sample_rate, version, channel_mode = header
+            if i + frame_len > n:
+                break  # wait for the rest of the frame
+            frame = bytes(buf[i:i + frame_len])
+            i += frame_len
+            if self._version is None:
+                self._version, self.sample_rate = version, sample_rate
+                if vbr_frame_count(frame, version, channel_mode) is not None:
+                    continue  # the VBR header frame carries no audio
+            self._segment += frame
+            self._segment_samples += spf
+            if self._segment_samples >= self.target_seconds * self.sample_rate:
+                out.append(self._cut())
+        del buf[:i]
+        return out
+
+    def finish(self) -> list[tuple[bytes, float]]:
+        return [self._cut()] if self._segment_samples else []
+
+    def _cut(self) -> tuple[bytes, float]:
+        data = timestamp_tag(self._start_samples, self.sample_rate) + bytes(self._segment)
+        duration = self._segment_samples / self.sample_rate
+        self._start_samples += self._segment_samples
+        self._segment = bytearray()
+        self._segment_samples = 0
+        return data, duration
+
+def segment_name(index: int) -> str:
+    return f"seg{index:05d}.mp3"
+
+def render_playlist(durations: list[float]) -> str:
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{math.ceil(max(durations))}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    for index, duration in enumerate(durations):
+        lines.append(f"#EXTINF:{duration:.3f},")
+        lines.append(segment_name(index))
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+async def package_hls(chunks: AsyncIterable[bytes]) -> str:
+    """
+    Segment an MP3 stream and upload the segments concurrently (at most
+    HLS_UPLOAD_CONCURRENCY in flight), then the playlist, all under one
+    hls/<uuid>/ prefix. Returns the playlist's CDN url.
+    """
+    prefix = f"hls/{uuid.uuid4()}"
+    segmenter = Mp3Segmenter(settings.HLS_SEGMENT_SECONDS)
+    slots = asyncio.Semaphore(settings.HLS_UPLOAD_CONCURRENCY)
+    durations: list[float] = []
+    uploads: list[asyncio.Task] = []
+
+    async def upload(index: int, data: bytes) -> None:
+        try:
+            await bunny_upload_bytes(data, f"{prefix}/{segment_name(index)}", content_type=SEGMENT_TYPE)
+        finally:
+            slots.release()
+
+    async def start(segments: list[tuple[bytes, float]]) -> None:
+        for data, duration in segments:
+            # backpressure: wait for a free slot before reading further
+            await slots.acquire()
+            uploads.append(asyncio.create_task(upload(len(durations), data)))
+            durations.append(duration)
+
+    try:
+        async for chunk in chunks:
+            await start(segmenter.feed(chunk))
+        await start(segmenter.finish())
+        await asyncio.gather(*uploads)
+    except BaseException:
+        for task in uploads:
+            task.cancel()
+        await asyncio.gather(*uploads, return_exceptions=True)
+        raise
+    if not durations:
+        raise ValueError("no MPEG audio frames found")
+
+    # last, so a published playlist never points at a missing segment
+    return await bunny_upload_bytes(render_playlist(durations).encode(), f"{prefix}/{PLAYLIST_NAME}", content_type=PLAYLIST_TYPE)
+
+async def _url_stream(url: str) -> AsyncIterable[bytes]:
+    async with get_storage_client().stream("GET", url) as resp:
+        resp.raise_for_status()
+        async for chunk in resp.aiter_bytes():
+            yield chunk
+
+async def package_hls_url(url: str) -> str:
+    return await package_hls(_url_stream(url))
+
+async def hls_step(episode: dict, job: dict) -> dict:
+    """
+    Ingest post-processing: package the audio as HLS and add `hls_url`.
+    Like cover renditions, a failure leaves the episode on its plain MP3
+    (the HLS backfill can retry) instead of failing the ingest.
+    """
+    if job.get("results", {}).get("hls_url"):
+        return {"hls_url": job["results"]["hls_url"]}
+    audio = job["payload"].get("audio")
+    if not audio:
+        return {}  # audio_url episodes are left to the HLS backfill
+    try:
+        url = await package_hls(staged_stream(audio["file_id"]))
+        await save_result(job, "hls_url", url)
+        return {"hls_url": url}
+    except Exception as exc:
+        logger.warning("hls packaging failed", extra={"episode_id": str(episode["_id"]), "error": repr(exc)})
+        return {}
@@ -0,0 +1,93 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Cover renditions: key -> (longest side in px, Pillow format).
+# WebP for clients that support it, one JPEG as the fallback.
+RENDITIONS: dict[str, tuple[int, str]] = {
+    "96": (96, "WEBP"),
+    "300": (300, "WEBP"),
+    "1000": (1000, "WEBP"),
+    "jpeg": (300, "JPEG"),
+}
+
+_EXTENSIONS = {"WEBP": ("webp", "image/webp"), "JPEG": ("jpg", "image/jpeg")}
+
+_pool: ProcessPoolExecutor | None = None
+# set once worker processes turned out not to work here; renders go to threads
+_no_pool = False
+
+def render_cover(data: bytes) -> dict[str, tuple[bytes, str, str]]:
+    """
+    Resize and re-encode one cover into every rendition.
+    Returns key -> (bytes, file extension, mime). CPU-bound: run it via `render_cover_async`.
+    """
+    # imported here so only the worker processes pay for Pillow
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as src:
+        src = ImageOps.exif_transpose(src)
+        src = src.convert("RGBA" if src.mode in ("RGBA", "LA", "P") else "RGB")
+        out = {}
+        # largest first, each smaller size resampled from the previous one
+        current = src
+        for key, (size, fmt) in sorted(RENDITIONS.items(), key=lambda kv: -kv[1][0]):
+            current = current.copy()
+            current.thumbnail((size, size), Image.Resampling.LANCZOS)
+            img = current
+            if fmt == "JPEG" and img.mode != "RGB":
+                img = img.convert("RGB")
+            buf = io.BytesIO()
+            if fmt == "WEBP":
+                img.save(buf, fmt, quality=80, method=4)
+            else:
+                img.save(buf, fmt, quality=82, optimize=True, progressive=True)
+            ext, mime = _EXTENSIONS[fmt]
+            out[key] = (buf.getvalue(), ext, mime)
+        return out
+
+def _pool_failed(exc: BaseException) -> None:
+    global _no_pool
+    if not _no_pool:
+        _no_pool = True
+        logger.warning("image worker processes unavailable (%s), rendering covers in threads", exc)
+
+def _get_pool() -> ProcessPoolExecutor | None:
+    """
+    The render process pool, or None when covers render in threads: with
+    IMAGE_WORKERS=0 or where processes can't be started (no /dev/shm on
+    serverless hosts).
+    """
+    global _pool
+    if _pool is None and settings.IMAGE_WORKERS > 0 and not _no_pool:
+        # fork would copy the event loop and open connections into the workers
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        try:
+            _pool = ProcessPoolExecutor(max_workers=settings.IMAGE_WORKERS, mp_context=multiprocessing.get_context(method))
+        except (OSError, ImportError, NotImplementedError) as exc:
+            _pool_failed(exc)
+    return _pool
+
+async def render_cover_async(data: bytes) -> dict[str, tuple[bytes, str, str]]:
+    pool = _get_pool()
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, render_cover, data)
+        except BrokenProcessPool as exc:
+            # workers could not start (or died): stop using processes
+            _pool_failed(exc)
+            shutdown_image_pool()
+    return await asyncio.to_thread(render_cover, data)
+
+def shutdown_image_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.db.mongo import get_db
+from app.services.bunny import upload_audio, upload_image
+from app.services.catalog import catalog_changed
+from app.services.covers import cover_renditions_step
+from app.services.hls import hls_step
+from app.services.jobs import job_handler, save_result, set_progress
+from app.services.mp3 import Mp3StreamParser, tap
+from app.services.staging import delete_staged, staged_stream
+
+INGEST_JOB = "ingest_episode"
+
+# Extra steps run after the assets are in storage. Each gets the episode
+# document (with the final urls) and the job, and returns fields to $set.
+PostProcessor = Callable[[dict, dict], Awaitable[dict]]
+POST_PROCESSORS: list[PostProcessor] = [cover_renditions_step, hls_step]
+
+async def _upload_staged_audio(job: dict) -> str:
+    # metadata is read from the same bytes on their way to storage
+    audio = job["payload"]["audio"]
+    parser = Mp3StreamParser()
+    url = await upload_audio(tap(staged_stream(audio["file_id"]), parser), audio["filename"], content_length=audio["size"])
+    await save_result(job, "audio_meta", parser.result())
+    return url
+
+async def _upload_staged_cover(job: dict) -> str:
+    cover = job["payload"]["cover"]
+    return await upload_image(
+        staged_stream(cover["file_id"]),
+        cover["filename"],
+        cover["content_type"],
+        content_length=cover["size"],
+    )
+
+async def _upload_asset(job: dict, key: str, upload: Callable[[dict], Awaitable[str]]) -> str:
+    # a retried attempt reuses uploads that already finished
+    url = job.get("results", {}).get(key)
+    if url is None:
+        url = await upload(job)
+        await save_result(job, key, url)
+    return url
+
+async def _discard_staged(job: dict) -> None:
+    staged = [job["payload"][k]["file_id"] for k in ("audio", "cover") if job["payload"].get(k)]
+    await asyncio.gather(*(delete_staged(file_id) for file_id in staged))
+
+async def _mark_failed(job: dict, error: str) -> None:
+    db = get_db()
+    await db["episodes"].update_one(
+        {"_id": ObjectId(job["episode_id"])},
+        {"$set": {"status": "failed", "updated_at": datetime.now(timezone.utc)}},
+    )
+    await _discard_staged(job)
+
+@job_handler(INGEST_JOB, on_failure=_mark_failed)
+async def ingest_episode(job: dict) -> None:
+    """
+    Push staged audio/cover to storage concurrently, run post-processing,
+    then flip the episode to ready (and to published, if that was requested).
+    """
+    db = get_db()
+    episode_id = ObjectId(job["episode_id"])
+    episode = await db["episodes"].find_one({"_id": episode_id})
+    if episode is None:
+        # deleted while processing
+        await _discard_staged(job)
+        return
+
+    uploads = []
+    if job["payload"].get("audio"):
+        uploads.append(("audio_url", _upload_staged_audio))
+    if job["payload"].get("cover"):
+        uploads.append(("thumbnail_url", _upload_staged_cover))
+
+    done = 0
+
+    async def run_upload(key: str, upload: Callable[[dict], Awaitable[str]]) -> str:
+        nonlocal done
+        url = await _upload_asset(job, key, upload)
+        done += 1
+        await set_progress(job, "uploading", done, len(uploads))
+        return url
+
+    await set_progress(job, "uploading", 0, len(uploads))
+    urls = await asyncio.gather(*(run_upload(key, upload) for key, upload in uploads))
+    update = dict(zip((key for key, _ in uploads), urls))
+    update.update(job.get("results", {}).get("audio_meta") or {})
+    episode.update(update)
+
+    for n, step in enumerate(POST_PROCESSORS):
+        await set_progress(job, "post-processing", n, len(POST_PROCESSORS))
+        update.update(await step(episode, job))
+        episode.update(update)
+
+    update.update({"status": "ready", "updated_at": datetime.now(timezone.utc)})
+    # published comes from the document as it is now, not as it was when the
+    # job started: an admin may have changed it during the uploads
+    done_doc = await db["episodes"].find_one_and_update(
+        {"_id": episode_id},
+        [
+            {"$set": {
+                **{k: {"$literal": v} for k, v in update.items()},
+                "published": {"$ifNull": ["$publish_on_ready", "$published"]},
+            }},
+            {"$project": {"publish_on_ready": 0}},
+        ],
+        projection={"published": 1},
+        return_document=ReturnDocument.AFTER,
+    )
+    if done_doc is None:
+        # deleted while processing
+        await _discard_staged(job)
+        return
+    await catalog_changed(episode_id, published=done_doc["published"])
+
+    await set_progress(job, "done", len(uploads), len(uploads))
+    await _discard_staged(job)
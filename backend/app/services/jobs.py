@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from app.core.config import settings
+from app.db.mongo import get_db
+
+logger = logging.getLogger(__name__)
+
+# Background jobs queued in the `jobs` collection. Workers claim a job by
+# taking a lease on it; a job whose lease ran out (crashed worker) is
+# claimable again. Failed attempts are retried with exponential backoff.
+#
+# Job states: queued -> running -> succeeded | failed (after max_attempts)
+
+Handler = Callable[[dict], Awaitable[None]]
+FailureHook = Callable[[dict, str], Awaitable[None]]
+
+@dataclass
+class _Registered:
+    handler: Handler
+    on_failure: Optional[FailureHook] = None
+
+HANDLERS: dict[str, _Registered] = {}
+
+_wakeup = asyncio.Event()
+
+def job_handler(job_type: str, on_failure: Optional[FailureHook] = None):
+    """
+    Register `func(job)` as the handler for `job_type`.
+    `on_failure(job, error)` runs once the job has used up its attempts.
+    """
+    def decorator(func: Handler) -> Handler:
+        HANDLERS[job_type] = _Registered(func, on_failure)
+        return func
+    return decorator
+
+async def enqueue(
+    job_type: str,
+    payload: dict[str, Any],
+    episode_id: Optional[str] = None,
+    job_id: Optional[ObjectId] = None,
+) -> dict:
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    doc = {
+        "_id": job_id or ObjectId(),
+        "type": job_type,
+        "episode_id": episode_id,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": settings.JOB_MAX_ATTEMPTS,
+        "run_after": now,
+        "locked_until": None,
+        "progress": {},
+        "results": {},
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+    await db["jobs"].insert_one(doc)
+    _wakeup.set()
+    return doc
+
+def _claimed(job: dict) -> dict:
+    """
+    Filter for a job still held by the claim `job` came from. Every claim bumps
+    `attempts`, so once the lease ran out and another worker re-claimed the
+    job, the old worker's writes match nothing.
+    """
+    return {"_id": job["_id"], "status": "running", "worker_id": job.get("worker_id"), "attempts": job.get("attempts")}
+
+async def set_progress(job: dict, step: str, done: int = 0, total: int = 0) -> None:
+    """
+    Record progress; doubles as a heartbeat that renews the worker's lease.
+    """
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    await db["jobs"].update_one(
+        _claimed(job),
+        {"$set": {
+            "progress": {"step": step, "done": done, "total": total},
+            "locked_until": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+            "updated_at": now,
+        }},
+    )
+
+async def save_result(job: dict, key: str, value: Any) -> None:
+    """
+    Persist a partial result so a retried attempt can skip work already done.
+    """
+    job.setdefault("results", {})[key] = value
+    db = get_db()
+    await db["jobs"].update_one({"_id": job["_id"]}, {"$set": {f"results.{key}": value}})
+
+async def claim_job(worker_id: str, job_id: Optional[ObjectId] = None) -> Optional[dict]:
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    claimable = {
+        "$or": [
+            {"status": "queued", "run_after": {"$lte": now}},
+            {"status": "running", "locked_until": {"$lt": now}},
+        ]
+    }
+    if job_id is not None:
+        claimable["_id"] = job_id
+    return await db["jobs"].find_one_and_update(
+        claimable,
+        {
+            "$set": {
+                "status": "running",
+                "worker_id": worker_id,
+                "locked_until": now + timedelta(seconds=settings.JOB_LEASE_SECONDS),
+                "updated_at": now,
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("run_after", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+async def run_job(job: dict) -> None:
+    db = get_db()
+    registered = HANDLERS.get(job["type"])
+    try:
+        if registered is None:
+            raise RuntimeError(f"No handler for job type {job['type']!r}")
+        await registered.handler(job)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        now = datetime.now(timezone.utc)
+        if registered is not None and job["attempts"] < job["max_attempts"]:
+            delay = settings.JOB_RETRY_BACKOFF_SECONDS * 2 ** (job["attempts"] - 1)
+            logger.warning("job retry", extra={"job_id": str(job["_id"]), "attempt": job["attempts"], "error": error})
+            res = await db["jobs"].update_one(
+                _claimed(job),
+                {"$set": {"status": "queued", "run_after": now + timedelta(seconds=delay), "error": error, "updated_at": now}},
+            )
+            if not res.matched_count:
+                _lost_claim(job)
+            return
+
+        logger.error("job failed", extra={"job_id": str(job["_id"]), "attempts": job["attempts"], "error": error})
+        res = await db["jobs"].update_one(
+            _claimed(job),
+            {"$set": {"status": "failed", "error": error, "locked_until": None, "updated_at": now}},
+        )
+        if not res.matched_count:
+            # the worker that re-claimed the job owns its outcome (and the failure hook)
+            _lost_claim(job)
+            return
+        if registered is not None and registered.on_failure is not None:
+            await registered.on_failure(job, error)
+        return
+
+    res = await db["jobs"].update_one(
+        _claimed(job),
+        {"$set": {"status": "succeeded", "error": None, "locked_until": None, "updated_at": datetime.now(timezone.utc)}},
+    )
+    if not res.matched_count:
+        _lost_claim(job)
+
+def _lost_claim(job: dict) -> None:
+    logger.warning("job outcome dropped: lease lost to another worker", extra={"job_id": str(job["_id"]), "attempt": job.get("attempts")})
+
+async def run_job_now(job_id: ObjectId) -> None:
+    """
+    Run one specific job in this process if no worker has picked it up yet.
+    Used after a request so a job progresses even where no worker pool runs (serverless).
+    """
+    job = await claim_job(f"inline-{uuid.uuid4().hex[:8]}", job_id)
+    if job is not None:
+        await run_job(job)
+
+class JobWorkerPool:
+    def __init__(self, size: int):
+        self.size = size
+        self._tasks: list[asyncio.Task] = []
+        self._stopping = False
+
+    def start(self) -> None:
+        for n in range(self.size):
+            self._tasks.append(asyncio.create_task(self._work(f"worker-{uuid.uuid4().hex[:8]}-{n}")))
+
+    async def stop(self, grace: float = 10.0) -> None:
+        """
+        Let running jobs finish for up to `grace` seconds, then cancel them;
+        a cancelled job is picked up again once its lease runs out.
+        """
+        self._stopping = True
+        _wakeup.set()
+        if self._tasks:
+            _, pending = await asyncio.wait(self._tasks, timeout=grace)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks.clear()
+
+    async def _work(self, worker_id: str) -> None:
+        while not self._stopping:
+            try:
+                job = await claim_job(worker_id)
+            except Exception as exc:
+                logger.warning("job claim failed", extra={"worker_id": worker_id, "error": repr(exc)})
+                job = None
+            if job is not None:
+                try:
+                    await run_job(job)
+                except Exception as exc:
+                    # recording the outcome failed; the job is claimable again once its lease runs out
+                    logger.error("job run failed", extra={"worker_id": worker_id, "job_id": str(job["_id"]), "error": repr(exc)})
+                continue
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=settings.JOB_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,40 @@
+from typing import AsyncIterable, AsyncIterator
+
+from fastapi import HTTPException, Request
+
+def fmt_mb(n: int) -> str:
+    return f"{n / (1024 * 1024):.1f}MB"
+
+def too_large(label: str, limit_bytes: int, size: int | None = None) -> HTTPException:
+    got = f" ({fmt_mb(size)})" if size is not None else ""
+    return HTTPException(
+        status_code=413,
+        detail=f"{label} is too large{got}. Max allowed is {fmt_mb(limit_bytes)}.",
+    )
+
+async def limit_stream(chunks: AsyncIterable[bytes], limit_bytes: int, label: str) -> AsyncIterator[bytes]:
+    """
+    Pass chunks through, raising 413 as soon as the running total exceeds the limit.
+    Raising inside the storage PUT aborts it, so nothing oversized is ever stored whole.
+    """
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > limit_bytes:
+            raise too_large(label, limit_bytes)
+        yield chunk
+
+def declared_length(request: Request, limit_bytes: int, label: str) -> int | None:
+    """
+    Content-Length of a raw upload body, rejected up front if it is over the limit.
+    """
+    raw = request.headers.get("content-length")
+    if raw is None:
+        return None
+    try:
+        length = int(raw)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if length > limit_bytes:
+        raise too_large(label, limit_bytes, length)
+    return length
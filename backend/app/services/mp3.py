@@ -0,0 +1,291 @@
+from typing import Any, AsyncIterable, AsyncIterator, Optional
+
+# Incremental MP3 / ID3v2 parser. Bytes are fed as they stream through an
+# upload; frame payloads are skipped without being copied, so memory stays
+# at one chunk no matter how long the episode is.
+
+ID3_MAX_BYTES = 4 * 1024 * 1024  # larger tags (huge embedded art) are skipped, not parsed
+
+_BITRATES = {
+    # (mpeg1?, layer) -> kbps by index
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_SAMPLE_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+_LAYERS = {3: 1, 2: 2, 1: 3}
+
+# ID3 text frames we keep, by v2.3/v2.4 frame id
+_ID3_TEXT_FRAMES = {
+    "TIT2": "title",
+    "TPE1": "artist",
+    "TALB": "album",
+    "TCON": "genre",
+    "TYER": "year",
+    "TDRC": "year",
+}
+
+# Enough of the first frame to read a Xing/Info or VBRI header
+_VBR_HEADER_BYTES = 64
+
+def parse_frame_header(h: bytes) -> Optional[tuple[int, int, int, int, int]]:
+    """
+    Decode a 4-byte MPEG audio frame header.
+    Returns (frame_length, samples_per_frame, sample_rate, version_bits, channel_mode) or None.
+    """
+    if h[0] != 0xFF or (h[1] & 0xE0) != 0xE0:
+        return None
+    version = (h[1] >> 3) & 3
+    layer = _LAYERS.get((h[1] >> 1) & 3)
+    bitrate_idx = h[2] >> 4
+    sr_idx = (h[2] >> 2) & 3
+    if version == 1 or layer is None or bitrate_idx in (0, 15) or sr_idx == 3:
+        return None
+
+    mpeg1 = version == 3
+    bitrate = _BITRATES[(mpeg1, layer)][bitrate_idx] * 1000
+    sample_rate = _SAMPLE_RATES[version][sr_idx]
+    padding = (h[2] >> 1) & 1
+
+    if layer == 1:
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate, version, h[3] >> 6
+    if layer == 3 and not mpeg1:
+        return 72 * bitrate // sample_rate + padding, 576, sample_rate, version, h[3] >> 6
+    return 144 * bitrate // sample_rate + padding, 1152, sample_rate, version, h[3] >> 6
+
+def vbr_frame_count(frame: bytes, version: int, channel_mode: int) -> Optional[int]:
+    """
+    Frame count from a Xing/Info or VBRI header in the first audio frame, or None.
+    `version` and `channel_mode` are as returned by parse_frame_header.
+    """
+    mono = channel_mode == 3
+    if version == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    xing = 4 + side_info
+    tag = frame[xing:xing + 4]
+    if tag in (b"Xing", b"Info") and len(frame) >= xing + 12:
+        flags = int.from_bytes(frame[xing + 4:xing + 8], "big")
+        if flags & 1:
+            return int.from_bytes(frame[xing + 8:xing + 12], "big")
+    if frame[36:40] == b"VBRI" and len(frame) >= 36 + 18:
+        return int.from_bytes(frame[36 + 14:36 + 18], "big")
+    return None
+
+def syncsafe(b: bytes) -> int:
+    """
+    Decode a 4-byte ID3v2 syncsafe integer (7 bits per byte).
+    """
+    return (b[0] << 21) | (b[1] << 14) | (b[2] << 7) | b[3]
+
+def _decode_text(data: bytes) -> str:
+    if not data:
+        return ""
+    encoding, body = data[0], data[1:]
+    if encoding == 1:
+        text = body.decode("utf-16", errors="replace")
+    elif encoding == 2:
+        text = body.decode("utf-16-be", errors="replace")
+    elif encoding == 3:
+        text = body.decode("utf-8", errors="replace")
+    else:
+        text = body.decode("latin-1", errors="replace")
+    return text.split("\x00")[0].strip()
+
+def _iter_id3_frames(data: bytes, major: int):
+    pos = 0
+    while pos + 10 <= len(data):
+        frame_id = data[pos:pos + 4]
+        if frame_id[0] == 0:  # padding
+            return
+        size = syncsafe(data[pos + 4:pos + 8]) if major == 4 else int.from_bytes(data[pos + 4:pos + 8], "big")
+        body = data[pos + 10:pos + 10 + size]
+        yield frame_id.decode("latin-1", errors="replace"), body
+        pos += 10 + size
+
+def parse_id3v2(tag: bytes) -> tuple[dict[str, str], list[dict[str, Any]]]:
+    """
+    Text tags and CHAP chapters from a complete ID3v2.3/2.4 tag (header included).
+    """
+    major, flags = tag[3], tag[5]
+    if major not in (3, 4):
+        return {}, []
+    data = tag[10:]
+    if flags & 0x80 and major == 3:
+        # unsynchronisation applies to the whole v2.3 tag
+        data = data.replace(b"\xff\x00", b"\xff")
+    if flags & 0x40 and len(data) >= 4:
+        ext = syncsafe(data[:4]) if major == 4 else int.from_bytes(data[:4], "big") + 4
+        data = data[ext:]
+
+    tags: dict[str, str] = {}
+    chapters: list[dict[str, Any]] = []
+    for frame_id, body in _iter_id3_frames(data, major):
+        if frame_id in _ID3_TEXT_FRAMES:
+            value = _decode_text(body)
+            if value:
+                tags.setdefault(_ID3_TEXT_FRAMES[frame_id], value)
+        elif frame_id == "CHAP":
+            end_of_id = body.find(b"\x00")
+            if end_of_id < 0 or len(body) < end_of_id + 17:
+                continue
+            times = body[end_of_id + 1:end_of_id + 17]
+            chapter: dict[str, Any] = {
+                "start_seconds": int.from_bytes(times[0:4], "big") / 1000,
+                "end_seconds": int.from_bytes(times[4:8], "big") / 1000,
+                "title": None,
+            }
+            for sub_id, sub_body in _iter_id3_frames(body[end_of_id + 17:], major):
+                if sub_id == "TIT2":
+                    chapter["title"] = _decode_text(sub_body) or None
+            chapters.append(chapter)
+    chapters.sort(key=lambda c: c["start_seconds"])
+    return tags, chapters
+
+class Mp3StreamParser:
+    """
+    Feed an MP3 file chunk by chunk, then read `result()`.
+
+    Counts MPEG frames for an exact duration (CBR or VBR) and decodes the
+    leading ID3v2 tag. `complete` turns true once a Xing/Info/VBRI header
+    has given the frame count, so a caller reading from the network may stop early.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.id3_size = 0
+        self.tags: dict[str, str] = {}
+        self.chapters: list[dict[str, Any]] = []
+        self.frames = 0
+        self.samples = 0
+        self.sample_rate = 0
+        self.vbr_frames: Optional[int] = None
+        self._version: Optional[int] = None
+        self._phase = "id3"
+        self._buf = b""
+        self._skip = 0
+        self._id3_remaining = 0
+        self._id3_parts: Optional[list[bytes]] = None
+
+    @property
+    def complete(self) -> bool:
+        return self._phase == "frames" and self.vbr_frames is not None
+
+    def feed(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        data = self._buf + chunk if self._buf else chunk
+        i = 0
+
+        if self._phase == "id3":
+            i = self._feed_id3(data)
+            if self._phase == "id3":
+                return
+
+        if self._skip:
+            take = min(self._skip, len(data) - i)
+            i += take
+            self._skip -= take
+
+        n = len(data)
+        while n - i >= 4:
+            header = parse_frame_header(data[i:i + 4])
+            if header is None or (self._version is not None and (header[3], header[2]) != (self._version, self.sample_rate)):
+                nxt = data.find(b"\xff", i + 1)
+                i = n if nxt < 0 else nxt
+                continue
+            frame_len, spf, sample_rate, version, channel_mode = header
+
+            if self._version is None:
+                if n - i < min(frame_len, _VBR_HEADER_BYTES):
+                    break  # wait for the rest of the first frame's VBR header
+                self._version, self.sample_rate = version, sample_rate
+                vbr_frames = vbr_frame_count(data[i:i + frame_len], version, channel_mode)
+                if vbr_frames is not None:
+                    # the Xing/VBRI frame carries no audio
+                    self.vbr_frames = vbr_frames
+                else:
+                    self._count(spf)
+            else:
+                self._count(spf)
+
+            if i + frame_len <= n:
+                i += frame_len
+            else:
+                self._skip = i + frame_len - n
+                i = n
+        self._buf = data[i:]
+
+    def _count(self, samples_per_frame: int) -> None:
+        self.frames += 1
+        self.samples += samples_per_frame
+
+    def _feed_id3(self, data: bytes) -> int:
+        """
+        Consume the leading ID3v2 tag; returns how many bytes of `data` it used.
+        """
+        if self._id3_parts is None:
+            if len(data) < 10:
+                self._buf = data
+                return len(data)
+            if data[:3] != b"ID3":
+                self._buf = b""
+                self._phase = "frames"
+                return 0
+            footer = 10 if data[5] & 0x10 else 0
+            self.id3_size = 10 + syncsafe(data[6:10]) + footer
+            self._id3_remaining = self.id3_size
+            self._id3_parts = []
+            self._buf = b""
+
+        take = min(self._id3_remaining, len(data))
+        if self.id3_size <= ID3_MAX_BYTES:
+            self._id3_parts.append(data[:take])
+        self._id3_remaining -= take
+        if self._id3_remaining == 0:
+            if self.id3_size <= ID3_MAX_BYTES:
+                try:
+                    self.tags, self.chapters = parse_id3v2(b"".join(self._id3_parts))
+                except Exception:
+                    # a damaged tag should never fail the upload
+                    self.tags, self.chapters = {}, []
+            self._id3_parts = []
+            self._phase = "frames"
+        return take
+
+    def result(self, total_size: Optional[int] = None) -> dict[str, Any]:
+        """
+        Metadata fields for the episode document.
+        `total_size` overrides the byte count when parsing stopped early.
+        """
+        size = total_size if total_size is not None else self.size
+        duration = None
+        if self.sample_rate:
+            if self.vbr_frames is not None and self.frames < self.vbr_frames:
+                # stopped early: trust the VBR header's frame count
+                samples_per_frame = 1152 if self._version == 3 else 576
+                duration = self.vbr_frames * samples_per_frame / self.sample_rate
+            elif self.frames:
+                duration = self.samples / self.sample_rate
+        bitrate = None
+        if duration:
+            bitrate = round((size - self.id3_size) * 8 / duration / 1000)
+        return {
+            "duration_seconds": round(duration, 3) if duration else None,
+            "size_bytes": size,
+            "bitrate_kbps": bitrate,
+            "sample_rate": self.sample_rate or None,
+            "id3": self.tags,
+            "chapters": self.chapters,
+        }
+
+async def tap(chunks: AsyncIterable[bytes], parser: Mp3StreamParser) -> AsyncIterator[bytes]:
+    """
+    Pass chunks through unchanged while feeding them to `parser`.
+    """
+    async for chunk in chunks:
+        parser.feed(chunk)
+        yield chunk
@@ -0,0 +1,41 @@
+from typing import AsyncIterable, AsyncIterator
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+from app.db.mongo import get_db
+
+# Uploaded files are staged in GridFS until a background job has pushed them
+# to storage, so the request can return before any storage round trip.
+
+def _bucket() -> AsyncIOMotorGridFSBucket:
+    return AsyncIOMotorGridFSBucket(get_db(), bucket_name="staging")
+
+async def stage_stream(chunks: AsyncIterable[bytes], filename: str, content_type: str) -> tuple[ObjectId, int]:
+    """
+    Write chunks to a staged file. Returns (file_id, size).
+    The partial file is removed if `chunks` raises.
+    """
+    grid_in = _bucket().open_upload_stream(filename, metadata={"content_type": content_type})
+    size = 0
+    try:
+        async for chunk in chunks:
+            await grid_in.write(chunk)
+            size += len(chunk)
+    except BaseException:
+        await grid_in.abort()
+        raise
+    await grid_in.close()
+    return grid_in._id, size
+
+async def staged_stream(file_id: ObjectId) -> AsyncIterator[bytes]:
+    grid_out = await _bucket().open_download_stream(file_id)
+    while chunk := await grid_out.readchunk():
+        yield chunk
+
+async def delete_staged(file_id: ObjectId) -> None:
+    try:
+        await _bucket().delete(file_id)
+    except Exception:
+        # already deleted (e.g. by an earlier attempt)
+        pass
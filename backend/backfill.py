@@ -0,0 +1,37 @@
+import argparse
+import asyncio
+import logging
+
+from app.db.mongo import get_db, get_client
+from app.services.backfill import AUDIO_META_JOB, COVER_RENDITIONS_JOB, HLS_JOB
+from app.services.images import shutdown_image_pool
+from app.services.jobs import enqueue, run_job_now
+
+
+JOBS = {
+    "audio-meta": AUDIO_META_JOB,
+    "cover-renditions": COVER_RENDITIONS_JOB,
+    "hls": HLS_JOB,
+}
+
+
+async def main(name: str):
+    # Same jobs as POST /admin/jobs/backfill/<name>, run in this process.
+    job = await enqueue(JOBS[name], {})
+    print(f"Backfill {name} ({job['_id']}) started")
+    await run_job_now(job["_id"])
+
+    db = get_db()
+    done = await db["jobs"].find_one({"_id": job["_id"]})
+    print(f"Backfill {name} {done['status']}: {done['progress']}")
+
+    client = get_client()
+    client.close()
+    shutdown_image_pool()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("name", choices=sorted(JOBS))
+    asyncio.run(main(parser.parse_args().name))
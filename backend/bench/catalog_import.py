@@ -0,0 +1,103 @@
+"""
+Time a catalog import through POST /admin/episodes/import.
+
+    python -m bench.catalog_import --rows 10000                 # against MONGODB_URI (<MONGODB_DB>_bench)
+    python -m bench.catalog_import --rows 10000 --format csv --mock
+
+Generates a synthetic back catalog, streams it to the endpoint in 64 KB
+chunks and prints one JSON report. With --mock the feed regeneration that
+follows the import is slow (mongomock has no indexes), so read "import_s".
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import time
+from datetime import datetime, timedelta
+
+import httpx
+
+from bench.common import CATEGORIES, reset_database, use_database
+
+CHUNK = 64 * 1024
+
+
+def make_body(rows: int, fmt: str) -> bytes:
+    base = datetime(2015, 1, 1)
+    records = [
+        {
+            "title": f"Back catalog episode {i}",
+            "description": f"Imported episode number {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "audio_url": f"https://cdn.example.com/audio/{i}.mp3",
+            "thumbnail_url": f"https://cdn.example.com/covers/{i}.jpg",
+            "published": "true",
+            "created_at": (base + timedelta(days=i)).isoformat(),
+        }
+        for i in range(rows)
+    ]
+    if fmt == "ndjson":
+        return "".join(json.dumps(r) + "\n" for r in records).encode()
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(records[0]))
+    writer.writeheader()
+    writer.writerows(records)
+    return buf.getvalue().encode()
+
+
+async def main(args) -> None:
+    use_database(args.mock)
+    from app.main import app
+    from app.core.security import create_access_token
+    from app.services import catalog
+
+    await reset_database()
+    body = make_body(args.rows, args.format)
+
+    import_done = 0.0
+    catalog_changed = catalog.catalog_changed
+
+    async def timed_catalog_changed():
+        nonlocal import_done
+        import_done = time.perf_counter()
+        await catalog_changed()
+
+    # the router imported the name, so patch it where it is used
+    from app.routers import admin_bulk
+    admin_bulk.catalog_changed = timed_catalog_changed
+
+    async def chunks():
+        for i in range(0, len(body), CHUNK):
+            yield body[i:i + CHUNK]
+
+    headers = {
+        "Authorization": f"Bearer {create_access_token('bench')}",
+        "Content-Type": "text/csv" if args.format == "csv" else "application/x-ndjson",
+    }
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        resp = await client.post("/admin/episodes/import", content=chunks(), headers=headers)
+        total = time.perf_counter() - started
+    result = resp.json()
+    import_s = (import_done or time.perf_counter()) - started
+    print(json.dumps({
+        "format": args.format,
+        "rows": args.rows,
+        "bytes": len(body),
+        "status": resp.status_code,
+        "inserted": result.get("inserted"),
+        "failed": result.get("failed"),
+        "import_s": round(import_s, 3),
+        "rows_per_s": round(args.rows / import_s) if import_s else None,
+        "total_s": round(total, 3),
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mock", action="store_true", help="use mongomock_motor instead of MONGODB_URI")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+"""
+Cold-start profile of the serverless entry point (api/index.py), eager vs lazy.
+
+    python -m bench.cold_start --mock            # first request served from mongomock_motor
+    python -m bench.cold_start --runs 10 --top 15
+
+Every sample is a fresh interpreter, as on a cold Vercel instance. For each
+mode it reports the import time of `api.index`, the time to the first
+`GET /episodes` response, which admin-only modules got loaded, and the
+slowest imports by cumulative time (from `python -X importtime`).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# modules the public read path should never need
+ADMIN_ONLY = [
+    "jose",
+    "passlib",
+    "httpx",
+    "PIL",
+    "app.core.security",
+    "app.services.bunny",
+    "app.services.ingest",
+    "app.services.staging",
+    "app.routers.auth",
+    "app.routers.admin_episodes",
+    "app.routers.uploads",
+    "app.routers.jobs",
+]
+
+# runs in the child interpreter; prints one JSON line
+_CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import api.index
+imported = time.perf_counter()
+mock = sys.argv[1] == "1"
+
+async def first_request():
+    import httpx
+    from app.db import mongo
+    if mock:
+        from bench.mockdb import MockClient
+        mongo.client = MockClient()
+    transport = httpx.ASGITransport(app=api.index.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://cold") as client:
+        resp = await client.get("/episodes")
+    return resp.status_code
+
+loaded_before = [m for m in json.loads(sys.argv[2]) if m in sys.modules]
+status = asyncio.run(first_request())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_response_ms": (time.perf_counter() - started) * 1000,
+    "status": status,
+    "admin_modules_loaded": loaded_before,
+}))
+"""
+
+
+def child_env(lazy: bool) -> dict:
+    env = dict(os.environ)
+    env["LAZY_ADMIN_ROUTES"] = "1" if lazy else "0"
+    env["JOB_WORKERS"] = "0"
+    return env
+
+
+def sample(lazy: bool, mock: bool) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _CHILD, "1" if mock else "0", json.dumps(ADMIN_ONLY)],
+        cwd=BACKEND, env=child_env(lazy), capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def import_profile(lazy: bool, top: int) -> list[dict]:
+    """
+    Self time from `-X importtime`, summed per top-level package, slowest first.
+    """
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import api.index"],
+        cwd=BACKEND, env=child_env(lazy), capture_output=True, text=True, check=True,
+    )
+    per_package: dict[str, list[int]] = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        if package == "app":
+            package = ".".join(name.strip().split(".")[:3])  # app.routers.x, app.services.y
+        entry = per_package.setdefault(package, [0, 0])
+        entry[0] += int(self_us)
+        entry[1] += 1
+    ranked = sorted(per_package.items(), key=lambda kv: kv[1][0], reverse=True)[:top]
+    return [{"package": name, "self_ms": round(us / 1000, 2), "modules": n} for name, (us, n) in ranked]
+
+
+def run_mode(lazy: bool, args) -> dict:
+    samples = [sample(lazy, args.mock) for _ in range(args.runs)]
+    imports = [s["import_ms"] for s in samples]
+    firsts = [s["first_response_ms"] for s in samples]
+    return {
+        "mode": "lazy" if lazy else "eager",
+        "runs": args.runs,
+        "import_ms_median": round(statistics.median(imports), 1),
+        "import_ms_min": round(min(imports), 1),
+        "first_response_ms_median": round(statistics.median(firsts), 1),
+        "first_status": samples[-1]["status"],
+        "admin_modules_loaded": samples[-1]["admin_modules_loaded"],
+        "slowest_imports": import_profile(lazy, args.top),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mock", action="store_true", help="serve the first request from mongomock_motor")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="packages to list in the import profile")
+    args = parser.parse_args()
+
+    reports = [run_mode(lazy, args) for lazy in (False, True)]
+    eager, lazy = reports
+    print(json.dumps({
+        "modes": reports,
+        "import_saved_ms": round(eager["import_ms_median"] - lazy["import_ms_median"], 1),
+        "first_response_saved_ms": round(eager["first_response_ms_median"] - lazy["first_response_ms_median"], 1),
+    }, indent=2))
@@ -0,0 +1,142 @@
+"""
+Shared pieces for the benchmarks: database selection, catalog seeding,
+synthetic upload payloads and latency summaries.
+"""
+import io
+import random
+import subprocess
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.core.security import hash_password
+from app.db import mongo
+
+ADMIN_EMAIL = "bench-admin@example.com"
+ADMIN_PASSWORD = "bench-password"
+
+CATEGORIES = ["Technology", "Business", "Comedy", "News", "Science", "History", "Sports", "Music"]
+WORDS = [
+    "stream", "podcast", "interview", "market", "history", "science", "future", "music",
+    "startup", "weekly", "deep", "dive", "story", "season", "finale", "live", "guest", "news",
+]
+
+# MPEG-1 layer III, 128 kbps, 44.1 kHz, stereo: 417-byte frames of 26 ms
+_MP3_HEADER = b"\xff\xfb\x90\x64"
+_MP3_FRAME = _MP3_HEADER + bytes(413)
+
+
+def use_database(mock: bool) -> str:
+    """
+    Point app.db.mongo at the benchmark database and return a label for reports.
+    Real runs use `<MONGODB_DB>_bench` so they never touch the live catalog.
+    """
+    if mock:
+        from bench.mockdb import MockClient
+
+        mongo.client = MockClient()
+        return "mongomock"
+    settings.MONGODB_DB = f"{settings.MONGODB_DB}_bench"
+    return "mongodb"
+
+
+async def reset_database() -> None:
+    db = mongo.get_db()
+    for name in (
+        "episodes", "jobs", "feeds", "upload_sessions", "admins", "staging.files", "staging.chunks",
+        "episode_stats", "episode_stats_daily", "rankings",
+    ):
+        await db.drop_collection(name)
+
+
+async def seed_admin(email: str = ADMIN_EMAIL, password: str = ADMIN_PASSWORD) -> None:
+    db = mongo.get_db()
+    await db["admins"].delete_many({"email": email})
+    await db["admins"].insert_one({"email": email, "password_hash": hash_password(password)})
+
+
+def fake_episode(i: int, rng: random.Random, base: datetime) -> dict:
+    created = base - timedelta(minutes=i)
+    title_words = " ".join(rng.choice(WORDS) for _ in range(4))
+    return {
+        "title": f"Bench episode {i}: {title_words}",
+        "description": " ".join(rng.choice(WORDS) for _ in range(40)),
+        "category": rng.choice(CATEGORIES),
+        "audio_url": f"https://cdn.example.com/audio/{i}.mp3",
+        "thumbnail_url": f"https://cdn.example.com/covers/{i}.jpg",
+        "published": rng.random() < 0.9,
+        "status": "ready",
+        "duration_seconds": round(rng.uniform(600, 5400), 3),
+        "size_bytes": rng.randint(10, 90) * 1024 * 1024,
+        "bitrate_kbps": 128,
+        "bench": True,
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+async def seed_episodes(count: int, seed: int = 0, batch: int = 5000) -> list:
+    """
+    Replace the catalog with `count` synthetic episodes; returns the published ids.
+    The same `seed` always produces the same catalog.
+    """
+    db = mongo.get_db()
+    await db["episodes"].delete_many({})
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for start in range(0, count, batch):
+        docs = [fake_episode(i, rng, base) for i in range(start, min(count, start + batch))]
+        await db["episodes"].insert_many(docs, ordered=False)
+    cursor = db["episodes"].find({"published": True}, {"_id": 1})
+    return [doc["_id"] async for doc in cursor]
+
+
+def fake_mp3(seconds: float) -> bytes:
+    frames = max(1, round(seconds / 0.026122))
+    return _MP3_FRAME * frames
+
+
+def fake_jpeg(size: int = 1400) -> bytes:
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (size, size), (180, 40, 90)).save(buf, "JPEG", quality=85)
+    return buf.getvalue()
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(p / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float, statuses: dict | None = None) -> dict:
+    """
+    Throughput and latency percentiles (ms) for one workload.
+    """
+    def ms(v: float) -> float:
+        return round(v * 1000, 2)
+
+    out = {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(seconds, 3),
+        "throughput_rps": round(len(latencies) / seconds, 2) if seconds else 0.0,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(max(latencies, default=0)),
+    }
+    if statuses:
+        out["statuses"] = {str(k): v for k, v in sorted(statuses.items())}
+    return out
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
@@ -0,0 +1,100 @@
+"""
+/episodes latency while admin logins run concurrently, with password hashing
+inline on the event loop (before) and offloaded to the hash pool (after).
+
+    python -m bench.login_contention                # against MONGODB_URI (uses <MONGODB_DB>_bench)
+    python -m bench.login_contention --mock         # in-process mongomock_motor (requirements-dev.txt)
+
+Prints one JSON report per mode.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+from app.core.config import settings
+from app.core.security import shutdown_hash_pool
+from bench.common import ADMIN_EMAIL, ADMIN_PASSWORD, percentile, seed_admin, seed_episodes, use_database
+
+async def run_mode(client: httpx.AsyncClient, offload: bool, args) -> dict:
+    settings.PASSWORD_HASH_OFFLOAD = offload
+    logins, readers = args.logins, args.readers
+    deadline = time.perf_counter() + args.seconds
+    read_latencies: list[float] = []
+    login_latencies: list[float] = []
+
+    # sleep(0) lets every login client take turns even when a request
+    # completes without real I/O (in-process transport)
+    async def login_loop():
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(0)
+            t = time.perf_counter()
+            resp = await client.post("/auth/login", json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD})
+            login_latencies.append(time.perf_counter() - t)
+            if resp.status_code == 503:
+                await asyncio.sleep(0.01)
+
+    # Readers are open-loop: each request has a scheduled start time and its
+    # latency is measured from that time, so event-loop stalls show up as
+    # latency instead of silently lowering the request rate.
+    async def read_loop(offset: float):
+        interval = readers / args.rate
+        scheduled = time.perf_counter() + offset
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await client.get("/episodes")
+            read_latencies.append(time.perf_counter() - scheduled)
+            scheduled += interval
+
+    await asyncio.gather(
+        *(login_loop() for _ in range(logins)),
+        *(read_loop(n / args.rate) for n in range(readers)),
+    )
+
+    def ms(v: float) -> float:
+        return round(v * 1000, 2)
+
+    return {
+        "mode": "offloaded" if offload else "inline",
+        "episodes_requests": len(read_latencies),
+        "episodes_p50_ms": ms(percentile(read_latencies, 50)),
+        "episodes_p95_ms": ms(percentile(read_latencies, 95)),
+        "episodes_p99_ms": ms(percentile(read_latencies, 99)),
+        "episodes_max_ms": ms(max(read_latencies, default=0)),
+        "logins": len(login_latencies),
+        "login_p50_ms": ms(statistics.median(login_latencies) if login_latencies else 0),
+    }
+
+
+async def main(args) -> None:
+    use_database(args.mock)
+
+    # imported after the db is chosen; throttling would cut the login burst short
+    from app.main import app
+    from app.routers import auth
+    auth.ip_limiter.limit = auth.email_limiter.limit = 1_000_000
+
+    await seed_admin()
+    await seed_episodes(args.episodes)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for offload in (False, True):
+            report = await run_mode(client, offload, args)
+            print(json.dumps(report))
+    shutdown_hash_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mock", action="store_true", help="use mongomock_motor instead of MONGODB_URI")
+    parser.add_argument("--episodes", type=int, default=200)
+    parser.add_argument("--logins", type=int, default=8, help="concurrent login loops")
+    parser.add_argument("--readers", type=int, default=16, help="concurrent GET /episodes clients")
+    parser.add_argument("--rate", type=float, default=400.0, help="total GET /episodes per second")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    asyncio.run(main(parser.parse_args()))
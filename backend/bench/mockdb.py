@@ -0,0 +1,61 @@
+"""
+In-process stand-in for MongoDB used by the `--mock` runs (requirements-dev.txt).
+
+mongomock_motor, except that bulk_write runs each request through the
+collection's own insert/update/replace/delete methods: mongomock's bulk
+builder rejects the sort= that pymongo>=4.11 hands it for UpdateOne and
+ReplaceOne. Only what the app's bulk writes need is covered.
+"""
+from pymongo import DeleteMany, DeleteOne, InsertOne, ReplaceOne, UpdateMany, UpdateOne
+from mongomock_motor import AsyncMongoMockClient, AsyncMongoMockCollection, AsyncMongoMockDatabase
+
+
+class BulkResult:
+    acknowledged = True
+
+    def __init__(self):
+        self.inserted_count = 0
+        self.matched_count = 0
+        self.modified_count = 0
+        self.deleted_count = 0
+        self.upserted_ids: dict[int, object] = {}
+
+    @property
+    def upserted_count(self) -> int:
+        return len(self.upserted_ids)
+
+
+class MockCollection(AsyncMongoMockCollection):
+    async def bulk_write(self, requests, ordered: bool = True, **kwargs) -> BulkResult:
+        result = BulkResult()
+        for index, request in enumerate(requests):
+            # pymongo's write models keep their arguments in these attributes
+            if isinstance(request, InsertOne):
+                await self.insert_one(request._doc)
+                result.inserted_count += 1
+            elif isinstance(request, (DeleteOne, DeleteMany)):
+                delete = self.delete_one if isinstance(request, DeleteOne) else self.delete_many
+                result.deleted_count += (await delete(request._filter)).deleted_count
+            else:
+                if isinstance(request, ReplaceOne):
+                    res = await self.replace_one(request._filter, request._doc, upsert=request._upsert)
+                elif isinstance(request, (UpdateOne, UpdateMany)):
+                    update = self.update_one if isinstance(request, UpdateOne) else self.update_many
+                    res = await update(request._filter, request._doc, upsert=request._upsert)
+                else:
+                    raise TypeError(f"unsupported bulk request {request!r}")
+                result.matched_count += res.matched_count
+                result.modified_count += res.modified_count
+                if res.upserted_id is not None:
+                    result.upserted_ids[index] = res.upserted_id
+        return result
+
+
+class MockDatabase(AsyncMongoMockDatabase):
+    def get_collection(self, *args, **kwargs) -> MockCollection:
+        return MockCollection(self, self.delegate.get_collection(*args, **kwargs))
+
+
+class MockClient(AsyncMongoMockClient):
+    def get_database(self, *args, **kwargs) -> MockDatabase:
+        return MockDatabase(self, super().get_database(*args, **kwargs).delegate)
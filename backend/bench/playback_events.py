@@ -0,0 +1,106 @@
+"""
+Throughput of POST /events with playback counters buffered in memory (the
+default) and written through on every batch (the serverless setting).
+
+    python -m bench.playback_events                 # against MONGODB_URI (<MONGODB_DB>_bench)
+    python -m bench.playback_events --mock --seconds 5
+
+Clients post batches of play/progress/complete events for random published
+episodes. Prints one JSON report per mode, including how many flushes (each
+one bulk_write per stats collection) the events needed.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+
+import httpx
+
+from app.core.config import settings
+from bench.common import reset_database, seed_episodes, summarize, use_database
+
+
+def make_batch(rng: random.Random, ids: list, size: int) -> dict:
+    events = []
+    for _ in range(size):
+        kind = rng.choices(["play", "progress", "complete"], weights=[2, 7, 1])[0]
+        event = {"type": kind, "episode_id": str(rng.choice(ids))}
+        if kind == "progress":
+            event["seconds"] = 15
+        events.append(event)
+    return {"events": events}
+
+
+async def run_mode(client: httpx.AsyncClient, buffered: bool, ids: list, args) -> dict:
+    from app.services import analytics
+
+    settings.ANALYTICS_BUFFER = buffered
+    flushes = 0
+    flush_events = analytics.flush_events
+
+    async def counted_flush():
+        nonlocal flushes
+        flushes += 1
+        return await flush_events()
+
+    analytics.flush_events = counted_flush
+    analytics.start_analytics()
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + args.seconds
+    started = time.perf_counter()
+
+    # sleep(0) lets the flush loop run even when a request completes without
+    # real I/O (in-process transport)
+    async def client_loop(n: int):
+        rng = random.Random(args.seed + n)
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(0)
+            body = make_batch(rng, ids, args.batch)
+            t = time.perf_counter()
+            resp = await client.post("/events", json=body)
+            latencies.append(time.perf_counter() - t)
+            statuses[resp.status_code] += 1
+
+    try:
+        await asyncio.gather(*(client_loop(n) for n in range(args.clients)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await analytics.stop_analytics()
+        analytics.flush_events = flush_events
+
+    report = summarize(latencies, sum(v for k, v in statuses.items() if k != 202), elapsed, statuses)
+    report.update({
+        "mode": "buffered" if buffered else "write-through",
+        "events_per_s": round(statuses[202] * args.batch / elapsed),
+        "flushes": flushes,
+    })
+    return report
+
+
+async def main(args) -> None:
+    use_database(args.mock)
+    from app.db.indexes import ensure_indexes
+    from app.main import app
+
+    await reset_database()
+    await ensure_indexes()
+    ids = (await seed_episodes(args.episodes, args.seed))[:args.episodes]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for buffered in (False, True):
+            print(json.dumps(await run_mode(client, buffered, ids, args)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mock", action="store_true", help="use mongomock_motor instead of MONGODB_URI")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=20, help="events per request")
+    parser.add_argument("--episodes", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,305 @@
+"""
+End-to-end load test: the real FastAPI app served by uvicorn in this process,
+a seeded catalog, and the in-memory fake Bunny storage (fake_bunny.py).
+
+    python -m bench.suite --mock --sizes 1000                 # smoke run on mongomock_motor
+    python -m bench.suite --sizes 1000,10000,100000 --out bench/results/$(git rev-parse --short HEAD).json
+
+Without --mock it uses MONGODB_URI with the `<MONGODB_DB>_bench` database,
+which is emptied first. mongomock scans in Python, so numbers
+from --mock only make sense relative to each other and large sizes get slow. For every catalog size each workload runs on its own
+for --seconds, then all of them together ("mixed"). The JSON report has
+throughput and p50/p95/p99 latency per workload, plus the commit it ran on,
+so reports from different commits can be diffed.
+
+Workloads:
+    list    GET /episodes, following X-Next-Cursor up to --list-pages pages
+    get     GET /episodes/{id} for random published episodes
+    search  GET /episodes/search (skipped with --mock: no $text in mongomock)
+    create  POST /admin/episodes with audio + cover, then waits for the ingest job
+    login   bursts of concurrent POST /auth/login
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import platform
+import random
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+
+import fake_bunny
+from app.core.config import settings
+from app.db import mongo
+from bench.common import (
+    ADMIN_EMAIL,
+    ADMIN_PASSWORD,
+    WORDS,
+    fake_jpeg,
+    fake_mp3,
+    git_revision,
+    reset_database,
+    seed_admin,
+    seed_episodes,
+    summarize,
+    use_database,
+)
+
+FAKE_BUNNY_HOST = "fake-bunny"
+WORKLOADS = ("list", "get", "search", "create", "login")
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: Counter = Counter()
+        self.statuses: dict[str, Counter] = {}
+
+    def add(self, name: str, seconds: float, status: int | None, ok: bool) -> None:
+        self.latencies.setdefault(name, []).append(seconds)
+        self.statuses.setdefault(name, Counter())[status or "exception"] += 1
+        if not ok:
+            self.errors[name] += 1
+
+    def report(self, elapsed: float) -> dict:
+        return {
+            name: summarize(values, self.errors[name], elapsed, self.statuses[name])
+            for name, values in self.latencies.items()
+        }
+
+
+async def timed(rec: Recorder, name: str, request, ok_statuses=(200,)) -> httpx.Response | None:
+    started = time.perf_counter()
+    try:
+        resp = await request
+    except httpx.HTTPError:
+        rec.add(name, time.perf_counter() - started, None, False)
+        return None
+    rec.add(name, time.perf_counter() - started, resp.status_code, resp.status_code in ok_statuses)
+    return resp
+
+
+class Workloads:
+    def __init__(self, client: httpx.AsyncClient, args, ids: list, token: str, rng: random.Random):
+        self.client = client
+        self.args = args
+        self.ids = ids
+        self.auth = {"Authorization": f"Bearer {token}"}
+        self.rng = rng
+        self.audio = fake_mp3(args.audio_seconds)
+        self.cover = fake_jpeg()
+        self.created: list[str] = []
+
+    async def list(self, rec: Recorder, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            cursor = None
+            for _ in range(self.args.list_pages):
+                params = {"limit": self.args.page_size}
+                if self.args.list_fields:
+                    params["fields"] = self.args.list_fields
+                if cursor:
+                    params["next"] = cursor
+                resp = await timed(rec, "list", self.client.get("/episodes", params=params))
+                cursor = resp.headers.get("x-next-cursor") if resp is not None else None
+                if not cursor or time.perf_counter() >= deadline:
+                    break
+
+    async def get(self, rec: Recorder, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            episode_id = self.rng.choice(self.ids)
+            await timed(rec, "get", self.client.get(f"/episodes/{episode_id}"))
+
+    async def search(self, rec: Recorder, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            q = " ".join(self.rng.sample(WORDS, 2))
+            await timed(rec, "search", self.client.get("/episodes/search", params={"q": q, "limit": 20}))
+
+    async def create(self, rec: Recorder, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            resp = await timed(
+                rec,
+                "create",
+                self.client.post(
+                    "/admin/episodes",
+                    data={"title": f"bench upload {len(self.created)}", "category": "Bench"},
+                    files={
+                        "audio": ("episode.mp3", self.audio, "audio/mpeg"),
+                        "cover": ("cover.jpg", self.cover, "image/jpeg"),
+                    },
+                    headers=self.auth,
+                ),
+                ok_statuses=(201, 202),
+            )
+            if resp is None or resp.status_code not in (201, 202):
+                continue
+            episode_id = resp.json()["_id"]
+            self.created.append(episode_id)
+            # time until the ingest job has pushed everything to storage
+            ready = await self._wait_ready(episode_id)
+            rec.add("create_ready", time.perf_counter() - started, 200 if ready else None, ready)
+
+    async def _wait_ready(self, episode_id: str) -> bool:
+        from bson import ObjectId
+
+        episodes = mongo.get_db()["episodes"]
+        give_up = time.perf_counter() + self.args.ingest_timeout
+        while time.perf_counter() < give_up:
+            doc = await episodes.find_one({"_id": ObjectId(episode_id)}, {"status": 1})
+            if doc is None or doc.get("status") == "failed":
+                return False
+            if doc.get("status") != "processing":
+                return True
+            await asyncio.sleep(0.02)
+        return False
+
+    async def login(self, rec: Recorder, deadline: float) -> None:
+        payload = {"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+        while time.perf_counter() < deadline:
+            await asyncio.gather(*(
+                timed(rec, "login", self.client.post("/auth/login", json=payload))
+                for _ in range(self.args.login_burst)
+            ))
+            await asyncio.sleep(self.args.login_pause)
+
+
+async def run_workloads(workloads: Workloads, names: list[str], args) -> dict:
+    rec = Recorder()
+    deadline = time.perf_counter() + args.seconds
+    started = time.perf_counter()
+    tasks = []
+    for name in names:
+        # create and login bring their own concurrency (ingest jobs / bursts)
+        workers = {"create": args.create_concurrency, "login": 1}.get(name, args.concurrency)
+        tasks += [getattr(workloads, name)(rec, deadline) for _ in range(workers)]
+    await asyncio.gather(*tasks)
+    return rec.report(time.perf_counter() - started)
+
+
+@contextlib.asynccontextmanager
+async def serve(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.01)
+    bound = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://127.0.0.1:{bound}"
+    finally:
+        server.should_exit = True
+        await task
+
+
+async def main(args) -> dict:
+    backend = use_database(args.mock)
+    settings.BUNNY_STORAGE_SCHEME = "http"
+    settings.BUNNY_STORAGE_HOST = FAKE_BUNNY_HOST
+    # CDN URLs resolve to the same fake objects, so cover renditions can fetch their source
+    settings.BUNNY_CDN_BASE = f"http://{FAKE_BUNNY_HOST}/{settings.BUNNY_STORAGE_ZONE}"
+    settings.LOG_LEVEL = args.log_level
+    if args.no_cache:
+        settings.EPISODE_CACHE_TTL_SECONDS = 0.0
+
+    # imported after settings are patched; throttling would cut login bursts short
+    from app.main import app
+    from app.core.security import create_access_token
+    from app.routers import auth
+    from app.services import bunny, cache
+
+    auth.ip_limiter.limit = auth.email_limiter.limit = 1_000_000
+    cache.response_cache.ttl = settings.EPISODE_CACHE_TTL_SECONDS
+
+    names = [n for n in args.workloads.split(",") if n]
+    if args.mock and "search" in names:
+        names.remove("search")
+        print("search skipped: mongomock has no $text support", file=sys.stderr)
+
+    await reset_database()
+    await seed_admin()
+    token = create_access_token("bench")
+    rng = random.Random(args.seed)
+    runs = []
+
+    async with serve(app, args.port) as base_url:
+        bunny.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake_bunny.app))
+        limits = httpx.Limits(max_connections=args.concurrency * len(names) + 16)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+            for size in [int(s) for s in args.sizes.split(",") if s]:
+                t = time.perf_counter()
+                ids = await seed_episodes(size, seed=args.seed)
+                seed_seconds = time.perf_counter() - t
+                cache.bump_catalog_version()
+                cache.response_cache.clear()
+
+                workloads = Workloads(client, args, ids, token, rng)
+                results = {}
+                for name in names:
+                    results.update(await run_workloads(workloads, [name], args))
+                    print(f"size={size} {name}: {json.dumps(results[name])}", file=sys.stderr)
+                if len(names) > 1:
+                    results["mixed"] = await run_workloads(workloads, names, args)
+                runs.append({"catalog_size": size, "seed_seconds": round(seed_seconds, 3), "workloads": results})
+        await bunny.client.aclose()
+
+    fake_bunny.objects.clear()
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": backend,
+            "args": vars(args),
+        },
+        "runs": runs,
+    }
+
+
+def run(args) -> dict:
+    if args.mock:
+        # GridFS staging of admin uploads needs mongomock's GridFS support
+        from mongomock_motor import enabled_gridfs_integration
+
+        with enabled_gridfs_integration():
+            return asyncio.run(main(args))
+    return asyncio.run(main(args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mock", action="store_true", help="use mongomock_motor instead of MONGODB_URI")
+    parser.add_argument("--sizes", default="1000,10000", help="comma separated catalog sizes")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of each workload")
+    parser.add_argument("--concurrency", type=int, default=16, help="clients per read workload")
+    parser.add_argument("--create-concurrency", type=int, default=2)
+    parser.add_argument("--login-burst", type=int, default=8)
+    parser.add_argument("--login-pause", type=float, default=0.5, help="seconds between login bursts")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--list-pages", type=int, default=5)
+    parser.add_argument("--list-fields", help='?fields= for the list workload, e.g. "summary"')
+    parser.add_argument("--audio-seconds", type=float, default=60.0, help="length of the synthetic upload")
+    parser.add_argument("--ingest-timeout", type=float, default=60.0)
+    parser.add_argument("--no-cache", action="store_true", help="disable the public response cache")
+    parser.add_argument("--log-level", default="WARNING", help="level for the app's JSON logs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--out", help="also write the report to this file")
+    args = parser.parse_args()
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        from pathlib import Path
+
+        Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.out).write_text(text + "\n")
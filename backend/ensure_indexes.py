@@ -0,0 +1,19 @@
+import asyncio
+import logging
+
+from app.db.indexes import ensure_indexes
+from app.db.mongo import get_client
+
+
+async def main():
+    # What the app does at startup with ENSURE_INDEXES; run on deploy where it is off (Vercel).
+    await ensure_indexes()
+    print("Indexes ensured")
+
+    client = get_client()
+    client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
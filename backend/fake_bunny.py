@@ -0,0 +1,46 @@
+"""
+Local stand-in for the Bunny storage API, for development and benchmarks.
+
+    uvicorn fake_bunny:app --port 8081
+
+and point the API at it with
+    BUNNY_STORAGE_SCHEME=http BUNNY_STORAGE_HOST=127.0.0.1:8081
+
+Objects are kept in memory. Supports PUT / GET / DELETE on /{zone}/{path};
+the AccessKey header is checked only when FAKE_BUNNY_ACCESS_KEY is set.
+"""
+import os
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+ACCESS_KEY = os.getenv("FAKE_BUNNY_ACCESS_KEY")
+
+objects: dict[str, tuple[bytes, str]] = {}
+
+def _unauthorized(request: Request) -> bool:
+    return ACCESS_KEY is not None and request.headers.get("AccessKey") != ACCESS_KEY
+
+async def storage(request: Request) -> Response:
+    if _unauthorized(request):
+        return JSONResponse({"HttpCode": 401, "Message": "Unauthorized"}, status_code=401)
+
+    path = request.url.path
+    if request.method == "PUT":
+        data = bytearray()
+        async for chunk in request.stream():
+            data.extend(chunk)
+        objects[path] = (bytes(data), request.headers.get("content-type", "application/octet-stream"))
+        return JSONResponse({"HttpCode": 201, "Message": "File uploaded."}, status_code=201)
+
+    if path not in objects:
+        return JSONResponse({"HttpCode": 404, "Message": "Object Not Found"}, status_code=404)
+    if request.method == "DELETE":
+        del objects[path]
+        return JSONResponse({"HttpCode": 200, "Message": "File deleted successfuly."})
+    data, content_type = objects[path]
+    return Response(data, media_type=content_type)
+
+app = Starlette(routes=[Route("/{path:path}", storage, methods=["GET", "PUT", "DELETE"])])
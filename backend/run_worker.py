@@ -0,0 +1,33 @@
+import asyncio
+import logging
+import os
+import signal
+
+from app.services import backfill, ingest  # noqa: F401  (registers the job handlers)
+from app.services.jobs import JobWorkerPool
+from app.db.mongo import get_client
+
+
+WORKERS = int(os.getenv("WORKERS", "4"))
+
+
+async def main():
+    # Standalone job workers, for deployments that run the API with JOB_WORKERS=0.
+    pool = JobWorkerPool(WORKERS)
+    pool.start()
+    print(f"Job workers started: {WORKERS}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await pool.stop()
+    get_client().close()
+    print("Job workers stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
@@ -2,7 +2,7 @@ import asyncio
 import os
 from datetime import datetime, timezone
 
-from app.core.security import hash_password
+from app.core.security import hash_password_async, shutdown_hash_pool
 from app.db.mongo import get_db, get_client
 
 
@@ -20,7 +20,7 @@ async def main():
     now = datetime.now(timezone.utc)
     doc = {
         "email": EMAIL,
-        "password_hash": hash_password(PASSWORD),
+        "password_hash": await hash_password_async(PASSWORD),
         "created_at": now,
         "updated_at": now,
     }
@@ -29,6 +29,7 @@ async def main():
 
     client = get_client()
     client.close()
+    shutdown_hash_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,12 @@
+import os
+
+# app.core.config requires these; the unit tests never reach Mongo or storage
+for name, value in {
+    "MONGODB_URI": "mongodb://localhost:27017",
+    "MONGODB_DB": "podcast_test",
+    "JWT_SECRET": "test",
+    "BUNNY_STORAGE_ZONE": "test",
+    "BUNNY_STORAGE_PASSWORD": "test",
+    "BUNNY_CDN_BASE": "https://cdn.test",
+}.items():
+    os.environ.setdefault(name, value)
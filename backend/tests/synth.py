@@ -0,0 +1,88 @@
+"""
+Synthetic MP3 streams and ID3v2 tags for the parser and segmenter tests.
+Built from the specs, not from app.services.mp3, so the tests don't share its bugs.
+"""
+
+# layer III bitrate index by kbps
+_MPEG1_BITRATES = {32: 1, 64: 5, 128: 9, 320: 14}
+_MPEG2_BITRATES = {32: 4, 64: 8, 160: 14}
+_SAMPLE_RATE_INDEX = {44100: 0, 48000: 1, 32000: 2, 22050: 0, 24000: 1, 16000: 2}
+
+def syncsafe(n: int) -> bytes:
+    return bytes([(n >> 21) & 0x7F, (n >> 14) & 0x7F, (n >> 7) & 0x7F, n & 0x7F])
+
+def frame_length(kbps: int = 128, sample_rate: int = 44100, mpeg1: bool = True, padding: int = 0) -> int:
+    return (144 if mpeg1 else 72) * kbps * 1000 // sample_rate + padding
+
+def samples_per_frame(mpeg1: bool = True) -> int:
+    return 1152 if mpeg1 else 576
+
+def frame_header(kbps: int = 128, sample_rate: int = 44100, mpeg1: bool = True, padding: int = 0, mono: bool = False) -> bytes:
+    bitrate_idx = (_MPEG1_BITRATES if mpeg1 else _MPEG2_BITRATES)[kbps]
+    # sync, version (3 = MPEG1, 2 = MPEG2), layer III, no CRC
+    b1 = 0xE0 | ((3 if mpeg1 else 2) << 3) | (1 << 1) | 1
+    b2 = (bitrate_idx << 4) | (_SAMPLE_RATE_INDEX[sample_rate] << 2) | (padding << 1)
+    b3 = (3 if mono else 1) << 6  # mono or joint stereo
+    return bytes([0xFF, b1, b2, b3])
+
+def audio_frame(kbps: int = 128, sample_rate: int = 44100, mpeg1: bool = True, padding: int = 0, mono: bool = False) -> bytes:
+    header = frame_header(kbps, sample_rate, mpeg1, padding, mono)
+    size = frame_length(kbps, sample_rate, mpeg1, padding)
+    # the payload is full of 0xFF bytes and false sync words
+    payload = bytes((i * 7 + kbps) % 256 for i in range(size - 4))
+    return header + payload
+
+def xing_frame(frame_count: int, tag: bytes = b"Xing", mpeg1: bool = True, mono: bool = False) -> bytes:
+    kbps, rate = (128, 44100) if mpeg1 else (64, 22050)
+    frame = bytearray(frame_length(kbps, rate, mpeg1))
+    frame[:4] = frame_header(kbps, rate, mpeg1, mono=mono)
+    if mpeg1:
+        offset = 4 + (17 if mono else 32)
+    else:
+        offset = 4 + (9 if mono else 17)
+    frame[offset:offset + 4] = tag
+    frame[offset + 4:offset + 8] = (1).to_bytes(4, "big")  # frames field present
+    frame[offset + 8:offset + 12] = frame_count.to_bytes(4, "big")
+    return bytes(frame)
+
+def vbri_frame(frame_count: int) -> bytes:
+    frame = bytearray(frame_length())
+    frame[:4] = frame_header()
+    frame[36:40] = b"VBRI"
+    frame[50:54] = frame_count.to_bytes(4, "big")
+    return bytes(frame)
+
+def id3_frame(frame_id: str, body: bytes, major: int = 3) -> bytes:
+    size = syncsafe(len(body)) if major == 4 else len(body).to_bytes(4, "big")
+    return frame_id.encode() + size + b"\x00\x00" + body
+
+def text_frame(frame_id: str, text: str, major: int = 3) -> bytes:
+    # UTF-16 with BOM in v2.3, UTF-8 in v2.4
+    body = b"\x01" + text.encode("utf-16") if major == 3 else b"\x03" + text.encode()
+    return id3_frame(frame_id, body, major)
+
+def chap_frame(element_id: str, start_ms: int, end_ms: int, title: str | None, major: int = 3) -> bytes:
+    body = element_id.encode() + b"\x00" + start_ms.to_bytes(4, "big") + end_ms.to_bytes(4, "big") + b"\xff" * 8
+    if title is not None:
+        body += text_frame("TIT2", title, major)
+    return id3_frame("CHAP", body, major)
+
+def id3_tag(frames: list[bytes], major: int = 3, unsync: bool = False, padding: int = 32) -> bytes:
+    data = b"".join(frames) + b"\x00" * padding
+    flags = 0
+    if unsync:
+        # v2.3 whole-tag unsynchronisation: a zero byte after every 0xFF
+        data = data.replace(b"\xff", b"\xff\x00")
+        flags |= 0x80
+    return b"ID3" + bytes([major, 0, flags]) + syncsafe(len(data)) + data
+
+ID3V1 = b"TAG" + b"\x00" * 125
+
+def sample_tag(major: int = 3) -> bytes:
+    return id3_tag([
+        text_frame("TIT2", "Episode One", major),
+        text_frame("TPE1", "The Host", major),
+        # out of order on purpose; 255 ms puts a 0xFF byte in the tag
+        chap_frame("ch2", 60_000, 120_000, "Main", major),
+        chap_frame("ch1", 255, 60_000, "Intro", major),
+    ], major)
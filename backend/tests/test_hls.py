@@ -0,0 +1,149 @@
+import asyncio
+import math
+
+import pytest
+
+from app.services import hls
+from app.services.hls import Mp3Segmenter, render_playlist, segment_name, timestamp_tag
+from tests.synth import ID3V1, audio_frame, frame_length, sample_tag, xing_frame
+
+OWNER = b"com.apple.streaming.transportStreamTimestamp\x00"
+
+def read_timestamp(segment: bytes) -> tuple[int, bytes]:
+    """
+    The 90 kHz pts of a packed audio segment's ID3 PRIV frame, and the audio after the tag.
+    """
+    assert segment[:6] == b"ID3\x04\x00\x00"
+    size = (segment[6] << 21) | (segment[7] << 14) | (segment[8] << 7) | segment[9]
+    frame = segment[10:10 + size]
+    assert frame[:4] == b"PRIV"
+    body = frame[10:]
+    assert body[:len(OWNER)] == OWNER
+    return int.from_bytes(body[len(OWNER):], "big"), segment[10 + size:]
+
+def segment(data: bytes, chunk_size: int, target_seconds: float) -> list[tuple[bytes, float]]:
+    segmenter = Mp3Segmenter(target_seconds)
+    out = []
+    for i in range(0, len(data), chunk_size):
+        out += segmenter.feed(data[i:i + chunk_size])
+    return out + segmenter.finish()
+
+# -----------------------
+# Timestamp tag
+# -----------------------
+
+@pytest.mark.parametrize("start_samples, sample_rate, pts", [
+    (0, 44100, 0),
+    (44100, 44100, 90000),
+    (1152, 44100, 2351),  # rounded down
+    (48000 * 3600, 48000, 90000 * 3600),
+    # 33-bit pts wraps after ~26.5 hours
+    (44100 * 100_000, 44100, (90000 * 100_000) % (1 << 33)),
+])
+def test_timestamp_tag(start_samples, sample_rate, pts):
+    assert read_timestamp(timestamp_tag(start_samples, sample_rate)) == (pts, b"")
+
+# -----------------------
+# Segmenter
+# -----------------------
+
+FRAMES = 300
+SAMPLES = 1152
+RATE = 44100
+FRAME = audio_frame()
+SOURCE = sample_tag() + xing_frame(FRAMES) + FRAME * FRAMES + ID3V1
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 4, 9, frame_length(), frame_length() + 1, 10_000, len(SOURCE)])
+def test_segment_durations_and_timestamps(chunk_size):
+    segments = segment(SOURCE, chunk_size, 2.0)
+
+    # a segment closes on the first frame boundary at or past the target
+    per_segment = math.ceil(2.0 * RATE / SAMPLES)
+    counts = [per_segment] * (FRAMES // per_segment) + [FRAMES % per_segment]
+    assert [duration for _, duration in segments] == pytest.approx([n * SAMPLES / RATE for n in counts])
+
+    start = 0
+    for (data, _), n in zip(segments, counts):
+        pts, audio = read_timestamp(data)
+        assert pts == start * SAMPLES * 90000 // RATE
+        # whole frames only: no ID3, no Xing frame, no ID3v1 trailer
+        assert audio == FRAME * n
+        start += n
+
+def test_segment_boundaries_follow_frame_sizes():
+    # mixed bitrates: durations depend on frame counts, never on bytes
+    frames = [audio_frame(64 if i % 2 else 320, padding=i % 3 == 0) for i in range(100)]
+    segments = segment(b"".join(frames), 1000, 1.0)
+    per_segment = math.ceil(RATE / SAMPLES)
+    assert [round(d * RATE / SAMPLES) for _, d in segments] == [per_segment, per_segment, 100 - 2 * per_segment]
+    assert b"".join(read_timestamp(data)[1] for data, _ in segments) == b"".join(frames)
+
+def test_frames_of_another_stream_are_dropped():
+    foreign = audio_frame(128, 48000)[:4] + bytes(frame_length(128, 48000) - 4)
+    data = b"\x00" * 50 + FRAME * 5 + foreign + FRAME * 5
+    segments = segment(data, 7, 60.0)
+    assert len(segments) == 1
+    assert read_timestamp(segments[0][0])[1] == FRAME * 10
+    assert segments[0][1] == pytest.approx(10 * SAMPLES / RATE)
+
+def test_no_audio():
+    assert segment(sample_tag() + b"\x00" * 500, 64, 6.0) == []
+
+# -----------------------
+# Playlist and packaging
+# -----------------------
+
+def test_render_playlist():
+    playlist = render_playlist([6.008, 6.008, 2.0898])
+    assert playlist.splitlines() == [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        "#EXT-X-TARGETDURATION:7",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        "#EXTINF:6.008,",
+        "seg00000.mp3",
+        "#EXTINF:6.008,",
+        "seg00001.mp3",
+        "#EXTINF:2.090,",
+        "seg00002.mp3",
+        "#EXT-X-ENDLIST",
+    ]
+
+def test_package_hls_uploads_playlist_last(monkeypatch):
+    uploaded: list[tuple[str, bytes, str]] = []
+
+    async def fake_upload(data: bytes, path: str, content_type: str) -> str:
+        await asyncio.sleep(0)
+        uploaded.append((path, data, content_type))
+        return f"https://cdn.test/{path}"
+
+    monkeypatch.setattr(hls, "bunny_upload_bytes", fake_upload)
+    monkeypatch.setattr(hls.settings, "HLS_SEGMENT_SECONDS", 2.0)
+    monkeypatch.setattr(hls.settings, "HLS_UPLOAD_CONCURRENCY", 2)
+
+    async def source():
+        for i in range(0, len(SOURCE), 4096):
+            yield SOURCE[i:i + 4096]
+
+    url = asyncio.run(hls.package_hls(source()))
+    paths = [path for path, _, _ in uploaded]
+    prefix = paths[0].rsplit("/", 1)[0]
+    assert url == f"https://cdn.test/{prefix}/index.m3u8"
+    assert paths[-1] == f"{prefix}/index.m3u8"
+    segments = sorted(paths[:-1])
+    assert segments == [f"{prefix}/{segment_name(i)}" for i in range(len(segments))]
+    assert uploaded[-1][1].decode().count("#EXTINF") == len(segments)
+    assert all(content_type == "audio/mpeg" for _, _, content_type in uploaded[:-1])
+
+def test_package_hls_without_frames(monkeypatch):
+    async def fake_upload(data: bytes, path: str, content_type: str) -> str:
+        raise AssertionError("nothing should be uploaded")
+
+    monkeypatch.setattr(hls, "bunny_upload_bytes", fake_upload)
+
+    async def source():
+        yield b"\x00" * 1000
+
+    with pytest.raises(ValueError):
+        asyncio.run(hls.package_hls(source()))
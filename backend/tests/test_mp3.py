@@ -0,0 +1,192 @@
+import asyncio
+
+import pytest
+
+from app.services.mp3 import ID3_MAX_BYTES, Mp3StreamParser, parse_frame_header, parse_id3v2, tap
+from tests.synth import (
+    ID3V1, audio_frame, chap_frame, frame_length, id3_frame, id3_tag, sample_tag, samples_per_frame,
+    text_frame, vbri_frame, xing_frame,
+)
+
+CHUNK_SIZES = [1, 3, 4, 10, 417, 418, 4096]
+
+def feed(data: bytes, chunk_size: int) -> Mp3StreamParser:
+    parser = Mp3StreamParser()
+    for i in range(0, len(data), chunk_size):
+        parser.feed(data[i:i + chunk_size])
+    return parser
+
+# -----------------------
+# Frame headers
+# -----------------------
+
+@pytest.mark.parametrize("kbps, sample_rate, mpeg1, padding", [
+    (128, 44100, True, 0),
+    (128, 44100, True, 1),
+    (320, 48000, True, 0),
+    (32, 32000, True, 1),
+    (64, 22050, False, 0),
+    (160, 24000, False, 1),
+])
+def test_parse_frame_header(kbps, sample_rate, mpeg1, padding):
+    frame = audio_frame(kbps, sample_rate, mpeg1, padding, mono=True)
+    length, spf, rate, version, channel_mode = parse_frame_header(frame[:4])
+    assert length == frame_length(kbps, sample_rate, mpeg1, padding) == len(frame)
+    assert spf == samples_per_frame(mpeg1)
+    assert rate == sample_rate
+    assert version == (3 if mpeg1 else 2)
+    assert channel_mode == 3
+
+@pytest.mark.parametrize("header", [
+    b"\x00\xfb\x90\x64",  # no sync
+    b"\xff\xeb\x90\x64",  # reserved version
+    b"\xff\xf9\x90\x64",  # reserved layer
+    b"\xff\xfb\x00\x64",  # free format bitrate
+    b"\xff\xfb\xf0\x64",  # bad bitrate
+    b"\xff\xfb\x9c\x64",  # reserved sample rate
+])
+def test_parse_frame_header_rejects(header):
+    assert parse_frame_header(header) is None
+
+# -----------------------
+# ID3v2
+# -----------------------
+
+@pytest.mark.parametrize("major", [3, 4])
+def test_parse_id3v2_tags_and_chapters(major):
+    tags, chapters = parse_id3v2(sample_tag(major))
+    assert tags == {"title": "Episode One", "artist": "The Host"}
+    assert chapters == [
+        {"start_seconds": 0.255, "end_seconds": 60.0, "title": "Intro"},
+        {"start_seconds": 60.0, "end_seconds": 120.0, "title": "Main"},
+    ]
+
+def test_parse_id3v2_syncsafe_frame_sizes():
+    # 200 bytes: a v2.4 size is syncsafe (0x0148), a v2.3 one is not (0xC8)
+    title = "x" * 199
+    tags, _ = parse_id3v2(id3_tag([text_frame("TIT2", title, 4), text_frame("TPE1", "Host", 4)], major=4))
+    assert tags == {"title": title, "artist": "Host"}
+
+def test_parse_id3v2_unsynchronised_v23():
+    tag = id3_tag([text_frame("TIT2", "Episode One"), chap_frame("ch1", 255, 65_535, "Intro")], unsync=True)
+    assert b"\xff\x00" in tag
+    tags, chapters = parse_id3v2(tag)
+    assert tags == {"title": "Episode One"}
+    assert chapters == [{"start_seconds": 0.255, "end_seconds": 65.535, "title": "Intro"}]
+
+def test_parse_id3v2_chapter_without_title_and_unknown_version():
+    _, chapters = parse_id3v2(id3_tag([chap_frame("ch1", 0, 1000, None)]))
+    assert chapters == [{"start_seconds": 0.0, "end_seconds": 1.0, "title": None}]
+    assert parse_id3v2(b"ID3\x02\x00\x00" + bytes(4)) == ({}, [])
+
+def test_parse_id3v2_keeps_first_text_value():
+    tag = id3_tag([text_frame("TYER", "2019"), text_frame("TDRC", "2020"), id3_frame("TXXX", b"\x00a\x00b")])
+    assert parse_id3v2(tag)[0] == {"year": "2019"}
+
+# -----------------------
+# Stream parser
+# -----------------------
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES + [None])
+def test_cbr_duration_and_tags(chunk_size):
+    frames = [audio_frame() for _ in range(200)]
+    tag = sample_tag()
+    data = tag + b"".join(frames) + ID3V1
+    parser = feed(data, chunk_size or len(data))
+
+    assert parser.frames == 200
+    assert parser.vbr_frames is None and not parser.complete
+    result = parser.result()
+    assert result["duration_seconds"] == round(200 * 1152 / 44100, 3)
+    assert result["size_bytes"] == len(data)
+    assert result["bitrate_kbps"] == 128
+    assert result["sample_rate"] == 44100
+    assert result["id3"] == {"title": "Episode One", "artist": "The Host"}
+    assert [c["title"] for c in result["chapters"]] == ["Intro", "Main"]
+    assert parser.id3_size == len(tag)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES + [None])
+def test_vbr_xing_counts_frames(chunk_size):
+    # alternating bitrates and paddings; the Xing frame carries no audio
+    frames = [audio_frame(64 if i % 3 else 320, padding=i % 2) for i in range(150)]
+    data = sample_tag() + xing_frame(150) + b"".join(frames)
+    parser = feed(data, chunk_size or len(data))
+
+    assert parser.vbr_frames == 150
+    assert parser.frames == 150
+    assert parser.complete
+    assert parser.result()["duration_seconds"] == round(150 * 1152 / 44100, 3)
+
+@pytest.mark.parametrize("tag", [b"Xing", b"Info"])
+@pytest.mark.parametrize("mpeg1, mono", [(True, False), (True, True), (False, False), (False, True)])
+def test_xing_header_offsets(tag, mpeg1, mono):
+    rate = 44100 if mpeg1 else 22050
+    data = xing_frame(1000, tag, mpeg1, mono) + audio_frame(64, rate, mpeg1, mono=mono)
+    parser = feed(data, len(data))
+    assert parser.vbr_frames == 1000
+    assert parser.frames == 1
+
+def test_vbri_header():
+    data = vbri_frame(500) + b"".join(audio_frame() for _ in range(10))
+    parser = feed(data, 7)
+    assert parser.vbr_frames == 500
+    assert parser.frames == 10
+
+def test_stopped_early_uses_vbr_frame_count():
+    frames = b"".join(audio_frame() for _ in range(1000))
+    data = sample_tag() + xing_frame(1000) + frames
+    parser = Mp3StreamParser()
+    parser.feed(data[:len(sample_tag()) + 2000])
+    assert parser.complete
+    result = parser.result(total_size=len(data))
+    assert result["duration_seconds"] == round(1000 * 1152 / 44100, 3)
+    assert result["size_bytes"] == len(data)
+    assert result["bitrate_kbps"] == 128
+
+def test_skips_junk_and_other_streams():
+    # bytes before the first frame and a frame at another sample rate
+    junk = b"\x00\xff\x12" * 50
+    frames = [audio_frame() for _ in range(20)]
+    # silent payload: a resync inside it must not find a false sync word
+    foreign = audio_frame(128, 48000)[:4] + bytes(frame_length(128, 48000) - 4)
+    data = junk + b"".join(frames[:10]) + foreign + b"".join(frames[10:])
+    for chunk_size in (1, 5, len(data)):
+        parser = feed(data, chunk_size)
+        assert parser.frames == 20
+        assert parser.sample_rate == 44100
+
+def test_no_frames():
+    parser = feed(sample_tag() + b"\x00" * 1000, 64)
+    result = parser.result()
+    assert result["duration_seconds"] is None
+    assert result["bitrate_kbps"] is None
+    assert result["sample_rate"] is None
+    assert result["id3"]["title"] == "Episode One"
+
+def test_oversized_tag_is_skipped_not_parsed():
+    art = id3_frame("APIC", b"\x00" * ID3_MAX_BYTES)
+    data = id3_tag([text_frame("TIT2", "Big"), art]) + b"".join(audio_frame() for _ in range(5))
+    parser = feed(data, 65536)
+    assert parser.tags == {}
+    assert parser.frames == 5
+
+def test_damaged_tag_does_not_raise():
+    tag = b"ID3\x03\x00\x00" + bytes([0, 0, 0, 20]) + b"CHAP" + (1000).to_bytes(4, "big") + b"\x00\x00" + b"\xff" * 10
+    parser = feed(tag + audio_frame(), 3)
+    assert parser.frames == 1
+    assert parser.chapters == []
+
+def test_tap_passes_chunks_through():
+    data = sample_tag() + b"".join(audio_frame() for _ in range(30))
+    chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def collect(parser):
+        return [chunk async for chunk in tap(source(), parser)]
+
+    parser = Mp3StreamParser()
+    assert asyncio.run(collect(parser)) == chunks
+    assert parser.frames == 30